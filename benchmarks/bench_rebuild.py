@@ -0,0 +1,362 @@
+"""
+Benchmark the site generator on synthetic tribute corpora.
+
+Copies tribute_publisher.py, templates/ and pet-tributes/assets/ into a temp
+folder per corpus size, generates a synthetic data.json (markdown messages,
+emoji, several pet types, image metadata) and times the build steps headlessly.
+A sample of tributes (--images, default 50) gets real photo uploads so the
+image derivative, image cache and srcset steps are timed too; encoding cost
+does not depend on corpus size, so the sample stays fixed. Results are
+compared with benchmarks/baseline.json so regressions stand out.
+
+    python benchmarks/bench_rebuild.py                      # 1k, 10k and 100k entries
+    python benchmarks/bench_rebuild.py --sizes 1000,10000 --no-memory
+    python benchmarks/bench_rebuild.py --update-baseline    # store this run as the baseline
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "bench_output.txt")
+DEFAULT_SIZES = "1000,10000,100000"
+
+# Tributes per corpus that get a real photo upload (see write_sample_uploads).
+DEFAULT_IMAGE_SAMPLE = 50
+UPLOAD_SIZE = (1600, 1200)
+
+# Every archive page links to every other page, so archive output grows with
+# the square of the corpus (~63 MB at 10k, several GB at 100k). Larger corpora
+# skip the archive steps (--archive-max) so the rest can still be measured.
+DEFAULT_ARCHIVE_MAX = 20000
+
+# Slower than baseline by more than this fraction counts as a regression.
+DEFAULT_TOLERANCE = 0.25
+
+
+# ----------------------------
+# Synthetic corpus
+# ----------------------------
+
+PET_TYPES = {
+    "Dog": ["Labrador Retriever", "German Shepherd", "Dachshund", "Golden Retriever", "Beagle", "Mixed Breed", ""],
+    "Cat": ["Maine Coon", "Siamese", "Tabby", "Ragdoll", ""],
+    "Bird": ["Cockatiel", "Parakeet", ""],
+    "Rabbit": ["Holland Lop", ""],
+    "Horse": ["Quarter Horse", "Appaloosa"],
+}
+NAMES = ["Bella", "Max", "Luna", "Charlie", "Zoë", "Milo", "Coco", "Rocky", "Señor Whiskers", "Biscuit", "Daisy", "Bear"]
+EMOJI = ["🐾", "❤️", "🌈", "🐶", "🐱", "✨"]
+STATES = ["TX", "CA", "NY", "FL", "GA", "TN", "CO", "OH", "WA", "AR"]
+FIRST_NAMES = ["Ann", "Jose", "Mei", "Sam", "Priya", "O'Neil", "Chris", ""]
+SENTENCES = [
+    "{name} loved long walks by the lake.",
+    "Every morning started with **a wagging tail** and a happy bark.",
+    "We will *always* remember the way {name} waited by the door.",
+    "Run free, sweet {name} {emoji}",
+    "Thank you for ***fourteen wonderful years*** of love.",
+    "## Forever in our hearts",
+    "- Favorite toy: the squeaky duck\n- Favorite spot: the sunny window",
+    "You made every day brighter, and the house is so quiet without you.",
+]
+
+
+def synthetic_entries(count: int, seed: int = 1) -> tuple[list[dict], dict[str, str]]:
+    """(data.json entries, {slug: markdown message}) for `count` tributes."""
+    rng = random.Random(seed)
+    entries = []
+    messages = {}
+    for i in range(count):
+        pet_type = rng.choice(list(PET_TYPES))
+        breed = rng.choice(PET_TYPES[pet_type])
+        name = rng.choice(NAMES) + (f" {rng.choice(EMOJI)}" if rng.random() < 0.1 else "")
+        born = rng.randint(1995, 2020)
+        passed = rng.randint(born + 1, 2026)
+        slug = f"{name.split()[0].lower()}-{pet_type.lower()}-{i}"
+        message = "\n\n".join(
+            rng.choice(SENTENCES).format(name=name, emoji=rng.choice(EMOJI)) for _ in range(rng.randint(2, 8))
+        )
+        messages[slug] = message
+        has_photo = rng.random() < 0.8
+        entry = {
+            "slug": slug,
+            "pet_name": name,
+            "breed": breed,
+            "pet_type": pet_type,
+            "folder": "memorials",
+            "years_pretty": f"{born} - {passed}",
+            "excerpt": message[:160],
+            "first_name": rng.choice(FIRST_NAMES),
+            "state": rng.choice(STATES),
+            "email": f"owner{i}@example.com",
+            "published_iso": f"{rng.randint(2024, 2026)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00",
+            "image_filename": f"{slug}.webp" if has_photo else "blank_memorial_loving_memory.png",
+            "image2_filename": f"{slug}-2.webp" if has_photo and rng.random() < 0.2 else "",
+            "featured": i == count // 2,
+            "email_sent": rng.random() < 0.5,
+        }
+        if has_photo:
+            entry.update({
+                "image_width": 1200,
+                "image_height": 900,
+                "image_variants": {"400": f"{slug}-400w.webp", "800": f"{slug}-800w.webp"},
+            })
+        entries.append(entry)
+    return entries, messages
+
+
+def long_messages(messages: dict[str, str], paragraphs: int = 40) -> list[str]:
+    """Long tributes (a few KB each) built by repeating the short synthetic messages."""
+    texts = list(messages.values())
+    return ["\n\n".join(texts[(i + k) % len(texts)] for k in range(paragraphs // 4)) for i in range(len(texts))]
+
+
+def write_sample_uploads(tp, entries: list[dict], folder: str, sample: int) -> list[tuple[str, str, str]]:
+    """
+    Write a distinct JPEG "phone photo" for the first `sample` tributes with a
+    photo and return the ("upload", src, dest) tasks that publish would run.
+    Every source differs, so the first conversion pass never hits the image cache.
+    """
+    from PIL import Image, ImageDraw, ImageFilter
+
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(7)
+    tasks = []
+    for entry in entries:
+        if len(tasks) >= sample:
+            break
+        if not entry["image_filename"].endswith(".webp"):
+            continue
+        # Smooth gradients and soft shapes with a little grain, roughly like a photo
+        # (pure noise would make every encoder pathologically slow).
+        base = Image.merge("RGB", [Image.linear_gradient("L").rotate(rng.randrange(360)) for _ in range(3)])
+        base = base.resize(UPLOAD_SIZE)
+        draw = ImageDraw.Draw(base)
+        for _ in range(12):
+            x, y = rng.randrange(UPLOAD_SIZE[0]), rng.randrange(UPLOAD_SIZE[1])
+            draw.ellipse((x, y, x + rng.randint(60, 400), y + rng.randint(60, 400)), fill=tuple(rng.randrange(256) for _ in range(3)))
+        base = base.filter(ImageFilter.GaussianBlur(6))
+        grain = Image.effect_noise(UPLOAD_SIZE, 12).convert("RGB")
+        base = Image.blend(base, grain, 0.08)
+        src = os.path.join(folder, f"{entry['slug']}.jpg")
+        base.save(src, "JPEG", quality=88)
+        dest = os.path.join(tp.MEMORIALS_DIR, entry["slug"], entry["image_filename"])
+        tasks.append(("upload", src, dest))
+    return tasks
+
+
+def prepare_workspace(root: str):
+    """A self-contained copy of the generator so the benchmark never touches the real site."""
+    shutil.copy2(os.path.join(REPO_ROOT, "tribute_publisher.py"), root)
+    shutil.copytree(os.path.join(REPO_ROOT, "templates"), os.path.join(root, "templates"))
+    shutil.copytree(os.path.join(REPO_ROOT, "pet-tributes", "assets"), os.path.join(root, "pet-tributes", "assets"))
+
+
+# ----------------------------
+# Measurement
+# ----------------------------
+
+def measure(tp, step: str, items: int, fn, memory: bool, reset=None) -> dict:
+    """Run fn() once for time (and once more under tracemalloc for peak memory)."""
+    if reset:
+        reset()
+    tp._build_files.update(written=0, skipped=0, bytes_written=0)
+    started = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - started
+    result = {
+        "items": items,
+        "seconds": round(seconds, 4),
+        "per_second": round(items / seconds, 1) if seconds else None,
+        "files_written": tp._build_files["written"],
+        "files_skipped": tp._build_files["skipped"],
+        "bytes_written": tp._build_files["bytes_written"],
+    }
+    if memory:
+        if reset:
+            reset()
+        tracemalloc.start()
+        fn()
+        result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1 << 20), 1)
+        tracemalloc.stop()
+    print(f"  {step:<34} {seconds:8.3f}s  {result['per_second'] or 0:>10.1f}/s  files {result['files_written']}")
+    return result
+
+
+def bench_corpus(
+    count: int,
+    jobs: int,
+    memory: bool,
+    image_sample: int = DEFAULT_IMAGE_SAMPLE,
+    archive_max: int = DEFAULT_ARCHIVE_MAX,
+) -> dict:
+    workspace = tempfile.mkdtemp(prefix=f"tribute-bench-{count}-")
+    try:
+        prepare_workspace(workspace)
+        sys.path.insert(0, workspace)
+        sys.modules.pop("tribute_publisher", None)
+        import tribute_publisher as tp
+        tp.PERSIST_CARD_CACHE = False
+        tp.USE_DATA_SNAPSHOT = False
+
+        entries, messages = synthetic_entries(count)
+        with open(tp.ARCHIVE_DATA, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+
+        def fresh_output():
+            # Cold build: no card cache, no manifest, no generated pages.
+            tp._card_cache = None
+            tp._build_manifest = None
+            for name in os.listdir(tp.TRIBUTES_DIR):
+                path = os.path.join(tp.TRIBUTES_DIR, name)
+                if name not in ("assets", "data.json"):
+                    shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+            if os.path.exists(tp.BUILD_MANIFEST):
+                os.remove(tp.BUILD_MANIFEST)
+
+        def cold_cards():
+            tp._card_cache = None
+
+        upload_tasks = []
+        if image_sample and tp.ensure_pillow():
+            upload_tasks = write_sample_uploads(tp, entries, os.path.join(workspace, "uploads"), image_sample)
+        sample_entries = entries[:0]
+        if upload_tasks:
+            sample_slugs = {os.path.basename(os.path.dirname(dest)) for _, _, dest in upload_tasks}
+            sample_entries = [e for e in entries if e["slug"] in sample_slugs]
+
+        def fresh_images():
+            # Cold: no image cache and no converted tribute images.
+            shutil.rmtree(tp.IMAGE_CACHE_DIR, ignore_errors=True)
+            fresh_tribute_images()
+
+        def fresh_tribute_images():
+            # Cache kept, tribute folders emptied: re-publishing the same photos.
+            shutil.rmtree(tp.MEMORIALS_DIR, ignore_errors=True)
+            for _, _, dest in upload_tasks:
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+
+        def convert_uploads():
+            failed = [info for ok, info in tp.render_in_pool(tp._convert_image_task, upload_tasks, jobs) if not ok]
+            if failed:
+                raise RuntimeError(f"image conversion failed: {failed[0]}")
+
+        def render_tribute_pages():
+            for entry in entries:
+                tp.build_tribute_html(
+                    pet_name=entry["pet_name"], first_name=entry["first_name"], state=entry["state"],
+                    breed=entry["breed"], pet_type=entry["pet_type"], years_pretty=entry["years_pretty"],
+                    excerpt=entry["excerpt"], page_url=f"{tp.SITE_DOMAIN}{tp.get_entry_web_base(entry)}",
+                    tribute_web_path=tp.get_entry_web_base(entry), og_image_abs="",
+                    user_uploaded_image=entry["image_filename"].endswith(".webp"),
+                    second_image_filename=entry["image2_filename"], publish_date_iso=entry["published_iso"],
+                    tribute_message_html=tp.parse_safe_markdown(messages[entry["slug"]]),
+                    image_meta=tp.image_meta_from_entry(entry, "image"),
+                )
+
+        print(f"{count} entries ({workspace})")
+        steps = {}
+        steps["load_data"] = measure(tp, "load_data", count, tp.load_data, memory, reset=lambda: setattr(tp.get_tribute_store(), "_stamp", None))
+        steps["sort_entries_newest_first"] = measure(tp, "sort_entries_newest_first", count, lambda: tp.sort_entries_newest_first(entries), memory)
+        steps["build_card_html"] = measure(tp, "build_card_html", count, lambda: [tp.build_card_html(e) for e in entries], memory)
+        steps["parse_safe_markdown"] = measure(tp, "parse_safe_markdown", count, lambda: [tp.parse_safe_markdown(m) for m in messages.values()], memory)
+        long_texts = long_messages(messages)
+        steps["parse_safe_markdown_long"] = measure(tp, "parse_safe_markdown (long)", count, lambda: [tp.parse_safe_markdown(m) for m in long_texts], memory)
+        steps["strip_markdown_long"] = measure(tp, "strip_markdown_for_excerpt (long)", count, lambda: [tp.strip_markdown_for_excerpt(m) for m in long_texts], memory)
+        long_texts = None  # a few hundred MB at 100k; free it before the page steps
+        if upload_tasks:
+            steps["convert_uploads"] = measure(tp, "convert uploads + variants (cold)", len(upload_tasks), convert_uploads, memory, reset=fresh_images)
+            steps["convert_uploads_cached"] = measure(tp, "convert uploads (image cache)", len(upload_tasks), convert_uploads, memory, reset=fresh_tribute_images)
+            steps["refresh_entry_image_meta"] = measure(tp, "refresh_entry_image_meta", len(sample_entries), lambda: [tp.refresh_entry_image_meta(e) for e in sample_entries], memory)
+        else:
+            print("  (Pillow not installed: image steps skipped)")
+        steps["build_tribute_html"] = measure(tp, "build_tribute_html", count, render_tribute_pages, memory)
+        archives = count <= archive_max
+        if archives:
+            steps["rebuild_archive_pages"] = measure(tp, "rebuild_archive_pages", count, lambda: tp.rebuild_archive_pages(entries, jobs=jobs), memory, reset=fresh_output)
+            steps["rebuild_facet_archives"] = measure(tp, "rebuild_facet_archives", count, lambda: tp.rebuild_facet_archives(entries, jobs=jobs), memory, reset=cold_cards)
+        else:
+            print(f"  (archive steps skipped above --archive-max {archive_max})")
+        steps["generate_sitemap"] = measure(tp, "generate_sitemap", count, lambda: tp.generate_sitemap(entries), memory)
+        steps["build_search_index"] = measure(tp, "build_search_index", count, lambda: tp.build_search_index(entries), memory)
+        if archives:
+            # Same data again: everything should be skipped as unchanged.
+            steps["rebuild_all_archives_noop"] = measure(tp, "rebuild_all_archives (no-op)", count, lambda: tp.rebuild_all_archives(entries, jobs=jobs), memory)
+        return steps
+    finally:
+        sys.path.remove(workspace) if workspace in sys.path else None
+        sys.modules.pop("tribute_publisher", None)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+# ----------------------------
+# Baseline comparison
+# ----------------------------
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lines describing each step's throughput against the baseline; regressions are flagged."""
+    lines = []
+    for size, steps in results.items():
+        for step, result in steps.items():
+            old = baseline.get(size, {}).get(step)
+            if not old or not old.get("per_second") or not result.get("per_second"):
+                continue
+            ratio = result["per_second"] / old["per_second"]
+            flag = "REGRESSION" if ratio < 1 - tolerance else "ok"
+            lines.append(f"{flag:<10} {size:>7} {step:<28} {ratio:6.2f}x baseline")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark tribute_publisher on synthetic corpora.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated corpus sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes for archive rendering")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass (faster)")
+    parser.add_argument("--archive-max", type=int, default=DEFAULT_ARCHIVE_MAX, help="largest corpus that runs the archive steps")
+    parser.add_argument("--images", type=int, default=DEFAULT_IMAGE_SAMPLE, help="tributes per corpus given a real photo upload (0 skips image steps)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown before flagging")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--update-baseline", action="store_true", help=f"store this run in {BASELINE_PATH}")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        results[str(size)] = bench_corpus(
+            size, max(1, args.jobs), memory=not args.no_memory,
+            image_sample=max(0, args.images), archive_max=args.archive_max,
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Updated {BASELINE_PATH}")
+        return 0
+
+    if not os.path.exists(BASELINE_PATH):
+        print("No baseline yet; run with --update-baseline to store one.")
+        return 0
+    with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    lines = compare_with_baseline(results, baseline, args.tolerance)
+    print("\n".join(lines))
+    return 1 if any(line.startswith("REGRESSION") for line in lines) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
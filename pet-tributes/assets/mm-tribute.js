@@ -12,14 +12,155 @@ document.addEventListener("DOMContentLoaded", () => {
       cardIndexText.set(card, normalize(`${datasetValues} ${visibleCardText}`));
     });
 
-    searchInput.addEventListener("input", function () {
-      const query = normalize(this.value);
-
+    const filterPageCards = (query) => {
       cards.forEach((card) => {
         const searchableText = cardIndexText.get(card) || "";
         const matches = !query || searchableText.includes(query);
         card.style.display = matches ? "" : "none";
       });
+    };
+
+    // Site-wide search over the build-time index in /pet-tributes/search/.
+    // meta.json lists the shards; term and document shards are fetched on demand.
+    // Shard URLs carry a content version, so only meta.json is revalidated.
+    const SEARCH_ROOT = "/pet-tributes/search/";
+    const MAX_RESULTS = 60;
+    const shardRequests = new Map();
+    const fetchShard = (name, init) => {
+      if (!shardRequests.has(name)) {
+        shardRequests.set(
+          name,
+          fetch(SEARCH_ROOT + name, init)
+            .then((response) => (response.ok ? response.json() : null))
+            .catch(() => null)
+        );
+      }
+      return shardRequests.get(name);
+    };
+    // Same folding as search_tokens() in tribute_publisher.py.
+    const searchTokens = (value) =>
+      ((value || "")
+        .normalize("NFKD")
+        .replace(/[\u0300-\u036f]/g, "")
+        .toLowerCase()
+        .match(/[a-z0-9]+/g) || []).filter((token) => token.length >= 2);
+    const decodeIds = (gaps) => {
+      let id = 0;
+      return gaps.map((gap, i) => (id = i ? id + gap : gap));
+    };
+
+    const searchSite = async (query) => {
+      const meta = await fetchShard("meta.json", { cache: "no-cache" });
+      const terms = searchTokens(query);
+      if (!meta || !terms.length) return null;
+
+      // Every query word must prefix-match a word of the tribute.
+      let matches = null;
+      for (const term of terms) {
+        const prefix = term.slice(0, 2);
+        const ids = new Set();
+        const version = meta.terms[prefix];
+        const shard = version ? await fetchShard(`terms-${prefix}.json?v=${version}`) : {};
+        if (shard === null) return null;
+        Object.keys(shard).forEach((word) => {
+          if (word.startsWith(term)) decodeIds(shard[word]).forEach((id) => ids.add(id));
+        });
+        matches = matches ? new Set([...matches].filter((id) => ids.has(id))) : ids;
+        if (!matches.size) break;
+      }
+
+      // Higher ids were published later; show newest first.
+      const ids = [...matches].sort((a, b) => b - a).slice(0, MAX_RESULTS);
+      const docs = await Promise.all(
+        ids.map(async (id) => {
+          const shardNum = Math.floor(id / meta.docs_per_shard);
+          const shard = await fetchShard(`docs-${shardNum}.json?v=${meta.docs[shardNum]}`);
+          return shard ? shard[id % meta.docs_per_shard] : null;
+        })
+      );
+      return { total: matches.size, docs: docs.filter(Boolean) };
+    };
+
+    const pageGrid = cards[0].closest(".tribute-grid");
+    const resultsSection = document.createElement("section");
+    resultsSection.className = "mm-search-results";
+    resultsSection.style.display = "none";
+    const resultsStatus = document.createElement("p");
+    resultsStatus.className = "tribute-count";
+    const resultsGrid = document.createElement("div");
+    resultsGrid.className = "tribute-grid";
+    resultsSection.append(resultsStatus, resultsGrid);
+    if (pageGrid) pageGrid.before(resultsSection);
+
+    const buildResultCard = ([url, title, years, thumbnail, attribution]) => {
+      const article = document.createElement("article");
+      article.className = "mm-archive-card";
+      const thumbLink = document.createElement("a");
+      thumbLink.className = "mm-archive-link mm-archive-thumb-link";
+      thumbLink.href = url;
+      const thumb = document.createElement("div");
+      thumb.className = "mm-archive-thumb";
+      const img = document.createElement("img");
+      img.src = thumbnail;
+      img.alt = `${title} memorial tribute`;
+      img.loading = "lazy";
+      thumbLink.append(img);
+      thumb.append(thumbLink);
+      const metaLink = document.createElement("a");
+      metaLink.className = "mm-archive-link";
+      metaLink.href = url;
+      const meta = document.createElement("div");
+      meta.className = "mm-archive-meta";
+      const heading = document.createElement("h2");
+      heading.className = "mm-archive-title";
+      heading.textContent = title;
+      meta.append(heading);
+      [[years, "mm-archive-years"], [attribution, "mm-archive-attribution"]].forEach(([text, className]) => {
+        if (!text) return;
+        const line = document.createElement(className === "mm-archive-years" ? "p" : "div");
+        line.className = className;
+        line.textContent = text;
+        meta.append(line);
+      });
+      metaLink.append(meta);
+      article.append(thumb, metaLink);
+      return article;
+    };
+
+    // style.display rather than `hidden`: the grid's CSS display would override it.
+    const showPage = (visible) => {
+      if (pageGrid) pageGrid.style.display = visible ? "" : "none";
+      resultsSection.style.display = visible ? "none" : "";
+    };
+
+    let latestQuery = 0;
+    searchInput.addEventListener("input", async function () {
+      const query = normalize(this.value);
+      const queryNum = ++latestQuery;
+
+      if (!searchTokens(query).length || !pageGrid) {
+        showPage(true);
+        filterPageCards(query);
+        return;
+      }
+
+      const results = await searchSite(query);
+      if (queryNum !== latestQuery) return;
+      if (!results) {
+        // No index deployed (or offline): fall back to this page's cards.
+        showPage(true);
+        filterPageCards(query);
+        return;
+      }
+
+      filterPageCards("");
+      resultsStatus.textContent =
+        results.total === 1 ? "1 tribute found" : `${results.total} tributes found`;
+      if (results.total > results.docs.length) {
+        resultsStatus.textContent += ` (showing the newest ${results.docs.length})`;
+      }
+      resultsGrid.replaceChildren(...results.docs.map(buildResultCard));
+      showPage(false);
     });
   }
 });
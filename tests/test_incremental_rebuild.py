@@ -0,0 +1,141 @@
+"""
+Incremental archive rebuilds (rebuild_changed_archives) must leave the site
+byte-identical to a full rebuild of the same entries.
+"""
+import copy
+import importlib.util
+import os
+import random
+import shutil
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PET_TYPES = ["Dog", "Cat", "Bird"]
+BREEDS = ["Labrador", "Beagle", "Siamese", "Parrot", ""]
+STATES = ["Texas", "Oklahoma", "California", ""]
+
+
+def load_site(root, name):
+    """A private copy of the publisher whose PROJECT_ROOT is `root`."""
+    os.makedirs(os.path.join(root, "pet-tributes"))
+    shutil.copy(os.path.join(REPO_ROOT, "tribute_publisher.py"), root)
+    shutil.copytree(os.path.join(REPO_ROOT, "templates"), os.path.join(root, "templates"))
+    shutil.copytree(
+        os.path.join(REPO_ROOT, "pet-tributes", "assets"),
+        os.path.join(root, "pet-tributes", "assets"),
+    )
+    spec = importlib.util.spec_from_file_location(name, os.path.join(root, "tribute_publisher.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def site_files(root):
+    files = {}
+    for folder, _dirs, names in os.walk(os.path.join(root, "pet-tributes")):
+        for name in names:
+            path = os.path.join(folder, name)
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, root)] = f.read()
+    return files
+
+
+def make_entry(number, rnd, **overrides):
+    entry = {
+        "slug": f"pet-{number}",
+        "folder": "memorials",
+        "pet_name": f"Pet {number}",
+        "pet_type": rnd.choice(PET_TYPES),
+        "breed": rnd.choice(BREEDS),
+        "state": rnd.choice(STATES),
+        "years_pretty": f"2005 - {rnd.randint(2015, 2024)}",
+        "first_name": "Sam",
+        "excerpt": f"Remembering pet {number}.",
+        "published_iso": f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T10:00:00",
+        "featured": False,
+        "image_filename": f"pet-{number}.webp",
+    }
+    entry.update(overrides)
+    return entry
+
+
+def assert_incremental_matches_full(tmp_path, old_entries, new_entries):
+    incremental = load_site(str(tmp_path / "incremental"), f"site_incremental_{tmp_path.name}")
+    incremental.save_data(old_entries)
+    incremental.rebuild_all_archives(incremental.load_data())
+    incremental.save_data(new_entries)
+    incremental.rebuild_changed_archives(old_entries, incremental.load_data())
+
+    full = load_site(str(tmp_path / "full"), f"site_full_{tmp_path.name}")
+    full.save_data(new_entries)
+    full.rebuild_all_archives(full.load_data())
+
+    got = site_files(str(tmp_path / "incremental"))
+    want = site_files(str(tmp_path / "full"))
+    assert sorted(got) == sorted(want)
+    assert [path for path in want if got[path] != want[path]] == []
+
+
+def test_unfeaturing_newest_moves_badge_on_facet_pages(tmp_path):
+    rnd = random.Random(1)
+    old = [
+        make_entry(1, rnd, pet_type="Dog", breed="Labrador", published_iso="2025-05-01T10:00:00", featured=True),
+        make_entry(2, rnd, pet_type="Cat", breed="Siamese", published_iso="2025-03-01T10:00:00", featured=True),
+        make_entry(3, rnd, pet_type="Cat", breed="Siamese", published_iso="2025-04-01T10:00:00"),
+    ]
+    new = copy.deepcopy(old)
+    new[0]["featured"] = False
+    assert_incremental_matches_full(tmp_path, old, new)
+
+
+def test_removing_last_tribute_of_a_facet_drops_its_folders(tmp_path):
+    rnd = random.Random(2)
+    old = [make_entry(n, rnd, pet_type="Dog", breed="Beagle", state="Texas") for n in range(4)]
+    old.append(make_entry(9, rnd, pet_type="Bird", breed="Parrot", state="California"))
+    new = old[:-1]
+    assert_incremental_matches_full(tmp_path, old, new)
+    assert not os.path.exists(tmp_path / "incremental" / "pet-tributes" / "bird")
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_random_adds_deletes_and_feature_toggles(tmp_path, seed):
+    rnd = random.Random(seed)
+    old = [make_entry(n, rnd, featured=rnd.random() < 0.2) for n in range(rnd.randint(5, 45))]
+    new = copy.deepcopy(old)
+    for step in range(rnd.randint(1, 6)):
+        action = rnd.choice(("add", "delete", "feature", "edit"))
+        if action == "add":
+            new.append(make_entry(1000 + seed * 10 + step, rnd, featured=rnd.random() < 0.2))
+        elif action == "delete" and new:
+            new.pop(rnd.randrange(len(new)))
+        elif action == "feature" and new:
+            entry = rnd.choice(new)
+            entry["featured"] = not entry["featured"]
+        elif new:
+            rnd.choice(new)["breed"] = rnd.choice(BREEDS)
+    assert_incremental_matches_full(tmp_path, old, new)
+
+
+def test_full_rebuild_prunes_listings_without_tributes(tmp_path):
+    rnd = random.Random(3)
+    old = [
+        make_entry(1, rnd, pet_type="Dog", breed="Beagle", state="Texas"),
+        make_entry(2, rnd, pet_type="Assets", breed="Parrot", state="Oklahoma"),
+    ]
+    site = load_site(str(tmp_path / "site"), f"site_prune_{tmp_path.name}")
+    site.save_data(old)
+    site.rebuild_all_archives(site.load_data())
+    tributes = tmp_path / "site" / "pet-tributes"
+    # A pet type named like a reserved folder gets its own archive folder.
+    assert (tributes / "assets-pets" / "index.html").exists()
+    assert (tributes / "browse" / "breed" / "parrot" / "index.html").exists()
+
+    site.save_data(old[:1])
+    site.rebuild_all_archives(site.load_data())
+    assert not (tributes / "assets-pets").exists()
+    assert not (tributes / "browse" / "breed" / "parrot").exists()
+    assert not (tributes / "browse" / "state" / "oklahoma").exists()
+    assert (tributes / "assets" / "mm-tribute.js").exists()
+    assert (tributes / "dog" / "index.html").exists()
@@ -1,20 +1,40 @@
-print("RUNNING UPDATED SCRIPT")
-
+import abc
 import os
 import re
 import shutil
 import json
 import html
+import gzip
+import hashlib
+import math
+import marshal
 import random
 import urllib.parse
 import unicodedata
+import importlib.util
 import smtplib
 import ssl
-from datetime import datetime
+import sqlite3
+import argparse
+import csv
+import functools
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
 from email.message import EmailMessage
-import tkinter as tk
-from tkinter import filedialog, messagebox, simpledialog, ttk
-from PIL import Image
+
+# Tkinter and Pillow are imported lazily (load_tk / inside the image helpers) so
+# the headless CLI starts fast and runs on machines without a display.
+tk = filedialog = messagebox = simpledialog = ttk = None
+
+
+def load_tk():
+    global tk, filedialog, messagebox, simpledialog, ttk
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, simpledialog, ttk
 
 # ----------------------------
 # CONFIG (edit if needed)
@@ -32,9 +52,46 @@ MEMORIALS_DIR = os.path.join(TRIBUTES_DIR, "memorials")
 
 ARCHIVE_INDEX = os.path.join(TRIBUTES_DIR, "index.html")
 ARCHIVE_DATA = os.path.join(TRIBUTES_DIR, "data.json")
+# Local build state (content hashes of generated files); not uploaded.
+BUILD_MANIFEST = os.path.join(PROJECT_ROOT, "build_manifest.json")
+# Normalized copy of data.json in marshal format, reused while data.json is unchanged.
+DATA_SNAPSHOT = os.path.join(PROJECT_ROOT, ".data-snapshot.bin")
+USE_DATA_SNAPSHOT = True
+# Bump when load_data's normalization changes so old snapshots are ignored.
+DATA_SNAPSHOT_SCHEMA = 1
+# Build-time search index for the archive #tributeSearch box (loaded lazily by mm-tribute.js).
+SEARCH_INDEX_DIR = os.path.join(TRIBUTES_DIR, "search")
+SEARCH_DOCS_PER_SHARD = 500
+SEARCH_FIELDS = ("pet_name", "breed", "pet_type", "state", "excerpt")
+# Extra archive facets besides pet type, written under /pet-tributes/browse/<facet>/<value>/.
+ARCHIVE_FACETS = ("breed", "state", "year")
+FACET_ROOT = "browse"
+# How the "recently remembered" strip picks cards: "data" (changes only when a
+# listing's tributes change), "day" (also rotates daily) or "random" (every build).
+RECENTLY_REMEMBERED_ROTATION = "data"
+RECENTLY_REMEMBERED_SEED = ""  # change to reshuffle every listing once
+# Rendered archive cards keyed by entry content hash, kept between runs.
+CARD_CACHE_FILE = os.path.join(PROJECT_ROOT, ".card-cache.bin")
+PERSIST_CARD_CACHE = True
+# Where tribute entries live: "json" (data.json) or "sqlite" (TRIBUTE_DB). Also --store.
+TRIBUTE_STORE = os.environ.get("MM_TRIBUTE_STORE", "json").strip().lower() or "json"
+TRIBUTE_DB = os.path.join(PROJECT_ROOT, "tributes.sqlite3")
 CARDS_PER_PAGE = 15
 MAX_IMAGE_WIDTH = 1200
 WEBP_QUALITY = 85
+WEBP_METHOD = 6  # slower but better compression
+# sitemap.xml is an index over shard files of at most SITEMAP_MAX_URLS URLs (protocol limit 50,000).
+SITEMAP_MAX_URLS = 50000
+SITEMAP_GZIP = False  # write shards as sitemap-*.xml.gz
+# Smaller copies written next to each full-size image for srcset (card thumbnail, mid).
+IMAGE_VARIANT_WIDTHS = (400, 800)
+# Opt-in AVIF copies next to every WebP (set MM_AVIF=1 or pass --avif); served via <picture>.
+ENABLE_AVIF = os.environ.get("MM_AVIF", "").strip().lower() in ("1", "true", "yes")
+AVIF_QUALITY = 60
+AVIF_SPEED = 6  # 0 (slowest, smallest) .. 10 (fastest)
+# Rendered widths: cards are <=320px in a 3/2/1 column grid; the tribute photo is <=760px.
+CARD_IMAGE_SIZES = "(max-width: 680px) 100vw, (max-width: 1100px) 50vw, 320px"
+TRIBUTE_IMAGE_SIZES = "(max-width: 768px) 300px, 760px"
 
 # CSS path used by the generated tribute pages (adjust if your live path differs)
 TRIBUTE_CSS_HREF = "/pet-tributes/assets/mm-tribute.css"
@@ -42,6 +99,82 @@ TRIBUTE_CSS_HREF = "/pet-tributes/assets/mm-tribute.css"
 # Placeholder source used when no image is uploaded.
 PLACEHOLDER_IMAGE_FILE = os.path.join(TRIBUTES_DIR, "assets", "blank_memorial_loving_memory.png")
 
+# Encoded image derivatives keyed by source hash + encoding parameters (local only).
+IMAGE_CACHE_DIR = os.path.join(PROJECT_ROOT, ".image-cache")
+# Hardlink cache hits into tribute folders (falls back to a copy across filesystems).
+IMAGE_CACHE_HARDLINK = True
+
+# Rows shown per page in the Tribute Manager table.
+TRIBUTE_TABLE_PAGE_SIZE = 200
+
+# Publish notification email; the login password comes from MM_EMAIL_PASS.
+# For a local stand-in (e.g. `python -m aiosmtpd -n -l localhost:8025`) set
+# MM_SMTP_HOST=localhost MM_SMTP_PORT=8025 MM_SMTP_SECURITY=none.
+SMTP_HOST = os.environ.get("MM_SMTP_HOST", "mail.privateemail.com")
+SMTP_PORT = int(os.environ.get("MM_SMTP_PORT", "465"))
+SMTP_SECURITY = os.environ.get("MM_SMTP_SECURITY", "ssl").strip().lower()  # "ssl", "starttls" or "none"
+SMTP_TIMEOUT = 30
+EMAIL_SENDER = "rodney@meltonmemorials.com"
+EMAIL_BCC = EMAIL_SENDER  # Internal delivery confirmation copy.
+EMAIL_RATE_PER_MINUTE = 30  # across all connections; 0 disables the limit
+EMAIL_MESSAGES_PER_CONNECTION = 50  # reconnect after this many (providers cap per-session sends)
+EMAIL_CONNECTIONS = 3  # concurrent SMTP sessions for bulk sends
+EMAIL_SEND_RETRIES = 2  # immediate retries of a transient failure within one run
+EMAIL_MAX_ATTEMPTS = 5  # runs before a queued email is given up on
+EMAIL_RETRY_BASE_SECONDS = 300  # wait before the next run may retry: base * 2 ** (attempts - 1)
+
+
+# ----------------------------
+# Build timing
+# ----------------------------
+
+# Per-run totals for --timings: {span name: {"count", "seconds", "max_seconds"}}
+# plus generated-file counters. Span times include nested spans. Spans inside
+# pool workers are not collected; the parent-side span around the pool covers them.
+_build_spans = {}
+_build_files = {"written": 0, "skipped": 0, "bytes_written": 0}
+
+
+def record_span(name: str, elapsed: float):
+    span = _build_spans.setdefault(name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+    span["count"] += 1
+    span["seconds"] += elapsed
+    span["max_seconds"] = max(span["max_seconds"], elapsed)
+
+
+def timed(fn):
+    """Record each call of `fn` as a span named after the function."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record_span(fn.__name__, time.perf_counter() - started)
+    return wrapper
+
+
+def count_output_file(path: str, written: bool):
+    if written:
+        _build_files["written"] += 1
+        _build_files["bytes_written"] += os.path.getsize(path)
+    else:
+        _build_files["skipped"] += 1
+
+
+def build_report(command: str, seconds: float) -> dict:
+    spans = {
+        name: {"count": span["count"], "seconds": round(span["seconds"], 4), "max_seconds": round(span["max_seconds"], 4)}
+        for name, span in sorted(_build_spans.items(), key=lambda item: -item[1]["seconds"])
+    }
+    return {
+        "command": command,
+        "finished": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(seconds, 4),
+        "spans": spans,
+        "files": dict(_build_files),
+    }
+
 
 # ----------------------------
 # Helpers
@@ -53,6 +186,57 @@ def load_template(filename: str) -> str:
         return f.read()
 
 
+TEMPLATE_PLACEHOLDER_RE = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
+
+
+class CompiledTemplate:
+    """
+    A template parsed once into alternating literal text and {{PLACEHOLDER}}
+    names, so a page renders with one join instead of a str.replace per field.
+    Placeholders with no value are left as-is (same as the old replace chain).
+    """
+    __slots__ = ("literals", "names")
+
+    def __init__(self, source: str):
+        parts = TEMPLATE_PLACEHOLDER_RE.split(source)
+        self.literals = parts[0::2]
+        self.names = parts[1::2]
+
+    def render(self, values: dict) -> str:
+        out = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            value = values.get(name)
+            out.append(f"{{{{{name}}}}}" if value is None else value)
+            out.append(literal)
+        return "".join(out)
+
+
+# filename -> (mtime_ns, size, CompiledTemplate)
+_template_cache = {}
+
+
+def get_template(filename: str) -> CompiledTemplate:
+    """Compiled template, re-read only when the file's mtime/size changes."""
+    st = os.stat(os.path.join(TEMPLATES_DIR, filename))
+    cached = _template_cache.get(filename)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    compiled = CompiledTemplate(load_template(filename))
+    _template_cache[filename] = (st.st_mtime_ns, st.st_size, compiled)
+    return compiled
+
+
+def render_template(filename: str, **values: str) -> str:
+    return get_template(filename).render(values)
+
+
+def published_time_meta(published_time: str) -> str:
+    """The article:published_time tag, or nothing for a listing with no dated tributes."""
+    if not published_time:
+        return ""
+    return f'<meta property="article:published_time" content="{published_time}">'
+
+
 def normalize_years_input(years_raw: str) -> tuple[str, str, str]:
     """
     Accepts: '2008-2019' or '2008–2019' or '2008 — 2019'
@@ -141,50 +325,128 @@ def clean_meta_preview(text: str, max_chars: int = 120) -> str:
     return chunk.rstrip(" ,;:-")
 
 
-def parse_safe_markdown(text: str) -> str:
-    # Escape all HTML first
-    text = html.escape(text or "")
+_EMPHASIS_TAGS = {1: "em", 2: "strong"}
+_STAR_RUN_RE = re.compile(r"(\*+)")
+
+
+def _delimiter_runs(parts: list[str]) -> list[list]:
+    """Delimiter records for the `*` runs at the odd indexes of _STAR_RUN_RE.split(line)."""
+    runs = []
+    for i in range(1, len(parts), 2):
+        # Runs are maximal, so an empty neighbour means the start/end of the line.
+        before = parts[i - 1][-1:] or " "
+        after = parts[i + 1][:1] or " "
+        size = len(parts[i])
+        # [remaining stars, can open, can close, closing tags, opening tags, run length]
+        runs.append([size, not after.isspace(), not before.isspace(), "", "", size])
+    return runs
+
+
+def _can_pair(opener: list, closer: list) -> bool:
+    # CommonMark's "rule of 3": keeps **a*b** as bold instead of nesting italics.
+    if (opener[2] or closer[1]) and (opener[5] + closer[5]) % 3 == 0:
+        return opener[5] % 3 == 0 and closer[5] % 3 == 0
+    return True
+
+
+def _match_emphasis(runs: list[list]):
+    """Pair `*`/`**` runs innermost-first so tags always nest (e.g. ***x*** -> <em><strong>x</strong></em>)."""
+    openers = []
+    for run in runs:
+        if run[2]:
+            i = len(openers) - 1
+            while run[0] and i >= 0:
+                opener = openers[i]
+                if not _can_pair(opener, run):
+                    i -= 1
+                    continue
+                while opener[0] and run[0]:
+                    use = 2 if opener[0] >= 2 and run[0] >= 2 else 1
+                    tag = _EMPHASIS_TAGS[use]
+                    opener[0] -= use
+                    run[0] -= use
+                    opener[4] = f"<{tag}>" + opener[4]
+                    run[3] += f"</{tag}>"
+                # Runs between a matched pair can no longer open anything.
+                del openers[i + 1:]
+                if not opener[0]:
+                    openers.pop()
+                i = len(openers) - 1
+        if run[0] and run[1]:
+            openers.append(run)
+
+
+def _render_markdown_lines(text: str) -> tuple[list[str], list[str]]:
+    """One pass over the message: (HTML block per line, plain text per line)."""
+    html_lines = []
+    plain_parts = []
+    text = (text or "").replace("\r", "")
+    # Escaping never touches "*", "#" or whitespace, so the markup can be parsed from the escaped text.
+    for line in html.escape(text).split("\n"):
+        if not line or line.isspace():
+            continue
+        tag = ""
+        if line[0] == "#":
+            if line.startswith("### ") and len(line) > 4:
+                tag, line = "h3", line[4:]
+            elif line.startswith("## ") and len(line) > 3:
+                tag, line = "h2", line[3:]
+
+        if "*" in line:
+            parts = _STAR_RUN_RE.split(line)
+            runs = _delimiter_runs(parts)
+            _match_emphasis(runs)
+            plain_out = parts[:]
+            for k, run in enumerate(runs):
+                stars = "*" * run[0]
+                parts[2 * k + 1] = run[3] + stars + run[4]
+                plain_out[2 * k + 1] = stars
+            body = "".join(parts)
+            plain = "".join(plain_out)
+        else:
+            body = plain = line
+        html_lines.append(f"<{tag}>{body}</{tag}>" if tag else f"<p>{body}</p>")
+        plain_parts.append(plain)
+    return html_lines, plain_parts
 
-    # Headings
-    text = re.sub(r"^### (.+)$", r"<h3>\1</h3>", text, flags=re.MULTILINE)
-    text = re.sub(r"^## (.+)$", r"<h2>\1</h2>", text, flags=re.MULTILINE)
 
-    # Bold
-    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+def _plain_from_parts(plain_parts: list[str]) -> str:
+    plain = " ".join(plain_parts)
+    if "&" in plain:
+        plain = html.unescape(plain)
+    return " ".join(plain.split())
 
-    # Italic
-    text = re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
 
-    # Paragraph wrapping
-    lines = text.split("\n")
-    wrapped = []
-    for line in lines:
-        if line.strip() == "":
-            continue
-        if line.startswith("<h2>") or line.startswith("<h3>"):
-            wrapped.append(line)
-        else:
-            wrapped.append(f"<p>{line}</p>")
+def render_message_markdown(text: str) -> dict:
+    """
+    Render the limited tribute markdown (## / ### headings, *italic*, **bold**) in one pass.
+    Returns {"html": safe HTML, "plain": text without markup, "preview": ASCII text for meta descriptions}.
+    """
+    html_lines, plain_parts = _render_markdown_lines(text)
+    plain = _plain_from_parts(plain_parts)
+    return {"html": "\n".join(html_lines), "plain": plain, "preview": meta_preview_text(plain)}
 
-    return "\n".join(wrapped)
 
+def meta_preview_text(plain: str) -> str:
+    """ASCII-only message text used to build the tribute meta description."""
+    clean = re.sub(r"[^\x00-\x7F]+", "", plain or "")
+    clean = re.sub(r"\s+\.", ".", clean)
+    return re.sub(r"\s{2,}", " ", clean).strip()
 
-def strip_markdown_for_excerpt(text: str) -> str:
-    text = text or ""
 
-    # Remove headings
-    text = re.sub(r"^### (.+)$", r"\1", text, flags=re.MULTILINE)
-    text = re.sub(r"^## (.+)$", r"\1", text, flags=re.MULTILINE)
+def message_html_to_plain(message_html: str) -> str:
+    """Plain text of rendered message HTML (matches render_message_markdown's "plain")."""
+    plain = html.unescape(re.sub(r"<[^>]+>", " ", message_html or ""))
+    return re.sub(r"\s+", " ", plain).strip()
+
 
-    # Remove bold/italic markers
-    text = re.sub(r"\*\*(.+?)\*\*", r"\1", text)
-    text = re.sub(r"\*(.+?)\*", r"\1", text)
+def parse_safe_markdown(text: str) -> str:
+    return "\n".join(_render_markdown_lines(text)[0])
 
-    # Collapse whitespace
-    text = re.sub(r"\s+", " ", text).strip()
 
+def strip_markdown_for_excerpt(text: str) -> str:
     # Decode entities so card previews show normal punctuation/quotes.
-    return html.unescape(text)
+    return html.unescape(_plain_from_parts(_render_markdown_lines(text)[1]))
 
 
 def normalize_dates_text(value: str) -> str:
@@ -213,6 +475,26 @@ def safe_mkdir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
+def atomic_write_text(path: str, content: str):
+    """
+    Write `content` to a temp file next to `path`, fsync it and os.replace it
+    into place, so readers (and uploads) never see a truncated file.
+    """
+    folder = os.path.dirname(path) or "."
+    safe_mkdir(folder)
+    tmp_path = os.path.join(folder, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def get_entry_folder(entry: dict) -> str:
     return (entry.get("folder") or "").strip().strip("/")
 
@@ -223,51 +505,174 @@ def get_entry_web_base(entry: dict) -> str:
     return f"/pet-tributes/{folder}/{slug}/" if folder else f"/pet-tributes/{slug}/"
 
 
+class TributeFolderIndex:
+    """
+    Folder names under pet-tributes/ and its subfolders (memorials/, folder
+    hints), read with one os.scandir per parent the first time it is needed.
+    Lookups then cost a set membership test instead of stat calls.
+    """
+
+    def __init__(self):
+        self._dirs = {}
+
+    def names(self, parent: str = "") -> set[str]:
+        """Subfolder names of pet-tributes/<parent> ("" for pet-tributes itself)."""
+        if parent not in self._dirs:
+            names = set()
+            try:
+                with os.scandir(os.path.join(TRIBUTES_DIR, parent) if parent else TRIBUTES_DIR) as it:
+                    # is_dir() comes from the directory listing itself on most platforms.
+                    names = {e.name for e in it if e.is_dir()}
+            except OSError:
+                pass
+            self._dirs[parent] = names
+        return self._dirs[parent]
+
+    def find(self, slug: str, folder_hint: str = "") -> str | None:
+        """The tribute folder in find_tribute_folder's lookup order, or None when the scan did not see one."""
+        hint = (folder_hint or "").strip().strip("/")
+        for parent in dict.fromkeys(p for p in (hint, "memorials") if p):
+            if slug in self.names(parent):
+                return os.path.join(TRIBUTES_DIR, parent, slug)
+        return None
+
+    def add(self, path: str):
+        parent, name = os.path.split(os.path.relpath(path, TRIBUTES_DIR))
+        if parent in self._dirs:
+            self._dirs[parent].add(name)
+
+    def forget(self, path: str):
+        parent, name = os.path.split(os.path.relpath(path, TRIBUTES_DIR))
+        if parent in self._dirs:
+            self._dirs[parent].discard(name)
+
+
+_folder_index = None
+
+
+def tribute_folder_index(refresh: bool = False) -> TributeFolderIndex:
+    """The shared folder index; refresh=True rescans (for prune/migration, which must see the disk as it is now)."""
+    global _folder_index
+    if _folder_index is None or refresh:
+        _folder_index = TributeFolderIndex()
+    return _folder_index
+
+
 def find_tribute_folder(slug: str, folder_hint: str = "") -> str:
     slug = (slug or "").strip()
     hint = (folder_hint or "").strip().strip("/")
+    index = tribute_folder_index()
+    found = index.find(slug, hint)
+    if found:
+        return found
+    # Not in the scan (e.g. created since): probe the disk as before.
     if hint:
         hinted = os.path.join(TRIBUTES_DIR, hint, slug)
         if os.path.exists(hinted):
+            index.add(hinted)
             return hinted
     memorials_path = os.path.join(MEMORIALS_DIR, slug)
     if os.path.exists(memorials_path):
+        index.add(memorials_path)
         return memorials_path
     return os.path.join(TRIBUTES_DIR, slug)
 
 
 def ensure_pillow():
+    # find_spec checks availability without paying for the import.
+    return importlib.util.find_spec("PIL") is not None
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _materialize_cached_image(cached_path: str, dest_path: str):
+    if os.path.exists(dest_path) and os.path.samefile(cached_path, dest_path):
+        return
+    # Link/copy to a temp name and swap it in: a hardlinked destination is never
+    # written through into the cache, and readers never see a half-copied image.
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    linked = False
+    if IMAGE_CACHE_HARDLINK:
+        try:
+            os.link(cached_path, tmp_path)
+            linked = True
+        except OSError:
+            pass
+    if not linked:
+        shutil.copyfile(cached_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+
+
+def cached_image_derivative(src_path: str, dest_path: str, kind: str, params: dict, encode) -> dict:
+    """
+    Produce dest_path from src_path via encode(src_path, out_path, **params) -> info,
+    reusing a previous result when the same source bytes were already encoded as
+    `kind` with the same params. Returns the info dict, with "cached": True on a hit.
+    """
+    key_source = json.dumps({"src": file_sha256(src_path), "kind": kind, **params}, sort_keys=True)
+    key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+    cache_folder = os.path.join(IMAGE_CACHE_DIR, key[:2])
+    cached_path = os.path.join(cache_folder, f"{key}.img")
+    info_path = os.path.join(cache_folder, f"{key}.json")
+
+    if os.path.exists(cached_path) and os.path.exists(info_path):
+        try:
+            with open(info_path, "r", encoding="utf-8") as f:
+                info = json.load(f)
+            _materialize_cached_image(cached_path, dest_path)
+            info["cached"] = True
+            return info
+        except (OSError, ValueError):
+            pass  # damaged entry: re-encode below
+
+    safe_mkdir(cache_folder)
+    # Unique temp name: pool workers may encode the same source concurrently.
+    tmp_path = f"{cached_path}.{os.getpid()}.tmp"
     try:
-        return Image is not None
-    except Exception:
-        return False
+        info = encode(src_path, tmp_path, **params)
+        os.replace(tmp_path, cached_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    atomic_write_text(info_path, json.dumps(info))
+    _materialize_cached_image(cached_path, dest_path)
+    return dict(info, cached=False)
 
 
-def process_placeholder_image(source_png_path: str, output_path: str):
+def _encode_placeholder(source_png_path: str, output_path: str, max_width: int, quality: int) -> dict:
+    from PIL import Image
+
     with Image.open(source_png_path) as img:
         img = img.convert("RGB")
 
-        if img.width > MAX_IMAGE_WIDTH:
-            ratio = MAX_IMAGE_WIDTH / img.width
+        if img.width > max_width:
+            ratio = max_width / img.width
             new_height = int(img.height * ratio)
-            img = img.resize((MAX_IMAGE_WIDTH, new_height), Image.LANCZOS)
+            img = img.resize((max_width, new_height), Image.LANCZOS)
 
-        img.save(output_path, "WEBP", quality=WEBP_QUALITY)
+        img.save(output_path, "WEBP", quality=quality)
+        return {"final": img.size}
 
 
-def convert_to_webp_normalized(
-    src_path: str,
-    dest_path: str,
-    max_width: int = MAX_IMAGE_WIDTH,
-    quality: int = WEBP_QUALITY,
-) -> dict:
-    """
-    Convert an uploaded image to WebP and normalize size:
-    - If source width > max_width, downscale to max_width preserving aspect ratio
-    - If source width <= max_width, keep original size (no upscaling)
-    - Respect EXIF orientation
-    Returns info dict for logging/debug.
-    """
+def process_placeholder_image(source_png_path: str, output_path: str):
+    cached_image_derivative(
+        source_png_path,
+        output_path,
+        "placeholder",
+        {"max_width": MAX_IMAGE_WIDTH, "quality": WEBP_QUALITY},
+        _encode_placeholder,
+    )
+
+
+def _encode_webp_normalized(src_path: str, dest_path: str, max_width: int, quality: int, method: int) -> dict:
     from PIL import Image, ImageOps
 
     with Image.open(src_path) as im:
@@ -292,7 +697,7 @@ def convert_to_webp_normalized(
         save_kwargs = {
             "format": "WEBP",
             "quality": quality,
-            "method": 6,     # slower but better compression
+            "method": method,
         }
 
         # If image has alpha, keep it; otherwise ensure RGB
@@ -307,12 +712,390 @@ def convert_to_webp_normalized(
         }
 
 
-def load_data() -> list[dict]:
-    if not os.path.exists(ARCHIVE_DATA):
-        return []
-    # Use utf-8-sig so BOM-prefixed JSON files still parse cleanly.
-    with open(ARCHIVE_DATA, "r", encoding="utf-8-sig") as f:
-        items = json.load(f)
+def convert_to_webp_normalized(
+    src_path: str,
+    dest_path: str,
+    max_width: int = MAX_IMAGE_WIDTH,
+    quality: int = WEBP_QUALITY,
+    method: int = WEBP_METHOD,
+) -> dict:
+    """
+    Convert an uploaded image to WebP and normalize size:
+    - If source width > max_width, downscale to max_width preserving aspect ratio
+    - If source width <= max_width, keep original size (no upscaling)
+    - Respect EXIF orientation
+    Re-attaching a source already converted with the same settings reuses the
+    cached encode (see cached_image_derivative).
+    Returns info dict for logging/debug.
+    """
+    return cached_image_derivative(
+        src_path,
+        dest_path,
+        "webp",
+        {"max_width": max_width, "quality": quality, "method": method},
+        _encode_webp_normalized,
+    )
+
+
+def _encode_webp_variant(src_path: str, dest_path: str, width: int, quality: int, method: int) -> dict:
+    from PIL import Image
+
+    with Image.open(src_path) as im:
+        height = int((width / im.width) * im.height)
+        im = im.resize((width, height), Image.LANCZOS)
+        im.save(dest_path, format="WEBP", quality=quality, method=method)
+        return {"final": (width, height)}
+
+
+def _encode_avif(src_path: str, dest_path: str, width: int, quality: int, speed: int) -> dict:
+    from PIL import Image
+
+    started = time.perf_counter()
+    with Image.open(src_path) as im:
+        if width < im.width:
+            im = im.resize((width, int((width / im.width) * im.height)), Image.LANCZOS)
+        im.save(dest_path, format="AVIF", quality=quality, speed=speed)
+        final = im.size
+    return {"final": final, "encode_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+_avif_support = None
+
+
+def avif_supported() -> bool:
+    """True when the local Pillow build can encode AVIF; warns once when it cannot."""
+    global _avif_support
+    if _avif_support is None:
+        try:
+            from PIL import features
+
+            _avif_support = bool(features.check("avif"))
+        except Exception:
+            _avif_support = False
+        if not _avif_support:
+            print("[avif] Pillow was built without AVIF support; serving WebP only.")
+    return _avif_support
+
+
+def variant_filename(filename: str, width: int) -> str:
+    stem = os.path.splitext(filename)[0]
+    return f"{stem}-{width}w.webp"
+
+
+def ensure_image_variants(full_path: str) -> dict:
+    """
+    Write the IMAGE_VARIANT_WIDTHS copies of a full-size tribute image (never
+    upscaling) and return {"width", "height", "variants": {"400": filename, ...}}.
+    """
+    from PIL import Image
+
+    with Image.open(full_path) as im:
+        width, height = im.size
+    variants = {}
+    for variant_width in IMAGE_VARIANT_WIDTHS:
+        if variant_width >= width:
+            continue
+        name = variant_filename(os.path.basename(full_path), variant_width)
+        cached_image_derivative(
+            full_path,
+            os.path.join(os.path.dirname(full_path), name),
+            "variant",
+            {"width": variant_width, "quality": WEBP_QUALITY, "method": WEBP_METHOD},
+            _encode_webp_variant,
+        )
+        variants[str(variant_width)] = name
+    meta = {"width": width, "height": height, "variants": variants}
+    if ENABLE_AVIF and avif_supported():
+        meta["avif"] = ensure_avif_copies(full_path, width, variants)
+    return meta
+
+
+def ensure_avif_copies(full_path: str, full_width: int, variants: dict) -> dict:
+    """Write an AVIF next to the full image and each width variant; returns {"<width>": filename}."""
+    folder = os.path.dirname(full_path)
+    webp_by_width = {int(w): name for w, name in variants.items()}
+    webp_by_width[full_width] = os.path.basename(full_path)
+    avif = {}
+    for width, webp_name in sorted(webp_by_width.items()):
+        name = os.path.splitext(webp_name)[0] + ".avif"
+        dest = os.path.join(folder, name)
+        info = cached_image_derivative(
+            full_path,
+            dest,
+            "avif",
+            {"width": width, "quality": AVIF_QUALITY, "speed": AVIF_SPEED},
+            _encode_avif,
+        )
+        if not info.get("cached"):
+            webp_size = os.path.getsize(os.path.join(folder, webp_name))
+            avif_size = os.path.getsize(dest)
+            print(
+                f"[avif] {name}: {avif_size} bytes in {info.get('encode_ms')} ms "
+                f"(webp {webp_size} bytes, {avif_size / max(webp_size, 1):.0%})"
+            )
+        avif[str(width)] = name
+    return avif
+
+
+@timed
+def refresh_entry_image_meta(entry: dict) -> dict:
+    """
+    Make sure the entry's images have their width variants on disk and store
+    {prefix}_width / {prefix}_height / {prefix}_variants for image and image2.
+    """
+    tribute_folder = find_tribute_folder(entry.get("slug", ""), entry.get("folder", ""))
+    for prefix in ("image", "image2"):
+        filename = (entry.get(f"{prefix}_filename") or "").strip()
+        full_path = os.path.join(tribute_folder, filename) if filename else ""
+        if not full_path or not os.path.isfile(full_path) or not filename.endswith(".webp"):
+            for key in (f"{prefix}_width", f"{prefix}_height", f"{prefix}_variants", f"{prefix}_avif"):
+                entry.pop(key, None)
+            continue
+        meta = ensure_image_variants(full_path)
+        for name in list(meta["variants"].values()) + list(meta.get("avif", {}).values()):
+            record_output_file(os.path.join(tribute_folder, name))
+        entry[f"{prefix}_width"] = meta["width"]
+        entry[f"{prefix}_height"] = meta["height"]
+        entry[f"{prefix}_variants"] = meta["variants"]
+        if meta.get("avif"):
+            entry[f"{prefix}_avif"] = meta["avif"]
+        else:
+            entry.pop(f"{prefix}_avif", None)
+    return entry
+
+
+def image_meta_from_entry(entry: dict, prefix: str) -> dict | None:
+    width = entry.get(f"{prefix}_width")
+    height = entry.get(f"{prefix}_height")
+    if not width or not height:
+        return None
+    meta = {"width": width, "height": height, "variants": entry.get(f"{prefix}_variants") or {}}
+    if entry.get(f"{prefix}_avif"):
+        meta["avif"] = entry[f"{prefix}_avif"]
+    return meta
+
+
+def build_responsive_img_attrs(web_base: str, filename: str, meta: dict | None, sizes: str) -> str:
+    """srcset/sizes plus intrinsic width/height for an <img> (empty when dimensions are unknown)."""
+    if not meta:
+        return ""
+    candidates = sorted((int(w), name) for w, name in meta["variants"].items())
+    candidates.append((meta["width"], filename))
+    attrs = f' width="{meta["width"]}" height="{meta["height"]}"'
+    if len(candidates) > 1:
+        srcset = ", ".join(f"{web_base}{escape_html(name)} {w}w" for w, name in candidates)
+        attrs = f' srcset="{srcset}" sizes="{sizes}"' + attrs
+    return attrs
+
+
+def build_responsive_image_html(web_base: str, filename: str, meta: dict | None, sizes: str, alt: str, extra_attrs: str = "") -> str:
+    """<img> with srcset/dimensions, wrapped in <picture> with an AVIF <source> when AVIF copies exist."""
+    img = (
+        f'<img src="{web_base}{escape_html(filename)}"'
+        f'{build_responsive_img_attrs(web_base, filename, meta, sizes)} alt="{alt}"{extra_attrs}>'
+    )
+    if not meta or not meta.get("avif"):
+        return img
+    srcset = ", ".join(
+        f"{web_base}{escape_html(name)} {w}w" for w, name in sorted((int(w), n) for w, n in meta["avif"].items())
+    )
+    return f'<picture><source type="image/avif" srcset="{srcset}" sizes="{sizes}">{img}</picture>'
+
+
+# ----------------------------
+# Build manifest
+# ----------------------------
+
+class BuildManifest:
+    """
+    Content hashes of every generated file under TRIBUTES_DIR, keyed by path
+    relative to TRIBUTES_DIR. Used to skip writes whose bytes would not change
+    and to list what needs uploading since the last deploy.
+    """
+
+    def __init__(self, path: str = BUILD_MANIFEST):
+        self.path = path
+        self.files = {}
+        self.deployed = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            # A corrupt manifest only costs one round of redundant writes.
+            return
+        self.files = raw.get("files") or {}
+        self.deployed = raw.get("deployed") or {}
+
+    def save(self):
+        if not self._dirty:
+            return
+        atomic_write_text(
+            self.path,
+            json.dumps({"files": self.files, "deployed": self.deployed}, ensure_ascii=False, indent=2, sort_keys=True),
+        )
+        self._dirty = False
+
+    @staticmethod
+    def key_for(path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), TRIBUTES_DIR).replace(os.sep, "/")
+
+    def is_current(self, path: str, digest: str) -> bool:
+        record = self.files.get(self.key_for(path))
+        if not record or record.get("sha256") != digest:
+            return False
+        try:
+            return os.path.getsize(path) == record.get("size")
+        except OSError:
+            return False
+
+    def record(self, path: str, digest: str):
+        self.files[self.key_for(path)] = {"sha256": digest, "size": os.path.getsize(path)}
+        self._dirty = True
+
+    def forget(self, path: str):
+        """Drop a file, or every file below a folder, after it was removed from disk."""
+        key = self.key_for(path)
+        prefix = key.rstrip("/") + "/"
+        stale = [k for k in self.files if k == key or k.startswith(prefix)]
+        for k in stale:
+            del self.files[k]
+        if stale:
+            self._dirty = True
+
+    def changed_since_deploy(self) -> list[str]:
+        """Generated files (relative to TRIBUTES_DIR) that differ from the last deploy."""
+        return sorted(k for k, record in self.files.items() if self.deployed.get(k) != record.get("sha256"))
+
+    def removed_since_deploy(self) -> list[str]:
+        """Files that were deployed but are no longer generated."""
+        return sorted(k for k in self.deployed if k not in self.files)
+
+    def mark_deployed(self):
+        self.deployed = {k: record.get("sha256") for k, record in self.files.items()}
+        self._dirty = True
+        self.save()
+
+
+_build_manifest = None
+
+
+def get_build_manifest() -> BuildManifest:
+    global _build_manifest
+    if _build_manifest is None:
+        _build_manifest = BuildManifest()
+    return _build_manifest
+
+
+def flush_build_manifest():
+    if _build_manifest is not None:
+        _build_manifest.save()
+
+
+def write_output_file(path: str, content: str) -> bool:
+    """
+    Write generated text to `path` unless identical content is already there.
+    Returns True when the file was (re)written.
+    """
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    manifest = get_build_manifest()
+    if manifest.is_current(path, digest):
+        count_output_file(path, False)
+        return False
+
+    # Not tracked yet (or tracked with another hash): compare with what is on disk
+    # so an existing identical file is adopted instead of rewritten.
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if f.read() == content:
+                    manifest.record(path, digest)
+                    count_output_file(path, False)
+                    return False
+        except (OSError, UnicodeDecodeError):
+            pass
+
+    atomic_write_text(path, content)
+    manifest.record(path, digest)
+    count_output_file(path, True)
+    return True
+
+
+def write_output_stream(path: str, chunks, compress: bool = False) -> bool:
+    """
+    write_output_file for large outputs: streams text `chunks` (gzip-compressed
+    when `compress`) to a temp file, then swaps it in only if the bytes changed.
+    """
+    folder = os.path.dirname(path)
+    safe_mkdir(folder)
+    tmp_path = os.path.join(folder, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as raw:
+            # mtime=0 keeps gzip output byte-identical for identical content.
+            out = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) if compress else raw
+            for chunk in chunks:
+                out.write(chunk.encode("utf-8"))
+            if compress:
+                out.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+        digest = file_sha256(tmp_path)
+        manifest = get_build_manifest()
+        if manifest.is_current(path, digest):
+            count_output_file(path, False)
+            return False
+        if os.path.exists(path) and file_sha256(path) == digest:
+            manifest.record(path, digest)
+            count_output_file(path, False)
+            return False
+        os.replace(tmp_path, path)
+        manifest.record(path, digest)
+        count_output_file(path, True)
+        return True
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def record_output_file(path: str):
+    """Track a file written outside write_output_file (e.g. converted images)."""
+    manifest = get_build_manifest()
+    digest = file_sha256(path)
+    count_output_file(path, not manifest.is_current(path, digest))
+    manifest.record(path, digest)
+
+
+def remove_output_folder(folder: str):
+    # Rename first so the folder disappears in one step instead of file by file.
+    doomed = f"{folder}.{os.getpid()}.deleting"
+    try:
+        os.rename(folder, doomed)
+    except OSError:
+        doomed = folder
+    shutil.rmtree(doomed, ignore_errors=True)
+    get_build_manifest().forget(folder)
+    if _folder_index is not None:
+        _folder_index.forget(folder)
+
+
+# ----------------------------
+# Tribute store
+# ----------------------------
+
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def normalize_data_items(items: list[dict]) -> list[dict]:
     for item in items:
         item["published_iso"] = normalize_published_iso(
             item.get("published_iso") or item.get("publish_date") or ""
@@ -324,10 +1107,322 @@ def load_data() -> list[dict]:
     return items
 
 
+def _read_data_snapshot(stamp: tuple[int, int]) -> list[dict] | None:
+    if not USE_DATA_SNAPSHOT:
+        return None
+    try:
+        with open(DATA_SNAPSHOT, "rb") as f:
+            snapshot = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("schema") != DATA_SNAPSHOT_SCHEMA
+        or tuple(snapshot.get("stamp") or ()) != stamp
+    ):
+        return None
+    return snapshot.get("items")
+
+
+def _write_data_snapshot(stamp: tuple[int, int], items: list[dict]):
+    if not USE_DATA_SNAPSHOT:
+        return
+    tmp_path = f"{DATA_SNAPSHOT}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(marshal.dumps({"schema": DATA_SNAPSHOT_SCHEMA, "stamp": stamp, "items": items}))
+        os.replace(tmp_path, DATA_SNAPSHOT)
+    except (OSError, ValueError) as e:
+        # The snapshot is only an accelerator; data.json stays authoritative.
+        print("Could not write data snapshot:", e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+class TributeStore(abc.ABC):
+    """
+    Where tribute entries are kept. load() returns normalized entries in
+    data.json order as fresh dicts callers may mutate; the parse is reused
+    until the backing file's (mtime_ns, size) changes. Safe to share between
+    the GUI thread and the background job worker.
+    """
+
+    name = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._stamp = None
+        self._items = []
+        self._lock = threading.RLock()
+
+    @abc.abstractmethod
+    def _read(self) -> list[dict]:
+        """Read every entry from the backing file, normalized, in order."""
+
+    @abc.abstractmethod
+    def _write(self, items: list[dict]):
+        """Replace the stored entries with `items`."""
+
+    def load(self) -> list[dict]:
+        with self._lock:
+            stamp = _file_stamp(self.path)
+            if stamp is None:
+                self._stamp, self._items = None, []
+            elif stamp != self._stamp:
+                self._items = self._read()
+                self._stamp = stamp
+            items = self._items
+        # Nested values (e.g. image_variants) are replaced by callers, never edited in place.
+        return [dict(item) for item in items]
+
+    def save(self, items: list[dict]):
+        # Round-trip through JSON so the cache holds exactly what a reload would.
+        saved = normalize_data_items(json.loads(json.dumps(items, ensure_ascii=False)))
+        with self._lock:
+            self._write(saved)
+            self._stamp = _file_stamp(self.path)
+            self._items = saved
+
+    def update(self, slug: str, changes: dict) -> bool:
+        """Apply field changes to one entry; returns False when the slug is unknown."""
+        with self._lock:
+            items = self.load()
+            entry = next((item for item in items if item.get("slug") == slug), None)
+            if entry is None:
+                return False
+            entry.update(changes)
+            self.save(items)
+            return True
+
+    def slugs(self) -> set[str]:
+        return {item.get("slug", "") for item in self.load() if item.get("slug")}
+
+    def query(self, pet_type: str = "", featured: bool | None = None, since: str = "", limit: int | None = None) -> list[dict]:
+        """Entries matching every given filter, newest published first; pet_type ignores case."""
+        pet_type = pet_type.strip().lower()
+        items = [
+            item for item in self.load()
+            if (not pet_type or (item.get("pet_type") or "").strip().lower() == pet_type)
+            and (featured is None or (item.get("featured") is True) == featured)
+            and (item.get("published_iso") or "") >= since
+        ]
+        # Stable, so equal dates keep data.json order (as the SQL tiebreak on position does).
+        items.sort(key=lambda item: item.get("published_iso") or "", reverse=True)
+        return items[:limit]
+
+
+class JsonTributeStore(TributeStore):
+    """The original layout: the whole list in pet-tributes/data.json."""
+
+    name = "json"
+
+    def _read(self) -> list[dict]:
+        stamp = _file_stamp(self.path)
+        items = _read_data_snapshot(stamp)
+        if items is None:
+            # Use utf-8-sig so BOM-prefixed JSON files still parse cleanly.
+            with open(self.path, "r", encoding="utf-8-sig") as f:
+                items = normalize_data_items(json.load(f))
+            _write_data_snapshot(stamp, items)
+        return items
+
+    def _write(self, items: list[dict]):
+        # keep it readable + stable
+        write_output_file(self.path, json.dumps(items, ensure_ascii=False, indent=2))
+        flush_build_manifest()
+        _write_data_snapshot(_file_stamp(self.path), items)
+
+
+class SqliteTributeStore(TributeStore):
+    """
+    One row per tribute (the data.json object as JSON text) plus indexed
+    columns for slug, pet_type, published_iso and featured, which query() and
+    slugs() read without decoding every row. save() only touches rows whose
+    content or position changed, inside one transaction.
+    """
+
+    name = "sqlite"
+    SCHEMA_VERSION = 3
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            with conn:
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS tributes (
+                        slug TEXT PRIMARY KEY,
+                        position INTEGER NOT NULL,
+                        pet_type TEXT NOT NULL DEFAULT '',
+                        published_iso TEXT NOT NULL DEFAULT '',
+                        featured INTEGER NOT NULL DEFAULT 0,
+                        email_sent INTEGER NOT NULL DEFAULT 0,
+                        data TEXT NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS tributes_position ON tributes(position);
+                    CREATE INDEX IF NOT EXISTS tributes_pet_type ON tributes(pet_type);
+                    CREATE INDEX IF NOT EXISTS tributes_published_iso ON tributes(published_iso);
+                    CREATE INDEX IF NOT EXISTS tributes_featured ON tributes(featured);
+                    """
+                )
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        return conn
+
+    @staticmethod
+    def _row(position: int, item: dict) -> tuple:
+        return (
+            item["slug"],
+            position,
+            (item.get("pet_type") or "").strip().lower(),
+            item.get("published_iso") or "",
+            1 if item.get("featured") is True else 0,
+            1 if item.get("email_sent") is True else 0,
+            json.dumps(item, ensure_ascii=False),
+        )
+
+    def _read(self) -> list[dict]:
+        conn = self.connect()
+        try:
+            rows = conn.execute("SELECT data FROM tributes ORDER BY position").fetchall()
+        finally:
+            conn.close()
+        return normalize_data_items([json.loads(data) for (data,) in rows])
+
+    def _write(self, items: list[dict]):
+        seen = set()
+        for item in items:
+            slug = (item.get("slug") or "").strip()
+            if not slug or slug in seen:
+                raise TributeError("Tribute Store", f'Every tribute needs a unique slug (got "{slug}").')
+            seen.add(slug)
+
+        conn = self.connect()
+        try:
+            with conn:
+                existing = {
+                    slug: (position, data)
+                    for slug, position, data in conn.execute("SELECT slug, position, data FROM tributes")
+                }
+                gone = [(slug,) for slug in existing if slug not in seen]
+                conn.executemany("DELETE FROM tributes WHERE slug = ?", gone)
+                for position, item in enumerate(items):
+                    row = self._row(position, item)
+                    old = existing.get(item["slug"])
+                    if old is None or old[1] != row[-1]:
+                        conn.execute("INSERT OR REPLACE INTO tributes VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+                    elif old[0] != position:
+                        conn.execute("UPDATE tributes SET position = ? WHERE slug = ?", (position, item["slug"]))
+        finally:
+            conn.close()
+
+    def update(self, slug: str, changes: dict) -> bool:
+        with self._lock:
+            conn = self.connect()
+            try:
+                with conn:
+                    found = conn.execute("SELECT position, data FROM tributes WHERE slug = ?", (slug,)).fetchone()
+                    if found is None:
+                        return False
+                    position, data = found
+                    entry = json.loads(data)
+                    entry.update(changes)
+                    normalize_data_items([entry])
+                    conn.execute("INSERT OR REPLACE INTO tributes VALUES (?, ?, ?, ?, ?, ?, ?)", self._row(position, entry))
+            finally:
+                conn.close()
+            self._stamp = None
+            return True
+
+    def slugs(self) -> set[str]:
+        if _file_stamp(self.path) is None:
+            return set()
+        conn = self.connect()
+        try:
+            return {slug for (slug,) in conn.execute("SELECT slug FROM tributes")}
+        finally:
+            conn.close()
+
+    def query(self, pet_type: str = "", featured: bool | None = None, since: str = "", limit: int | None = None) -> list[dict]:
+        if _file_stamp(self.path) is None:
+            return []
+        clauses, params = [], []
+        if pet_type.strip():
+            clauses.append("pet_type = ?")
+            params.append(pet_type.strip().lower())
+        if featured is not None:
+            clauses.append("featured = ?")
+            params.append(1 if featured else 0)
+        if since:
+            clauses.append("published_iso >= ?")
+            params.append(since)
+        sql = "SELECT data FROM tributes"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY published_iso DESC, position"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        conn = self.connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return normalize_data_items([json.loads(data) for (data,) in rows])
+
+
+TRIBUTE_STORE_TYPES = {"json": JsonTributeStore, "sqlite": SqliteTributeStore}
+_tribute_store = None
+
+
+def get_tribute_store() -> TributeStore:
+    global _tribute_store
+    if _tribute_store is None or _tribute_store.name != TRIBUTE_STORE:
+        if TRIBUTE_STORE not in TRIBUTE_STORE_TYPES:
+            raise TributeError("Tribute Store", f'Unknown tribute store "{TRIBUTE_STORE}" (use json or sqlite).')
+        path = TRIBUTE_DB if TRIBUTE_STORE == "sqlite" else ARCHIVE_DATA
+        _tribute_store = TRIBUTE_STORE_TYPES[TRIBUTE_STORE](path)
+    return _tribute_store
+
+
+@timed
+def load_data() -> list[dict]:
+    return get_tribute_store().load()
+
+
+@timed
 def save_data(items: list[dict]):
-    # keep it readable + stable
-    with open(ARCHIVE_DATA, "w", encoding="utf-8") as f:
-        json.dump(items, f, ensure_ascii=False, indent=2)
+    get_tribute_store().save(items)
+
+
+def update_entry_fields(slug: str, changes: dict) -> bool:
+    """Change fields of a single tribute without rewriting the others where the store allows it."""
+    return get_tribute_store().update(slug, changes)
+
+
+def export_tribute_data(path: str = ARCHIVE_DATA) -> int:
+    """Write the current store's entries in the data.json layout; returns the entry count."""
+    items = load_data()
+    if os.path.abspath(path) == os.path.abspath(ARCHIVE_DATA):
+        write_output_file(path, json.dumps(items, ensure_ascii=False, indent=2))
+        flush_build_manifest()
+    else:
+        atomic_write_text(path, json.dumps(items, ensure_ascii=False, indent=2))
+    return len(items)
+
+
+def import_tribute_data(path: str = ARCHIVE_DATA) -> int:
+    """Replace the current store's entries with a data.json-layout file; returns the entry count."""
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            items = json.load(f)
+    except (OSError, ValueError) as e:
+        raise TributeError("Tribute Store", f"Could not read {path}:\n{e}")
+    if not isinstance(items, list):
+        raise TributeError("Tribute Store", f"{path} must contain a JSON list of tributes.")
+    save_data(normalize_data_items(items))
+    return len(items)
 
 
 def prune_entries_missing_folders(items: list[dict]) -> tuple[list[dict], list[str]]:
@@ -337,15 +1432,18 @@ def prune_entries_missing_folders(items: list[dict]) -> tuple[list[dict], list[s
     """
     kept = []
     removed_slugs = []
+    folders = tribute_folder_index(refresh=True)
 
     for item in items:
         slug = (item.get("slug") or "").strip()
         if not slug:
             continue
 
-        tribute_folder = find_tribute_folder(slug, item.get("folder", ""))
-        index_file = os.path.join(tribute_folder, "index.html")
-        if os.path.isdir(tribute_folder) and os.path.exists(index_file):
+        # The scan already knows which folders exist; only index.html needs a stat.
+        tribute_folder = folders.find(slug, item.get("folder", ""))
+        if tribute_folder is None and slug in folders.names(""):
+            tribute_folder = os.path.join(TRIBUTES_DIR, slug)
+        if tribute_folder and os.path.isfile(os.path.join(tribute_folder, "index.html")):
             kept.append(item)
         else:
             removed_slugs.append(slug)
@@ -366,11 +1464,14 @@ def sort_entries_newest_first(items: list[dict]) -> list[dict]:
     )
     entries_sorted = [item for _, item in enumerated]
 
-    featured_entries = [e for e in entries_sorted if e.get("featured") is True]
-    if len(featured_entries) > 1:
-        # Keep only the newest featured tribute.
-        for e in featured_entries[1:]:
-            e["featured"] = False
+    # Keep only the newest featured tribute pinned. Demoted entries are copied so
+    # the caller's entries (and data.json) keep their featured flags.
+    seen_featured = False
+    for i, e in enumerate(entries_sorted):
+        if e.get("featured") is True:
+            if seen_featured:
+                entries_sorted[i] = dict(e, featured=False)
+            seen_featured = True
 
     featured_entry = next((e for e in entries_sorted if e.get("featured") is True), None)
     if featured_entry:
@@ -428,6 +1529,15 @@ def build_card_html(entry: dict) -> str:
         else f"{card_href}{escape_html(image_filename)}"
     )
     card_absolute_url = f"{SITE_DOMAIN}{card_href}"
+    card_img_alt = f"{escape_html(pet_name)} memorial tribute"
+    card_img_html = (
+        f'<img src="{card_img_src}" alt="{card_img_alt}" loading="lazy">'
+        if (not image_filename or image_filename == "blank_memorial_loving_memory.png")
+        else build_responsive_image_html(
+            card_href, image_filename, image_meta_from_entry(entry, "image"), CARD_IMAGE_SIZES,
+            card_img_alt, ' loading="lazy"',
+        )
+    )
     card_image_absolute_url = (
         f"{SITE_DOMAIN}{card_img_src}"
         if card_img_src.startswith("/")
@@ -466,7 +1576,7 @@ def build_card_html(entry: dict) -> str:
     <div class="{card_thumb_class}">
       <a class="mm-archive-link mm-archive-thumb-link" href="{card_href}">
       <span class="mm-date-badge">{escape_html(publish_label)}</span>
-      <img src="{card_img_src}" alt="{escape_html(pet_name)} memorial tribute" loading="lazy">
+      {card_img_html}
       </a>
       <a class="pin-button" href="{pin_url}" target="_blank" rel="noopener noreferrer" aria-label="Save {escape_html(pet_name)} tribute to Pinterest">Save</a>
     </div>
@@ -484,23 +1594,147 @@ def build_card_html(entry: dict) -> str:
 """.strip()
 
 
-def build_recently_remembered_cards_html(all_entries: list[dict], current_page_entries: list[dict]) -> str:
-    if not all_entries:
-        return ""
+def recently_remembered_seed(all_entries: list[dict]) -> str | None:
+    """
+    Seed for a listing's "recently remembered" picks (None in "random" mode).
+    It only depends on which tributes the listing holds, so unchanged data
+    renders byte-identical pages.
+    """
+    if RECENTLY_REMEMBERED_ROTATION == "random":
+        return None
+    h = hashlib.sha1(RECENTLY_REMEMBERED_SEED.encode("utf-8"))
+    if RECENTLY_REMEMBERED_ROTATION == "day":
+        h.update(datetime.now().strftime("%Y-%m-%d").encode("utf-8"))
+    for entry in all_entries:
+        h.update(b"\0" + (entry.get("slug") or "").strip().encode("utf-8"))
+    return h.hexdigest()
+
+
+def select_recently_remembered(
+    all_entries: list[dict],
+    current_page_entries: list[dict],
+    seed: str | None = None,
+) -> list[dict]:
+    """3-6 tributes not on the current page; reproducible per page when `seed` is given."""
+    if not all_entries:
+        return []
 
     page_slugs = {(e.get("slug") or "").strip() for e in current_page_entries}
+    if seed is None:
+        rng = random
+    else:
+        rng = random.Random(seed + "|" + "|".join(sorted(page_slugs)))
+        if len(all_entries) > 50:
+            # Large listing: draw a few indexes instead of building the candidate list.
+            sample_size = rng.randint(3, 6)
+            picks = rng.sample(range(len(all_entries)), min(len(all_entries), sample_size + len(page_slugs)))
+            chosen = []
+            for index in picks:
+                slug = (all_entries[index].get("slug") or "").strip()
+                if slug and slug not in page_slugs:
+                    chosen.append(all_entries[index])
+            if len(chosen) >= 3:
+                return chosen[:sample_size]
+
     candidates = [e for e in all_entries if (e.get("slug") or "").strip() and (e.get("slug") or "").strip() not in page_slugs]
     if len(candidates) < 3:
         candidates = [e for e in all_entries if (e.get("slug") or "").strip()]
 
     if not candidates:
-        return ""
+        return []
 
     max_cards = min(6, len(candidates))
     min_cards = min(3, len(candidates))
-    sample_size = max_cards if max_cards <= min_cards else random.randint(min_cards, max_cards)
-    selected_entries = random.sample(candidates, sample_size)
-    return "".join(build_card_html(entry) for entry in selected_entries)
+    sample_size = max_cards if max_cards <= min_cards else rng.randint(min_cards, max_cards)
+    return rng.sample(candidates, sample_size)
+
+
+def build_recently_remembered_cards_html(all_entries: list[dict], current_page_entries: list[dict]) -> str:
+    selected_entries = select_recently_remembered(
+        all_entries, current_page_entries, recently_remembered_seed(all_entries)
+    )
+    return "".join(cached_card_html(entry) for entry in selected_entries)
+
+
+def archive_listing_info(all_entries: list[dict]) -> dict:
+    """Per-listing values shared by all of its pages (computed once, not per page)."""
+    return {
+        "recent_seed": recently_remembered_seed(all_entries),
+        # Newest publish date in the listing, so the page only changes with the data.
+        "published_time": max((e.get("published_iso") or "" for e in all_entries), default=""),
+    }
+
+
+# ----------------------------
+# Card fragment cache
+# ----------------------------
+
+# {card fingerprint: card html}; the same card appears on the main archive,
+# its pet-type archive and in "recently remembered" strips.
+_card_cache = None
+
+
+def _card_cache_code_hash() -> str:
+    # Cards depend on this script's markup code, so any edit to it starts a fresh cache.
+    return file_sha256(os.path.abspath(__file__))
+
+
+def get_card_cache() -> dict:
+    global _card_cache
+    if _card_cache is None:
+        _card_cache = {}
+        if PERSIST_CARD_CACHE and os.path.exists(CARD_CACHE_FILE):
+            try:
+                with open(CARD_CACHE_FILE, "rb") as f:
+                    saved = marshal.loads(f.read())
+                if saved.get("code") == _card_cache_code_hash() and saved.get("site") == SITE_DOMAIN:
+                    _card_cache = saved["cards"]
+            except (OSError, EOFError, ValueError, TypeError, AttributeError, KeyError):
+                pass  # unreadable cache: start empty
+    return _card_cache
+
+
+def cached_card_html(entry: dict) -> str:
+    cache = get_card_cache()
+    key = entry_card_fingerprint(entry)
+    card_html = cache.get(key)
+    if card_html is None:
+        card_html = cache[key] = build_card_html(entry)
+    return card_html
+
+
+@timed
+def prime_card_cache(entries: list[dict], jobs: int = 1):
+    """Render every card not cached yet, across a process pool when `jobs` > 1."""
+    cache = get_card_cache()
+    missing = {}
+    for entry in entries:
+        key = entry_card_fingerprint(entry)
+        if key not in cache and key not in missing:
+            missing[key] = entry
+    if not missing:
+        return
+    # Small batches are not worth the pool start-up cost.
+    workers = jobs if len(missing) >= 200 else 1
+    for key, card_html in zip(missing, render_in_pool(build_card_html, list(missing.values()), workers)):
+        cache[key] = card_html
+
+
+def flush_card_cache(entries: list[dict]):
+    """Persist cards for the current entries only, so edited/deleted cards do not accumulate."""
+    if not PERSIST_CARD_CACHE or _card_cache is None:
+        return
+    keep = {entry_card_fingerprint(e) for e in entries}
+    cards = {key: html for key, html in _card_cache.items() if key in keep}
+    tmp_path = f"{CARD_CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(marshal.dumps({"code": _card_cache_code_hash(), "site": SITE_DOMAIN, "cards": cards}))
+        os.replace(tmp_path, CARD_CACHE_FILE)
+    except (OSError, ValueError) as e:
+        print("Could not write card cache:", e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 def page_url(page_num: int) -> str:
@@ -576,26 +1810,26 @@ def build_archive_schema(base_url: str, tributes: list[dict]) -> str:
     return json.dumps(schema, ensure_ascii=False, indent=2)
 
 
-def build_archive_full_html(cards_html: str, current_page: int, total_pages: int, tribute_entries: list[dict]) -> str:
-
-    title = "Pet Memorial Tributes" if current_page == 1 else f"Pet Memorial Tributes — Page {current_page}"
-    canonical = SITE_DOMAIN + page_url(current_page)
-    og_title = title
+def render_archive_document(
+    title: str,
+    canonical: str,
+    cards_html: str,
+    pagination_html: str,
+    tribute_count: int,
+    recently_remembered_html: str,
+    schema_entries: list[dict],
+    published_time: str = "",
+) -> str:
     og_description = "Browse pet memorial tributes honoring beloved companions."
     og_image = f"{SITE_DOMAIN}/pet-tributes/assets/blank_memorial_loving_memory.png"
-    og_url = canonical
 
-    # Load base + archive template
-    base = load_template("base.html")
-    archive_template = load_template("archive.html")
-
-    # Build head meta
-    archive_schema_json = build_archive_schema(SITE_DOMAIN, tribute_entries)
+    archive_schema_json = build_archive_schema(SITE_DOMAIN, schema_entries)
     archive_schema_block = f"""
   <script type="application/ld+json">
 {archive_schema_json}
   </script>
 """.strip()
+
     head_meta = f"""
   <title>{escape_html(title)}</title>
   <meta name="robots" content="index, follow">
@@ -605,40 +1839,47 @@ def build_archive_full_html(cards_html: str, current_page: int, total_pages: int
   {archive_schema_block}
 """.strip()
 
-    # Inject cards + pagination into archive template
-    pagination_html = build_pagination(current_page, total_pages)
-
-    recently_remembered_html = build_recently_remembered_cards_html(tribute_entries, tribute_entries)
-    content = archive_template.replace("{{CARDS}}", cards_html)
-    content = content.replace("{{PAGINATION}}", pagination_html)
-    content = content.replace("{{TRIBUTE_COUNT}}", str(len(tribute_entries)))
-    content = content.replace("{{RECENTLY_REMEMBERED_CARDS}}", recently_remembered_html)
-
-    # Load header + footer
-    header_template = load_template("header.html")
-    header_html = header_template.replace("{{HEADER_CLASSES}}", "site-header")
+    content = render_template(
+        "archive.html",
+        CARDS=cards_html,
+        PAGINATION=pagination_html,
+        TRIBUTE_COUNT=str(tribute_count),
+        RECENTLY_REMEMBERED_CARDS=recently_remembered_html,
+    )
 
-    footer_html = load_template("footer.html")
+    return render_template(
+        "base.html",
+        HEAD_META=head_meta,
+        HEADER=render_template("header.html", HEADER_CLASSES="site-header"),
+        CONTENT=content,
+        FOOTER=render_template("footer.html"),
+        OG_TITLE=escape_html(title),
+        OG_DESCRIPTION=escape_html(og_description),
+        OG_URL=canonical,
+        CANONICAL_URL=canonical,
+        OG_IMAGE=og_image,
+        PUBLISHED_TIME_META=published_time_meta(published_time),
+        TWITTER_TITLE=escape_html(title),
+        TWITTER_DESCRIPTION=escape_html(og_description),
+        TWITTER_IMAGE=og_image,
+    )
 
-    # Assemble final
-    final_html = base.replace("{{HEAD_META}}", head_meta)
-    final_html = final_html.replace("{{HEADER}}", header_html)
-    final_html = final_html.replace("{{CONTENT}}", content)
-    final_html = final_html.replace("{{FOOTER}}", footer_html)
-    final_html = final_html.replace("{{OG_TITLE}}", escape_html(og_title))
-    final_html = final_html.replace("{{OG_DESCRIPTION}}", escape_html(og_description))
-    final_html = final_html.replace("{{OG_URL}}", og_url)
-    final_html = final_html.replace("{{CANONICAL_URL}}", canonical)
-    final_html = final_html.replace("{{OG_IMAGE}}", og_image)
-    final_html = final_html.replace("{{PUBLISHED_TIME}}", datetime.now().isoformat(timespec="seconds"))
-    final_html = final_html.replace("{{TWITTER_TITLE}}", escape_html(og_title))
-    final_html = final_html.replace("{{TWITTER_DESCRIPTION}}", escape_html(og_description))
-    final_html = final_html.replace("{{TWITTER_IMAGE}}", og_image)
 
-    return final_html
+def build_archive_full_html(cards_html: str, current_page: int, total_pages: int, tribute_entries: list[dict]) -> str:
+    title = "Pet Memorial Tributes" if current_page == 1 else f"Pet Memorial Tributes — Page {current_page}"
+    return render_archive_document(
+        title=title,
+        canonical=SITE_DOMAIN + page_url(current_page),
+        cards_html=cards_html,
+        pagination_html=build_pagination(current_page, total_pages),
+        tribute_count=len(tribute_entries),
+        recently_remembered_html=build_recently_remembered_cards_html(tribute_entries, tribute_entries),
+        schema_entries=tribute_entries,
+        published_time=archive_listing_info(tribute_entries)["published_time"],
+    )
 
 
-def write_archive_page(
+def archive_page_job(
     page_entries: list[dict],
     all_entries: list[dict],
     title: str,
@@ -647,85 +1888,112 @@ def write_archive_page(
     current_page: int,
     total_pages: int,
     pagination_prefix: str,
-):
-    cards_html = "".join(build_card_html(e) for e in page_entries)
-    tribute_count = len(all_entries)
-    recently_remembered_html = build_recently_remembered_cards_html(all_entries, page_entries)
-    pagination_html = build_pagination_for_prefix(current_page, total_pages, pagination_prefix)
-    og_title = title
-    og_description = "Browse pet memorial tributes honoring beloved companions."
-    og_image = f"{SITE_DOMAIN}/pet-tributes/assets/blank_memorial_loving_memory.png"
-    og_url = canonical
+    listing: dict | None = None,
+) -> dict:
+    """
+    Everything needed to render one archive page, detached from the full listing
+    so it can be pickled to a worker process. The "recently remembered" sample is
+    drawn here, in the parent, so output does not depend on worker scheduling;
+    cards come from the card cache, so workers only assemble the document.
+    `listing` is archive_listing_info(all_entries), passed in when rendering many pages.
+    """
+    if listing is None:
+        listing = archive_listing_info(all_entries)
+    recent_entries = select_recently_remembered(all_entries, page_entries, listing["recent_seed"])
+    return {
+        "output_path": os.path.join(output_folder, "index.html"),
+        "page_entries": page_entries,
+        "cards_html": "".join(cached_card_html(e) for e in page_entries),
+        "recent_html": "".join(cached_card_html(e) for e in recent_entries),
+        "published_time": listing["published_time"],
+        "tribute_count": len(all_entries),
+        "title": title,
+        "canonical": canonical,
+        "pagination_html": build_pagination_for_prefix(current_page, total_pages, pagination_prefix),
+    }
 
-    archive_schema_json = build_archive_schema(SITE_DOMAIN, page_entries)
-    archive_schema_block = f"""
-  <script type="application/ld+json">
-{archive_schema_json}
-  </script>
-""".strip()
 
-    head_meta = f"""
-  <title>{escape_html(title)}</title>
-  <meta name="robots" content="index, follow">
-  <link rel="canonical" href="{canonical}">
-  <link rel="icon" type="image/x-icon" href="/pet-tributes/assets/favicon.ico">
-  <link rel="shortcut icon" href="/pet-tributes/assets/favicon.ico">
-  {archive_schema_block}
-""".strip()
+def render_archive_page_job(job: dict) -> tuple[str, str]:
+    final_html = render_archive_document(
+        title=job["title"],
+        canonical=job["canonical"],
+        cards_html=job["cards_html"],
+        pagination_html=job["pagination_html"],
+        tribute_count=job["tribute_count"],
+        recently_remembered_html=job["recent_html"],
+        schema_entries=job["page_entries"],
+        published_time=job["published_time"],
+    )
+    return job["output_path"], final_html
 
-    base = load_template("base.html")
-    archive_template = load_template("archive.html")
 
-    content = archive_template.replace("{{CARDS}}", cards_html)
-    content = content.replace("{{PAGINATION}}", pagination_html)
-    content = content.replace("{{TRIBUTE_COUNT}}", str(tribute_count))
-    content = content.replace("{{RECENTLY_REMEMBERED_CARDS}}", recently_remembered_html)
+def render_in_pool(render_fn, jobs: list, workers: int = 1):
+    """
+    Yield render_fn(job) for each job, in input order. With workers > 1 the
+    rendering runs in a process pool; results are still consumed (and written)
+    by the caller in order, so output is identical to a serial run.
+    """
+    if workers <= 1 or len(jobs) < 2:
+        for job in jobs:
+            yield render_fn(job)
+        return
+    workers = min(workers, len(jobs))
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(render_fn, jobs, chunksize=chunksize)
 
-    header_template = load_template("header.html")
-    header_html = header_template.replace("{{HEADER_CLASSES}}", "site-header")
-    footer_html = load_template("footer.html")
 
-    final_html = base.replace("{{HEAD_META}}", head_meta)
-    final_html = final_html.replace("{{HEADER}}", header_html)
-    final_html = final_html.replace("{{CONTENT}}", content)
-    final_html = final_html.replace("{{FOOTER}}", footer_html)
-    final_html = final_html.replace("{{OG_TITLE}}", escape_html(og_title))
-    final_html = final_html.replace("{{OG_DESCRIPTION}}", escape_html(og_description))
-    final_html = final_html.replace("{{OG_URL}}", og_url)
-    final_html = final_html.replace("{{CANONICAL_URL}}", canonical)
-    final_html = final_html.replace("{{OG_IMAGE}}", og_image)
-    final_html = final_html.replace("{{PUBLISHED_TIME}}", datetime.now().isoformat(timespec="seconds"))
-    final_html = final_html.replace("{{TWITTER_TITLE}}", escape_html(og_title))
-    final_html = final_html.replace("{{TWITTER_DESCRIPTION}}", escape_html(og_description))
-    final_html = final_html.replace("{{TWITTER_IMAGE}}", og_image)
+def write_rendered_pages(render_fn, jobs: list, workers: int = 1):
+    """
+    Write each rendered page, recording one span per page named after
+    `render_fn`. With a pool the span is the parent's wait for that page plus
+    its write, since worker-side time is not collected.
+    """
+    started = time.perf_counter()
+    for result in render_in_pool(render_fn, jobs, workers):
+        if result:
+            write_output_file(*result)
+        finished = time.perf_counter()
+        record_span(render_fn.__name__, finished - started)
+        started = finished
 
-    os.makedirs(output_folder, exist_ok=True)
-    with open(os.path.join(output_folder, "index.html"), "w", encoding="utf-8") as f:
-        f.write(final_html)
 
+def paginate_entries(entries: list[dict]) -> list[list[dict]]:
+    """Split a sorted listing into CARDS_PER_PAGE chunks (always at least one page)."""
+    pages = [entries[i:i + CARDS_PER_PAGE] for i in range(0, len(entries), CARDS_PER_PAGE)]
+    return pages or [[]]
 
-def rebuild_archive_pages(entries):
-    from math import ceil
 
-    # Featured tributes are pinned first; remaining tributes are newest-first.
-    entries = sort_entries_newest_first(entries)
+def remove_stale_page_folders(listing_folder: str, total_pages: int):
+    """Remove page-N folders beyond the current page count (e.g. 31 -> 30 entries drops /page-3/)."""
+    if not os.path.isdir(listing_folder):
+        return
+    for name in os.listdir(listing_folder):
+        m = re.fullmatch(r"page-(\d+)", name)
+        folder = os.path.join(listing_folder, name)
+        if m and int(m.group(1)) > total_pages and os.path.isdir(folder):
+            remove_output_folder(folder)
 
-    total_pages = ceil(len(entries) / CARDS_PER_PAGE)
 
-    if total_pages == 0:
-        total_pages = 1
+@timed
+def rebuild_archive_pages(entries, pages: set[int] | None = None, jobs: int = 1):
+    """
+    Rebuild the main archive. When `pages` is given only those page numbers are
+    written; otherwise every page is regenerated. `jobs` > 1 renders in a process pool.
+    """
+    # Featured tributes are pinned first; remaining tributes are newest-first.
+    entries = sort_entries_newest_first(entries)
+    if pages is None:
+        prime_card_cache(entries, jobs)
 
-    # Remove stale pagination folders so page count shrinks correctly after deletions
-    # (e.g. 31 -> 30 entries should remove /page-3/)
-    for name in os.listdir(TRIBUTES_DIR):
-        folder = os.path.join(TRIBUTES_DIR, name)
-        if os.path.isdir(folder) and re.fullmatch(r"page-\d+", name):
-            shutil.rmtree(folder, ignore_errors=True)
+    listing_pages = paginate_entries(entries)
+    total_pages = len(listing_pages)
+    listing = archive_listing_info(entries)
 
-    for page_num in range(1, total_pages + 1):
-        start = (page_num - 1) * CARDS_PER_PAGE
-        end = start + CARDS_PER_PAGE
-        page_entries = entries[start:end]
+    page_jobs = []
+    for page_num, page_entries in enumerate(listing_pages, start=1):
+        if pages is not None and page_num not in pages:
+            continue
 
         title = "Pet Memorial Tributes" if page_num == 1 else f"Pet Memorial Tributes — Page {page_num}"
         canonical = SITE_DOMAIN + page_url_for_prefix(page_num, "/pet-tributes/")
@@ -736,7 +2004,7 @@ def rebuild_archive_pages(entries):
         else:
             output_folder = os.path.join(TRIBUTES_DIR, f"page-{page_num}")
 
-        write_archive_page(
+        page_jobs.append(archive_page_job(
             page_entries=page_entries,
             all_entries=entries,
             title=title,
@@ -745,135 +2013,550 @@ def rebuild_archive_pages(entries):
             current_page=page_num,
             total_pages=total_pages,
             pagination_prefix=pagination_prefix,
-        )
+            listing=listing,
+        ))
 
+    write_rendered_pages(render_archive_page_job, page_jobs, jobs)
+    # Pages are replaced in place first; only folders past the new page count go
+    # (e.g. 31 -> 30 entries removes /page-3/), so no page is ever missing mid-rebuild.
+    remove_stale_page_folders(TRIBUTES_DIR, total_pages)
 
-def rebuild_pet_type_archives(entries):
-    from math import ceil
 
-    # Normalize and group by pet_type slug
-    grouped = {}
+# ----------------------------
+# Faceted archives
+# ----------------------------
 
-    for entry in entries:
-        pet_type = (entry.get("pet_type") or "").strip()
-        if not pet_type:
-            continue
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
 
-        pet_type_slug = slugify(pet_type)
-        if not pet_type_slug:
-            continue
+# Top-level pet-tributes/ folders that are not pet-type archives.
+RESERVED_ARCHIVE_FOLDERS = {"memorials", "assets", "images", "search", "submit-a-tribute", FACET_ROOT}
 
-        grouped.setdefault(pet_type_slug, []).append(entry)
 
-    # Build each pet type archive
-    for pet_type_slug, type_entries in grouped.items():
-        type_entries = sort_entries_newest_first(type_entries)
+def pet_type_listing_key(type_slug: str) -> str:
+    """Pet-type archives sit at /pet-tributes/<type>/; a type named like a reserved folder gets "-pets"."""
+    if type_slug in RESERVED_ARCHIVE_FOLDERS or re.fullmatch(r"page-\d+", type_slug):
+        return f"{type_slug}-pets"
+    return type_slug
 
-        total_pages = ceil(len(type_entries) / CARDS_PER_PAGE)
-        if total_pages == 0:
-            total_pages = 1
 
-        for page_num in range(1, total_pages + 1):
-            start = (page_num - 1) * CARDS_PER_PAGE
-            end = start + CARDS_PER_PAGE
-            page_entries = type_entries[start:end]
+def _entry_facet_value(entry: dict, facet: str) -> str:
+    if facet == "year":
+        # Year of passing: the last year in the dates text.
+        years = YEAR_RE.findall(entry.get("years_pretty") or "")
+        return years[-1] if years else ""
+    if facet == "type":
+        return (entry.get("pet_type") or "").strip()
+    return (entry.get(facet) or "").strip()
 
-            title = f"{pet_type_slug.capitalize()} Memorial Tributes"
-            if page_num > 1:
-                title = f"{title} — Page {page_num}"
-            pagination_prefix = f"/pet-tributes/{pet_type_slug}/"
+
+def facet_listings(sorted_entries: list[dict]) -> dict[str, dict]:
+    """
+    Partition an already sorted listing into every facet listing in one pass.
+    Returns {listing key: {"facet", "label", "entries"}}, where the key is the
+    folder under TRIBUTES_DIR: "<pet type>" or "browse/<facet>/<value>". Entries keep
+    the input order, so no listing needs its own sort.
+    """
+    listings = {}
+    for entry in sorted_entries:
+        for facet in ("type",) + ARCHIVE_FACETS:
+            label = _entry_facet_value(entry, facet)
+            value_slug = slugify(label)
+            if not value_slug:
+                continue
+            key = pet_type_listing_key(value_slug) if facet == "type" else f"{FACET_ROOT}/{facet}/{value_slug}"
+            listing = listings.get(key)
+            if listing is None:
+                listing = listings[key] = {"facet": facet, "label": label, "entries": []}
+            listing["entries"].append(entry)
+    return listings
+
+
+def facet_listing_title(listing: dict, key: str) -> str:
+    facet, label = listing["facet"], listing["label"]
+    if facet == "type":
+        return f"{slugify(label).capitalize()} Memorial Tributes"
+    if facet == "state":
+        return f"Pet Memorial Tributes from {label}"
+    if facet == "year":
+        return f"Pets Remembered in {label}"
+    return f"{label} Memorial Tributes"
+
+
+FACET_HUB_TEXT = {
+    "breed": ("Pet Memorial Tributes by Breed", "Browse tributes to beloved companions by breed."),
+    "state": ("Pet Memorial Tributes by State", "Browse tributes to beloved companions by home state."),
+    "year": ("Pet Memorial Tributes by Year", "Browse tributes by the year a beloved companion passed."),
+}
+
+
+def facet_counts(listings: dict[str, dict]) -> dict[str, dict]:
+    """{facet: {listing key: {"label", "count"}}} in label order."""
+    counts = {facet: {} for facet in ("type",) + ARCHIVE_FACETS}
+    for key, listing in sorted(listings.items(), key=lambda item: item[1]["label"].lower()):
+        counts[listing["facet"]][key] = {"label": listing["label"], "count": len(listing["entries"])}
+    return counts
+
+
+def render_facet_hub_document(facet: str, facet_count: dict, tribute_count: int, published_time: str) -> str:
+    title, intro = FACET_HUB_TEXT[facet]
+    canonical = f"{SITE_DOMAIN}/pet-tributes/{FACET_ROOT}/{facet}/"
+    links_html = "\n          ".join(
+        f'<a href="/pet-tributes/{key}/">{escape_html(info["label"])} ({info["count"]})</a>'
+        for key, info in facet_count.items()
+    )
+    head_meta = f"""
+  <title>{escape_html(title)}</title>
+  <meta name="robots" content="index, follow">
+  <link rel="canonical" href="{canonical}">
+  <link rel="icon" type="image/x-icon" href="/pet-tributes/assets/favicon.ico">
+  <link rel="shortcut icon" href="/pet-tributes/assets/favicon.ico">
+""".strip()
+    og_image = f"{SITE_DOMAIN}/pet-tributes/assets/blank_memorial_loving_memory.png"
+    return render_template(
+        "base.html",
+        HEAD_META=head_meta,
+        HEADER=render_template("header.html", HEADER_CLASSES="site-header"),
+        CONTENT=render_template(
+            "facet_index.html",
+            HEADING=escape_html(title),
+            INTRO=escape_html(intro),
+            TRIBUTE_COUNT=str(tribute_count),
+            FACET_LINKS=links_html,
+        ),
+        FOOTER=render_template("footer.html"),
+        OG_TITLE=escape_html(title),
+        OG_DESCRIPTION=escape_html(intro),
+        OG_URL=canonical,
+        CANONICAL_URL=canonical,
+        OG_IMAGE=og_image,
+        PUBLISHED_TIME_META=published_time_meta(published_time),
+        TWITTER_TITLE=escape_html(title),
+        TWITTER_DESCRIPTION=escape_html(intro),
+        TWITTER_IMAGE=og_image,
+    )
+
+
+def write_facet_hubs(sorted_entries: list[dict], listings: dict[str, dict]):
+    """Facet index pages (/pet-tributes/browse/<facet>/) and facets.json with every listing's count."""
+    counts = facet_counts(listings)
+    published_time = archive_listing_info(sorted_entries)["published_time"]
+    for facet in ARCHIVE_FACETS:
+        write_output_file(
+            os.path.join(TRIBUTES_DIR, FACET_ROOT, facet, "index.html"),
+            render_facet_hub_document(facet, counts[facet], len(sorted_entries), published_time),
+        )
+    write_output_file(
+        os.path.join(TRIBUTES_DIR, "facets.json"),
+        json.dumps(counts, ensure_ascii=False, indent=2),
+    )
+
+
+def is_stale_type_folder(name: str, listings: dict[str, dict], tribute_slugs: set[str]) -> bool:
+    """
+    True for a top-level folder this generator wrote as a listing that no longer
+    has tributes (a removed pet type, or a facet from the old top-level layout).
+    Folders the manifest never recorded and tribute folders are left alone.
+    """
+    if name in listings or name in tribute_slugs or name in RESERVED_ARCHIVE_FOLDERS:
+        return False
+    if re.fullmatch(r"page-\d+", name):
+        return False
+    return f"{name}/index.html" in get_build_manifest().files
+
+
+def remove_stale_facet_folders(listings: dict[str, dict], entries: list[dict]):
+    """Drop listing folders whose pet type or facet value no longer has any tribute."""
+    for facet in ARCHIVE_FACETS:
+        facet_folder = os.path.join(TRIBUTES_DIR, FACET_ROOT, facet)
+        if not os.path.isdir(facet_folder):
+            continue
+        for name in os.listdir(facet_folder):
+            folder = os.path.join(facet_folder, name)
+            if os.path.isdir(folder) and f"{FACET_ROOT}/{facet}/{name}" not in listings:
+                remove_output_folder(folder)
+    tribute_slugs = {(e.get("slug") or "").strip() for e in entries}
+    with os.scandir(TRIBUTES_DIR) as it:
+        stale = [e.name for e in it if e.is_dir() and is_stale_type_folder(e.name, listings, tribute_slugs)]
+    for name in stale:
+        remove_output_folder(os.path.join(TRIBUTES_DIR, name))
+
+
+@timed
+def rebuild_facet_archives(entries, pages_by_listing: dict[str, set[int]] | None = None, jobs: int = 1):
+    """
+    Rebuild the pet-type, breed, state and year archives plus the facet hubs.
+    When `pages_by_listing` is given only those listing keys/page numbers are written.
+    """
+    # One sort for the whole site; every facet listing is a slice of it.
+    sorted_entries = sort_entries_newest_first(entries)
+    listings = facet_listings(sorted_entries)
+    if pages_by_listing is None:
+        prime_card_cache(sorted_entries, jobs)
+
+    page_jobs = []
+    page_counts = {}
+    for key, listing in listings.items():
+        if pages_by_listing is not None and key not in pages_by_listing:
+            continue
+        wanted_pages = pages_by_listing.get(key) if pages_by_listing is not None else None
+
+        listing_entries = listing["entries"]
+        listing_pages = paginate_entries(listing_entries)
+        total_pages = len(listing_pages)
+        page_counts[key] = total_pages
+        listing_info = archive_listing_info(listing_entries)
+        base_title = facet_listing_title(listing, key)
+        pagination_prefix = f"/pet-tributes/{key}/"
+
+        for page_num, page_entries in enumerate(listing_pages, start=1):
+            if wanted_pages is not None and page_num not in wanted_pages:
+                continue
+
+            title = base_title if page_num == 1 else f"{base_title} — Page {page_num}"
             canonical = SITE_DOMAIN + page_url_for_prefix(page_num, pagination_prefix)
 
             if page_num == 1:
-                output_folder = os.path.join(TRIBUTES_DIR, pet_type_slug)
+                output_folder = os.path.join(TRIBUTES_DIR, key)
             else:
-                output_folder = os.path.join(TRIBUTES_DIR, pet_type_slug, f"page-{page_num}")
+                output_folder = os.path.join(TRIBUTES_DIR, key, f"page-{page_num}")
 
-            write_archive_page(
+            page_jobs.append(archive_page_job(
                 page_entries=page_entries,
-                all_entries=type_entries,
+                all_entries=listing_entries,
                 title=title,
                 canonical=canonical,
                 output_folder=output_folder,
                 current_page=page_num,
                 total_pages=total_pages,
                 pagination_prefix=pagination_prefix,
-            )
+                listing=listing_info,
+            ))
+
+    write_rendered_pages(render_archive_page_job, page_jobs, jobs)
+    for key, total_pages in page_counts.items():
+        remove_stale_page_folders(os.path.join(TRIBUTES_DIR, key), total_pages)
+    # Hubs are a handful of small pages; unchanged ones are skipped by the manifest.
+    write_facet_hubs(sorted_entries, listings)
+    if pages_by_listing is None:
+        remove_stale_facet_folders(listings, entries)
 
 
-def generate_sitemap(data: list[dict]):
-    from math import ceil
+def sitemap_lastmod(entry: dict) -> str:
+    """W3C date of the last edit, falling back to the publish date."""
+    return (entry.get("updated_iso") or entry.get("published_iso") or "")[:10]
 
-    sitemap_path = os.path.join(TRIBUTES_DIR, "sitemap.xml")
 
-    urls = []
+def _sitemap_listing_urls(prefix: str, entries: list[dict]) -> list[tuple[str, str]]:
+    # Any addition or edit can reshuffle a listing, so every page shares the newest lastmod.
+    lastmod = max((sitemap_lastmod(e) for e in entries), default="")
+    total_pages = max(1, math.ceil(len(entries) / CARDS_PER_PAGE))
+    return [(SITE_DOMAIN + page_url_for_prefix(page_num, prefix), lastmod) for page_num in range(1, total_pages + 1)]
+
+
+def sitemap_shards(data: list[dict]) -> dict[str, list[tuple[str, str]]]:
+    """
+    {shard filename: [(loc, lastmod), ...]}: archive, facet hub and facet listings first,
+    then tribute pages in data order, so a new tribute only touches the last shard.
+    """
     seen_locs = set()
 
-    def add_url(loc: str):
-        if not loc or loc in seen_locs:
-            return
-        seen_locs.add(loc)
-        urls.append(
-            f"""
-  <url>
-    <loc>{escape_html(loc)}</loc>
-    <changefreq>monthly</changefreq>
-    <priority>0.7</priority>
-  </url>"""
-        )
+    def unique(urls):
+        kept = []
+        for loc, lastmod in urls:
+            if loc and loc not in seen_locs:
+                seen_locs.add(loc)
+                kept.append((loc, lastmod))
+        return kept
+
+    listing_urls = _sitemap_listing_urls("/pet-tributes/", data)
+    listings = facet_listings(data)
+    for facet in ARCHIVE_FACETS:
+        if any(listing["facet"] == facet for listing in listings.values()):
+            listing_urls.append((f"{SITE_DOMAIN}/pet-tributes/{FACET_ROOT}/{facet}/", listing_urls[0][1]))
+    for key, listing in listings.items():
+        listing_urls += _sitemap_listing_urls(f"/pet-tributes/{key}/", listing["entries"])
+    tribute_urls = [
+        (f"{SITE_DOMAIN}{get_entry_web_base(item)}", sitemap_lastmod(item))
+        for item in data
+        if (item.get("slug") or "").strip()
+    ]
+
+    ext = ".xml.gz" if SITEMAP_GZIP else ".xml"
+    shards = {}
+    for name, urls in (("archives", unique(listing_urls)), ("tributes", unique(tribute_urls))):
+        chunks = [urls[i:i + SITEMAP_MAX_URLS] for i in range(0, len(urls), SITEMAP_MAX_URLS)]
+        for num, chunk in enumerate(chunks, start=1):
+            shards[f"sitemap-{name}-{num}{ext}"] = chunk
+    return shards
+
+
+def _sitemap_shard_xml(urls: list[tuple[str, str]]):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for loc, lastmod in urls:
+        lastmod_xml = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+        yield f"  <url><loc>{escape_html(loc)}</loc>{lastmod_xml}</url>\n"
+    yield "</urlset>\n"
+
+
+def _sitemap_index_xml(shards: dict[str, list[tuple[str, str]]]):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for filename, urls in shards.items():
+        lastmod = max((m for _, m in urls), default="")
+        lastmod_xml = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+        yield f"  <sitemap><loc>{SITE_DOMAIN}/pet-tributes/{filename}</loc>{lastmod_xml}</sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+@timed
+def generate_sitemap(data: list[dict], shards: set[str] | None = None):
+    """
+    Write sitemap.xml (the index) and its shard files. When `shards` is given
+    only those shard filenames are rewritten; shards that no longer exist are removed.
+    """
+    all_shards = sitemap_shards(data)
+    for filename, urls in all_shards.items():
+        if shards is None or filename in shards:
+            write_output_stream(os.path.join(TRIBUTES_DIR, filename), _sitemap_shard_xml(urls), compress=filename.endswith(".gz"))
+    write_output_stream(os.path.join(TRIBUTES_DIR, "sitemap.xml"), _sitemap_index_xml(all_shards))
 
-    entries_sorted = sort_entries_newest_first(data)
-    main_total_pages = ceil(len(entries_sorted) / CARDS_PER_PAGE)
-    if main_total_pages == 0:
-        main_total_pages = 1
-    for page_num in range(1, main_total_pages + 1):
-        add_url(SITE_DOMAIN + page_url_for_prefix(page_num, "/pet-tributes/"))
-
-    grouped = {}
-    for entry in entries_sorted:
-        pet_type = (entry.get("pet_type") or "").strip()
-        if not pet_type:
-            continue
-        pet_type_slug = slugify(pet_type)
-        if not pet_type_slug:
-            continue
-        grouped.setdefault(pet_type_slug, []).append(entry)
+    for name in os.listdir(TRIBUTES_DIR):
+        if re.fullmatch(r"sitemap-[a-z]+-\d+\.xml(\.gz)?", name) and name not in all_shards:
+            os.remove(os.path.join(TRIBUTES_DIR, name))
+            get_build_manifest().forget(os.path.join(TRIBUTES_DIR, name))
 
-    for pet_type_slug, type_entries in grouped.items():
-        type_total_pages = ceil(len(type_entries) / CARDS_PER_PAGE)
-        if type_total_pages == 0:
-            type_total_pages = 1
-        prefix = f"/pet-tributes/{pet_type_slug}/"
-        for page_num in range(1, type_total_pages + 1):
-            add_url(SITE_DOMAIN + page_url_for_prefix(page_num, prefix))
 
-    for item in data:
-        slug = (item.get("slug") or "").strip()
-        if not slug:
+def changed_sitemap_shards(old_entries: list[dict], new_entries: list[dict]) -> set[str]:
+    old_shards = sitemap_shards(old_entries)
+    return {name for name, urls in sitemap_shards(new_entries).items() if old_shards.get(name) != urls}
+
+
+# ----------------------------
+# Search index
+# ----------------------------
+#
+# search/meta.json       {"doc_count", "docs_per_shard", "terms": {prefix: version}, "docs": [version, ...]}
+# search/terms-<ab>.json {token: delta-encoded doc ids} for every token starting with <ab>
+# search/docs-<n>.json   [[url, title, years, thumbnail, attribution], ...] for doc ids n*SEARCH_DOCS_PER_SHARD...
+#
+# Doc ids follow data order, so a new tribute only touches the last docs shard
+# and the term shards of its own words.
+
+SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def search_tokens(text: str) -> set[str]:
+    """Accent-folded, lowercased words of 2+ characters (mm-tribute.js folds queries the same way)."""
+    folded = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii").lower()
+    return {token for token in SEARCH_TOKEN_RE.findall(folded) if len(token) >= 2}
+
+
+def search_document(entry: dict) -> list[str]:
+    pet_name = entry.get("pet_name", "")
+    subtitle = " - ".join(p for p in ((entry.get("breed") or "").strip(), (entry.get("pet_type") or "").strip()) if p)
+    web_base = get_entry_web_base(entry)
+    image_filename = (entry.get("image_filename") or "").strip()
+    if not image_filename or image_filename == "blank_memorial_loving_memory.png":
+        thumbnail = "/pet-tributes/assets/blank_memorial_loving_memory.png"
+    else:
+        thumbnail = web_base + (entry.get("image_variants") or {}).get(str(IMAGE_VARIANT_WIDTHS[0]), image_filename)
+    attribution = ", ".join(p for p in ((entry.get("first_name") or "").strip(), (entry.get("state") or "").strip()) if p)
+    return [
+        web_base,
+        pet_name + (f" – {subtitle}" if subtitle else ""),
+        normalize_dates_text(entry.get("years_pretty", "")),
+        thumbnail,
+        attribution,
+    ]
+
+
+def _search_json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _search_version(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:10]
+
+
+@timed
+def build_search_index(entries: list[dict]):
+    """Write the sharded search index; unchanged shards are skipped by write_output_file."""
+    docs = []
+    postings = {}
+    for entry in entries:
+        if not (entry.get("slug") or "").strip():
             continue
-        loc = f"{SITE_DOMAIN}{get_entry_web_base(item)}"
-        add_url(loc)
+        doc_id = len(docs)
+        docs.append(search_document(entry))
+        words = set()
+        for field in SEARCH_FIELDS:
+            value = entry.get(field) or ""
+            words |= search_tokens(strip_markdown_for_excerpt(value) if field == "excerpt" else value)
+        for word in words:
+            postings.setdefault(word, []).append(doc_id)
+
+    term_shards = {}
+    for word in sorted(postings):
+        ids = postings[word]
+        # Ascending ids stored as gaps keep the shards small.
+        term_shards.setdefault(word[:2], {})[word] = [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+
+    files = {}
+    meta = {"doc_count": len(docs), "docs_per_shard": SEARCH_DOCS_PER_SHARD, "terms": {}, "docs": []}
+    for prefix, shard in term_shards.items():
+        content = _search_json(shard)
+        files[f"terms-{prefix}.json"] = content
+        meta["terms"][prefix] = _search_version(content)
+    for num, start in enumerate(range(0, len(docs), SEARCH_DOCS_PER_SHARD)):
+        content = _search_json(docs[start:start + SEARCH_DOCS_PER_SHARD])
+        files[f"docs-{num}.json"] = content
+        meta["docs"].append(_search_version(content))
+    files["meta.json"] = _search_json(meta)
+
+    for filename, content in files.items():
+        write_output_file(os.path.join(SEARCH_INDEX_DIR, filename), content)
+    for name in os.listdir(SEARCH_INDEX_DIR):
+        if name.endswith(".json") and name not in files:
+            os.remove(os.path.join(SEARCH_INDEX_DIR, name))
+            get_build_manifest().forget(os.path.join(SEARCH_INDEX_DIR, name))
 
-    sitemap_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{''.join(urls)}
-</urlset>
-"""
 
-    with open(sitemap_path, "w", encoding="utf-8") as f:
-        f.write(sitemap_content)
+# ----------------------------
+# Incremental rebuild
+# ----------------------------
 
+# Entry fields that show up on archive cards / archive schema. A change to any of
+# these (or to listing order) makes the page holding the entry dirty.
+ARCHIVE_CARD_FIELDS = (
+    "slug", "folder", "pet_name", "name", "breed", "pet_type", "years_pretty",
+    "excerpt", "first_name", "state", "email", "published_iso", "image_filename",
+    "image_width", "image_height", "image_variants", "image_avif", "featured",
+)
+
+
+def entry_card_fingerprint(entry: dict) -> str:
+    payload = {key: entry.get(key) for key in ARCHIVE_CARD_FIELDS}
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _listing_page_slugs(sorted_entries: list[dict]) -> list[tuple[str, ...]]:
+    return [tuple((e.get("slug") or "").strip() for e in page) for page in paginate_entries(sorted_entries)]
+
+
+def _dirty_listing_pages(old_sorted: list[dict], new_sorted: list[dict], changed_slugs: set[str]) -> set[int]:
+    old_pages = _listing_page_slugs(old_sorted)
+    new_pages = _listing_page_slugs(new_sorted)
+    old_info = archive_listing_info(old_sorted)
+    new_info = archive_listing_info(new_sorted)
+    # Tribute count, pagination links, published time and the "recently
+    # remembered" seed are shared by every page of a listing.
+    if len(old_sorted) != len(new_sorted) or len(old_pages) != len(new_pages) or old_info != new_info:
+        return set(range(1, len(new_pages) + 1))
+    dirty = set()
+    new_listing_pages = paginate_entries(new_sorted)
+    for page_num, (old_slugs, new_slugs) in enumerate(zip(old_pages, new_pages), start=1):
+        if old_slugs != new_slugs or changed_slugs.intersection(new_slugs):
+            dirty.add(page_num)
+        elif new_info["recent_seed"] is not None:
+            # Seeded picks are reproducible, so pages showing an edited card can be found.
+            picks = select_recently_remembered(new_sorted, new_listing_pages[page_num - 1], new_info["recent_seed"])
+            if changed_slugs.intersection((e.get("slug") or "").strip() for e in picks):
+                dirty.add(page_num)
+    return dirty
+
+
+def plan_archive_rebuild(old_entries: list[dict], new_entries: list[dict]) -> dict:
+    """
+    Work out which archive pages, facet pages and sitemap shards need rewriting
+    after an add, edit, delete or feature toggle.
+
+    Returns {"archive": set[int], "facets": {listing key: set[int]},
+    "facets_removed": set[listing key], "sitemap": set[shard filename], "search": bool}.
+    With seeded "recently remembered" picks, pages whose strip shows a changed
+    tribute are included; in "random" mode those strips refresh on the next full rebuild.
+    """
+    old_sorted = sort_entries_newest_first(old_entries)
+    new_sorted = sort_entries_newest_first(new_entries)
+    # Fingerprint the sorted copies: their `featured` is the effective one (only
+    # the newest featured tribute keeps its badge), which is what cards render.
+    old_prints = {(e.get("slug") or "").strip(): entry_card_fingerprint(e) for e in old_sorted}
+    new_prints = {(e.get("slug") or "").strip(): entry_card_fingerprint(e) for e in new_sorted}
+    changed_slugs = {
+        slug for slug in set(old_prints) | set(new_prints)
+        if old_prints.get(slug) != new_prints.get(slug)
+    }
+
+    archive_pages = _dirty_listing_pages(old_sorted, new_sorted, changed_slugs)
+
+    old_listings = facet_listings(old_sorted)
+    new_listings = facet_listings(new_sorted)
+    facet_pages = {}
+    for key, listing in new_listings.items():
+        old_listing = old_listings.get(key)
+        dirty = _dirty_listing_pages(old_listing["entries"] if old_listing else [], listing["entries"], changed_slugs)
+        if dirty:
+            facet_pages[key] = dirty
+
+    return {
+        "archive": archive_pages,
+        "facets": facet_pages,
+        "facets_removed": set(old_listings) - set(new_listings),
+        "sitemap": changed_sitemap_shards(old_entries, new_entries),
+        # Search documents and postings come from card fields.
+        "search": bool(changed_slugs),
+    }
+
+
+def rebuild_all_archives(entries: list[dict], jobs: int = 1):
+    """Full rebuild fallback: every archive and facet page, the sitemap and the search index."""
+    rebuild_archive_pages(entries, jobs=jobs)
+    rebuild_facet_archives(entries, jobs=jobs)
+    generate_sitemap(entries)
+    build_search_index(entries)
+    flush_build_manifest()
+    flush_card_cache(entries)
+
+
+def rebuild_full_site(entries: list[dict], jobs: int = 1):
+    """Regenerate every tribute page plus all archives and the sitemap."""
+    rebuild_tribute_pages(entries, jobs=jobs)
+    rebuild_all_archives(entries, jobs=jobs)
+
+
+def rebuild_changed_archives(old_entries: list[dict], new_entries: list[dict]) -> dict | None:
+    """
+    Regenerate only the archive/facet pages and sitemap affected by the change
+    from `old_entries` to `new_entries`. Falls back to a full rebuild when the
+    archive has never been generated. Returns the plan used (None for full).
+    """
+    if not os.path.exists(ARCHIVE_INDEX):
+        rebuild_all_archives(new_entries)
+        return None
+
+    plan = plan_archive_rebuild(old_entries, new_entries)
+    if plan["archive"]:
+        rebuild_archive_pages(new_entries, pages=plan["archive"])
+    if plan["facets"] or plan["facets_removed"]:
+        rebuild_facet_archives(new_entries, pages_by_listing=plan["facets"])
+    for key in plan["facets_removed"]:
+        # Pet-type keys never name a reserved folder, but a legacy top-level tribute could share one.
+        if "/" in key or is_stale_type_folder(key, {}, {(e.get("slug") or "").strip() for e in new_entries}):
+            remove_output_folder(os.path.join(TRIBUTES_DIR, key))
+    if plan["sitemap"] or len(sitemap_shards(old_entries)) != len(sitemap_shards(new_entries)):
+        generate_sitemap(new_entries, shards=plan["sitemap"])
+    if plan["search"] or not os.path.exists(os.path.join(SEARCH_INDEX_DIR, "meta.json")):
+        build_search_index(new_entries)
+    flush_build_manifest()
+    flush_card_cache(new_entries)
+    return plan
 
 
 def migrate_existing_folders_to_json():
     entries = []
 
-    for name in os.listdir(TRIBUTES_DIR):
+    for name in sorted(tribute_folder_index(refresh=True).names()):
         folder_path = os.path.join(TRIBUTES_DIR, name)
 
-        if not os.path.isdir(folder_path):
-            continue
-
         if name.startswith("assets") or name.startswith("page-"):
             continue
 
@@ -927,11 +2610,10 @@ def migrate_existing_folders_to_json():
         })
 
     save_data(entries)
-    rebuild_archive_pages(entries)
-    rebuild_pet_type_archives(entries)
-    generate_sitemap(entries)
+    rebuild_all_archives(entries)
 
 
+@timed
 def build_tribute_html(
     pet_name: str,
     first_name: str,
@@ -947,6 +2629,9 @@ def build_tribute_html(
     second_image_filename: str,
     publish_date_iso: str,
     tribute_message_html: str,
+    image_meta: dict | None = None,
+    image2_meta: dict | None = None,
+    message_preview: str | None = None,
 ) -> str:
 
     # ----- Title / subtitle logic -----
@@ -984,11 +2669,9 @@ def build_tribute_html(
     og_title = tribute_h1
 
     years_pretty = normalize_dates_text(years_pretty)
-    plain_message = re.sub(r"<[^>]+>", " ", tribute_message_html or "")
-    plain_message = re.sub(r"\s+", " ", plain_message).strip()
-    clean_message = re.sub(r"[^\x00-\x7F]+", "", plain_message)
-    clean_message = re.sub(r"\s+\.", ".", clean_message)
-    clean_message = re.sub(r"\s{2,}", " ", clean_message).strip()
+    if message_preview is None:
+        message_preview = meta_preview_text(message_html_to_plain(tribute_message_html))
+    clean_message = message_preview
     og_description = excerpt or f"Read the memorial tribute for {pet_name}, a beloved {pet_type_lower}, honored with a handcrafted memorial stone."
     og_description = re.sub(r"\s+", " ", og_description.replace("\n", " ")).strip()[:160]
     descriptor = f"{breed_clean + ' ' if breed_clean else ''}{pet_type_lower}".strip()
@@ -1024,12 +2707,20 @@ def build_tribute_html(
         image_alt = f"Memorial stone for {pet_name}, beloved {breed_clean} {pet_type_lower}"
     else:
         image_alt = f"Memorial stone for {pet_name}, beloved {pet_type_lower}"
+    if input_filename:
+        image_tag = build_responsive_image_html(
+            tribute_web_path, image_filename, image_meta, TRIBUTE_IMAGE_SIZES, escape_html(image_alt)
+        )
+    else:
+        image_tag = f'<img src="{image_path}" alt="{escape_html(image_alt)}">'
     image_2_block = ""
     if second_image_filename:
         image_2_block = (
             '<div class="mm-tribute-image mm-tribute-image-secondary">'
-            f'<img src="{tribute_web_path}{escape_html(second_image_filename)}" alt="{escape_html(image_alt)} 2">'
-            "</div>"
+            + build_responsive_image_html(
+                tribute_web_path, second_image_filename, image2_meta, TRIBUTE_IMAGE_SIZES, f"{escape_html(image_alt)} 2"
+            )
+            + "</div>"
         )
     dates_block = f"<p>{escape_html(years_pretty)}</p>" if years_pretty.strip() else ""
     shared_block = f"<p>Shared by {escape_html(submitter_line)}</p>" if submitter_line else ""
@@ -1098,9 +2789,6 @@ def build_tribute_html(
     }
     breadcrumb_json = json.dumps(breadcrumb_data, ensure_ascii=False)
 
-    # ----- Load base template -----
-    base = load_template("base.html")
-
     # ----- Build head meta -----
     head_meta = f"""
   <title>{escape_html(title)}</title>
@@ -1120,156 +2808,1151 @@ def build_tribute_html(
   </script>
 """.strip()
 
-    # ----- Load tribute content template -----
-    content = load_template("tribute_content.html")
-
-    content = content.replace("{{TRIBUTE_H1}}", escape_html(tribute_h1))
-    content = content.replace("{{TRIBUTE_INTRO}}", escape_html(tribute_intro))
-    content = content.replace("{{PET_NAME}}", escape_html(pet_name))
-    content = content.replace("{{IMAGE_PATH}}", image_path)
-    content = content.replace("{{IMAGE_ALT}}", escape_html(image_alt))
-    content = content.replace("{{IMAGE_2_BLOCK}}", image_2_block)
-    content = content.replace("{{DATES_BLOCK}}", dates_block)
-    content = content.replace("{{SHARED_BLOCK}}", shared_block)
-    content = content.replace("{{SHARE_FACEBOOK_URL}}", share_facebook_url)
-    content = content.replace("{{SHARE_PINTEREST_URL}}", share_pinterest_url)
-    content = content.replace("{{SHARE_EMAIL_URL}}", share_email_url)
-    content = content.replace("{{TRIBUTE_MESSAGE}}", tribute_message_html)
-
-    # ----- Load header + footer -----
-    header_template = load_template("header.html")
-    header_html = header_template.replace("{{HEADER_CLASSES}}", "site-header")
-
-    footer_html = load_template("footer.html")
-
-    # ----- Assemble final page -----
-    final_html = base.replace("{{HEAD_META}}", head_meta)
-    final_html = final_html.replace("{{OG_TITLE}}", escape_html(og_title))
-    final_html = final_html.replace("{{OG_DESCRIPTION}}", escape_html(og_description))
-    final_html = final_html.replace("{{OG_URL}}", og_url)
-    final_html = final_html.replace("{{CANONICAL_URL}}", page_url)
-    final_html = final_html.replace("{{OG_IMAGE}}", full_image_url)
-    final_html = final_html.replace("{{PUBLISHED_TIME}}", publish_date_iso)
-    final_html = final_html.replace("{{TWITTER_TITLE}}", escape_html(og_title))
-    final_html = final_html.replace("{{TWITTER_DESCRIPTION}}", escape_html(og_description))
-    final_html = final_html.replace("{{TWITTER_IMAGE}}", full_image_url)
-    final_html = final_html.replace("{{HEADER}}", header_html)
-    final_html = final_html.replace("{{CONTENT}}", content)
-    final_html = final_html.replace("{{FOOTER}}", footer_html)
-
-    return final_html
+    # ----- Render tribute content + page -----
+    content = render_template(
+        "tribute_content.html",
+        TRIBUTE_H1=escape_html(tribute_h1),
+        TRIBUTE_INTRO=escape_html(tribute_intro),
+        PET_NAME=escape_html(pet_name),
+        IMAGE_TAG=image_tag,
+        IMAGE_2_BLOCK=image_2_block,
+        DATES_BLOCK=dates_block,
+        SHARED_BLOCK=shared_block,
+        SHARE_FACEBOOK_URL=share_facebook_url,
+        SHARE_PINTEREST_URL=share_pinterest_url,
+        SHARE_EMAIL_URL=share_email_url,
+        TRIBUTE_MESSAGE=tribute_message_html,
+    )
+
+    return render_template(
+        "base.html",
+        HEAD_META=head_meta,
+        OG_TITLE=escape_html(og_title),
+        OG_DESCRIPTION=escape_html(og_description),
+        OG_URL=og_url,
+        CANONICAL_URL=page_url,
+        OG_IMAGE=full_image_url,
+        PUBLISHED_TIME_META=published_time_meta(publish_date_iso),
+        TWITTER_TITLE=escape_html(og_title),
+        TWITTER_DESCRIPTION=escape_html(og_description),
+        TWITTER_IMAGE=full_image_url,
+        HEADER=render_template("header.html", HEADER_CLASSES="site-header"),
+        CONTENT=content,
+        FOOTER=render_template("footer.html"),
+    )
 
 
 
+@timed
 def rebuild_single_tribute_page(entry: dict, tribute_message_override: str = ""):
+    result = render_single_tribute_page(entry, tribute_message_override)
+    if result:
+        write_output_file(*result)
+
+
+def _render_tribute_page_job(entry: dict) -> tuple[str, str] | None:
+    return render_single_tribute_page(entry)
+
+
+@timed
+def rebuild_tribute_pages(entries: list[dict], jobs: int = 1):
+    """Re-render every tribute page (keeping each page's existing message body)."""
+    write_rendered_pages(_render_tribute_page_job, [e for e in entries if (e.get("slug") or "").strip()], jobs)
+
+
+def render_single_tribute_page(entry: dict, tribute_message_override: str = "") -> tuple[str, str] | None:
+    """Return (index_path, html) for a tribute, or None when the entry has no slug."""
     slug = (entry.get("slug") or "").strip()
     if not slug:
-        return
+        return None
 
     tribute_folder = find_tribute_folder(slug, entry.get("folder", ""))
-    safe_mkdir(tribute_folder)
     index_path = os.path.join(tribute_folder, "index.html")
 
     # Preserve existing tribute body text when editing metadata/images unless explicit override provided.
     tribute_message_html = ""
+    message_preview = None
     override_text = (tribute_message_override or "").strip()
     if override_text:
-        tribute_message_html = parse_safe_markdown(override_text)
+        rendered = render_message_markdown(override_text)
+        tribute_message_html, message_preview = rendered["html"], rendered["preview"]
     elif os.path.exists(index_path):
         try:
             with open(index_path, "r", encoding="utf-8") as f:
-                existing_html = f.read()
-            msg_match = re.search(
-                r'<div class="mm-tribute-message(?:\s+mm-tribute-message-centered)?"(?:\s+style="[^"]*")?\s*>\s*(.*?)\s*</div>',
-                existing_html,
-                flags=re.S,
-            )
-            if msg_match:
-                tribute_message_html = (msg_match.group(1) or "").strip()
+                tribute_message_html = extract_tribute_message_html(f.read())
         except Exception:
             tribute_message_html = ""
 
-    if not tribute_message_html:
-        fallback_excerpt = (entry.get("excerpt") or "").strip()
-        tribute_message_html = f"<p>{escape_html(fallback_excerpt)}</p>" if fallback_excerpt else "<p></p>"
+    if not tribute_message_html:
+        fallback_excerpt = (entry.get("excerpt") or "").strip()
+        tribute_message_html = f"<p>{escape_html(fallback_excerpt)}</p>" if fallback_excerpt else "<p></p>"
+
+    tribute_web_path = get_entry_web_base(entry)
+    image_filename = (entry.get("image_filename") or "").strip()
+    is_placeholder_image = (
+        (not image_filename)
+        or image_filename == "blank_memorial_loving_memory.png"
+        or image_filename == f"{slug}.png"
+        or image_filename.endswith("-memorial-stone.png")
+        or image_filename.endswith("-memorial-stone.webp")
+    )
+    if image_filename and not is_placeholder_image:
+        og_image_abs = f"{SITE_DOMAIN}{tribute_web_path}{image_filename}"
+    else:
+        og_image_abs = f"{SITE_DOMAIN}/pet-tributes/assets/blank_memorial_loving_memory.png"
+
+    page_url = f"{SITE_DOMAIN}{tribute_web_path}"
+    tribute_html = build_tribute_html(
+        pet_name=entry.get("pet_name", ""),
+        first_name=entry.get("first_name", ""),
+        state=entry.get("state", ""),
+        breed=entry.get("breed", ""),
+        pet_type=entry.get("pet_type", ""),
+        years_pretty=entry.get("years_pretty", ""),
+        excerpt=entry.get("excerpt", ""),
+        page_url=page_url,
+        tribute_web_path=tribute_web_path,
+        og_image_abs=og_image_abs,
+        user_uploaded_image=not is_placeholder_image,
+        second_image_filename=entry.get("image2_filename", ""),
+        publish_date_iso=(entry.get("published_iso") or datetime.now().isoformat(timespec="seconds")),
+        tribute_message_html=tribute_message_html,
+        image_meta=image_meta_from_entry(entry, "image"),
+        image2_meta=image_meta_from_entry(entry, "image2"),
+        message_preview=message_preview,
+    )
+
+    return index_path, tribute_html
+
+
+# Matches the message container in current pages (class="mm-tribute-message tribute-body")
+# as well as older ones (mm-tribute-message-centered, inline style).
+TRIBUTE_MESSAGE_RE = re.compile(
+    r'<div class="mm-tribute-message(?:\s+[\w-]+)*"(?:\s+style="[^"]*")?\s*>\s*(.*?)\s*</div>',
+    flags=re.S,
+)
+
+
+def extract_tribute_message_html(page_html: str) -> str:
+    """Return the stored tribute message HTML from a generated tribute page ("" if absent)."""
+    msg_match = TRIBUTE_MESSAGE_RE.search(page_html or "")
+    return (msg_match.group(1) or "").strip() if msg_match else ""
+
+
+def tribute_message_html_to_text(message_html: str) -> str:
+    """Convert stored tribute message HTML back to plain editable text with paragraph spacing."""
+    source = message_html or ""
+    paragraph_matches = re.findall(r"<p[^>]*>(.*?)</p>", source, flags=re.S | re.I)
+    if paragraph_matches:
+        parts = []
+        for p in paragraph_matches:
+            plain = re.sub(r"<[^>]+>", "", p)
+            plain = html.unescape(plain).strip()
+            if plain:
+                parts.append(plain)
+        if parts:
+            return "\n\n".join(parts)
+
+    fallback = re.sub(r"<[^>]+>", " ", source)
+    fallback = html.unescape(fallback)
+    fallback = re.sub(r"\s+", " ", fallback).strip()
+    return fallback
+
+
+def escape_html(s: str) -> str:
+    return (s or "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def escape_json(s: str) -> str:
+    return (s or "").replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def escape_url(s: str) -> str:
+    # very small helper for pin description
+    from urllib.parse import quote
+    return quote(s or "")
+
+
+def relative_filename_from_url(url: str) -> str:
+    # If og_image_abs is inside the same folder, we want <filename>.webp
+    # If placeholder absolute url, keep it absolute.
+    if url.startswith(SITE_DOMAIN + "/pet-tributes/"):
+        # last segment
+        return url.split("/")[-1]
+    return url
+
+
+# ----------------------------
+# Tribute operations (shared by the GUI and the CLI)
+# ----------------------------
+
+class TributeError(Exception):
+    """A user-facing failure. `title` is the dialog title; str(exc) is the message."""
+
+    def __init__(self, title: str, message: str):
+        super().__init__(message)
+        self.title = title
+
+
+class JobCancelled(Exception):
+    """Raised from a background job's progress() call once the job was cancelled."""
+
+
+PILLOW_MISSING_MESSAGE = "Image conversion requires Pillow.\n\nRun:\n  py -m pip install pillow"
+
+
+def parse_bool_field(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def unique_tribute_slug(pet_name: str, pet_type: str, breed: str, existing_slugs: set[str]) -> str:
+    # Slug rules (new tributes only): pet-name + optional type + optional breed.
+    # If a slug already exists in data.json, append -2, -3, etc.
+    pet_slug = slugify(pet_name)
+    type_slug = slugify(pet_type)
+    breed_slug = slugify(breed)
+    slug_parts = [p for p in [pet_slug, type_slug] if p]
+    if breed_slug:
+        slug_parts.append(breed_slug)
+    base_slug = "-".join(slug_parts).strip("-")
+    if not base_slug:
+        base_slug = pet_slug
+
+    folder_slug = base_slug
+    counter = 2
+    while folder_slug in existing_slugs:
+        folder_slug = f"{base_slug}-{counter}"
+        counter += 1
+    return folder_slug
+
+
+@timed
+def convert_tribute_image(src_path: str, dest_path: str, log_label: str, error_title: str, error_message: str):
+    if not ensure_pillow():
+        raise TributeError("Pillow not installed", PILLOW_MISSING_MESSAGE)
+    try:
+        info = convert_to_webp_normalized(
+            src_path,
+            dest_path,
+            max_width=MAX_IMAGE_WIDTH,
+            quality=WEBP_QUALITY,
+        )
+        print(f"[{log_label}] {info}")
+    except Exception as e:
+        raise TributeError(error_title, f"{error_message}:\n{e}") from e
+    record_output_file(dest_path)
+
+
+def clean_tribute_fields(fields: dict) -> dict:
+    """Normalize form/record fields for a new tribute; raises TributeError when required ones are missing."""
+    clean = {
+        "pet_name": (fields.get("pet_name") or "").strip(),
+        "pet_type": (fields.get("pet_type") or "").strip(),
+        "first_name": (fields.get("first_name") or "").strip(),
+        "state": (fields.get("state") or "").strip(),
+        "email": (fields.get("email") or "").strip(),
+        "email_sent": parse_bool_field(fields.get("email_sent")),
+        "breed": (fields.get("breed") or "").strip(),
+        "message": (fields.get("message") or "").strip(),
+    }
+    if not clean["pet_name"] or not clean["message"]:
+        raise TributeError("Missing required fields", "Pet Name and Tribute Message are required.")
+    clean["years_pretty"] = normalize_dates_text((fields.get("years") or fields.get("years_pretty") or "").strip())
+    return clean
+
+
+def write_new_tribute_page(clean: dict, folder_slug: str, user_uploaded_image: bool, img2_filename: str) -> dict:
+    """Render index.html for a new tribute whose images are already in place; returns its data.json entry."""
+    tribute_folder = os.path.join(MEMORIALS_DIR, folder_slug)
+    tribute_web_path = f"/pet-tributes/memorials/{folder_slug}/"
+    img_filename = f"{folder_slug}.webp"
+    img_abs_url = f"{SITE_DOMAIN}{tribute_web_path}{img_filename}"
+
+    # Build tribute page values
+    published_iso = datetime.now().isoformat(timespec="seconds")
+    page_url = f"{SITE_DOMAIN}{tribute_web_path}"
+    rendered = render_message_markdown(clean["message"])
+    excerpt = summarize_excerpt(html.unescape(rendered["plain"]))
+
+    entry = {
+        "slug": folder_slug,
+        "pet_name": clean["pet_name"],
+        "breed": clean["breed"],
+        "pet_type": clean["pet_type"],
+        "folder": "memorials",
+        "years_pretty": clean["years_pretty"],
+        "excerpt": excerpt,
+        "first_name": clean["first_name"],
+        "state": clean["state"],
+        "email": clean["email"],
+        "published_iso": published_iso,
+        "image_filename": img_filename,
+        "image2_filename": img2_filename,
+        "featured": False,
+        "email_sent": clean["email_sent"],
+    }
+    refresh_entry_image_meta(entry)
+
+    tribute_html = build_tribute_html(
+        pet_name=clean["pet_name"],
+        first_name=clean["first_name"],
+        state=clean["state"],
+        breed=clean["breed"],
+        pet_type=clean["pet_type"],
+        years_pretty=clean["years_pretty"],
+        excerpt=excerpt,
+        page_url=page_url,
+        tribute_web_path=tribute_web_path,
+        og_image_abs=img_abs_url,
+        user_uploaded_image=user_uploaded_image,
+        second_image_filename=img2_filename,
+        publish_date_iso=published_iso,
+        tribute_message_html=rendered["html"],
+        image_meta=image_meta_from_entry(entry, "image"),
+        image2_meta=image_meta_from_entry(entry, "image2"),
+        message_preview=rendered["preview"],
+    )
+
+    if tribute_html is None:
+        raise RuntimeError("build_tribute_html returned None")
+
+    if not isinstance(tribute_html, str):
+        raise RuntimeError(f"build_tribute_html returned unexpected type: {type(tribute_html)}")
+
+    index_path = os.path.join(tribute_folder, "index.html")
+
+    try:
+        write_output_file(index_path, tribute_html)
+    except Exception as e:
+        raise RuntimeError(f"Failed to write index.html: {e}")
+
+    if not os.path.exists(index_path):
+        raise RuntimeError("index.html was not created after write attempt")
+
+    return entry
+
+
+def prepare_placeholder_image(img_dest: str):
+    if not os.path.exists(PLACEHOLDER_IMAGE_FILE):
+        raise TributeError("Placeholder missing", f"Default image not found:\n{PLACEHOLDER_IMAGE_FILE}")
+    try:
+        process_placeholder_image(PLACEHOLDER_IMAGE_FILE, img_dest)
+    except Exception as e:
+        raise TributeError("Placeholder processing failed", f"Could not prepare fallback image:\n{e}") from e
+    record_output_file(img_dest)
+
+
+@timed
+def publish_tribute(
+    fields: dict,
+    image_path: str = "",
+    image2_path: str = "",
+    rebuild: bool = True,
+    progress=None,
+) -> dict:
+    """
+    Create a new tribute page from form/record fields and add it to data.json.
+
+    fields: pet_name, message (required); pet_type, breed, years, first_name,
+    state, email, email_sent (optional). Returns the new data.json entry.
+    progress(message) is called before each step; if it raises JobCancelled
+    the half-written tribute folder is removed and nothing is saved.
+    """
+    progress = progress or (lambda message: None)
+    clean = clean_tribute_fields(fields)
+
+    existing_entries = load_data()
+    folder_slug = unique_tribute_slug(clean["pet_name"], clean["pet_type"], clean["breed"], get_tribute_store().slugs())
+
+    tribute_folder = os.path.join(MEMORIALS_DIR, folder_slug)
+    safe_mkdir(tribute_folder)
+
+    # Image 1 is always <slug>.webp; without an upload it is the placeholder.
+    img_dest = os.path.join(tribute_folder, f"{folder_slug}.webp")
+    img2_filename = ""
+
+    chosen_image = (image_path or "").strip()
+    chosen_image2 = (image2_path or "").strip()
+    try:
+        if chosen_image:
+            progress("Converting photo 1…")
+            convert_tribute_image(
+                chosen_image, img_dest, "image",
+                "Image conversion failed", "Could not convert image to .webp",
+            )
+        else:
+            prepare_placeholder_image(img_dest)
+
+        if chosen_image2:
+            progress("Converting photo 2…")
+            img2_filename = f"{folder_slug}-2.webp"
+            convert_tribute_image(
+                chosen_image2, os.path.join(tribute_folder, img2_filename), "image2",
+                "Image 2 conversion failed", "Could not convert second image to .webp",
+            )
+
+        progress("Writing tribute page…")
+        entry = write_new_tribute_page(clean, folder_slug, bool(chosen_image), img2_filename)
+        # Last chance to cancel: after this the tribute is saved.
+        progress("Saving tribute…")
+    except JobCancelled:
+        remove_output_folder(tribute_folder)
+        raise
+
+    # prevent duplicates by slug
+    entries = [e for e in existing_entries if e.get("slug") != folder_slug]
+    entries.append(entry)
+
+    save_data(entries)
+    if rebuild:
+        rebuild_changed_archives(existing_entries, entries)
+    return entry
+
+
+def commit_tribute_edit(
+    tributes: list[dict],
+    original_tributes: list[dict],
+    entry: dict,
+    tribute_message: str = "",
+    rebuild: bool = True,
+):
+    """Persist an edited entry: save data.json, re-render its page and (unless rebuild=False) the affected archives."""
+    entry["years_pretty"] = normalize_dates_text(entry.get("years_pretty", ""))
+    # Drives the tribute's sitemap <lastmod>.
+    entry["updated_iso"] = datetime.now().isoformat(timespec="seconds")
+    refresh_entry_image_meta(entry)
+    save_data(tributes)
+    rebuild_single_tribute_page(entry, tribute_message_override=tribute_message)
+    if rebuild:
+        rebuild_changed_archives(original_tributes, tributes)
+
+
+def convert_replacement_images(entry: dict, image_path: str = "", image2_path: str = "", progress=None):
+    """Convert newly chosen photo(s) for an existing tribute and point the entry at them."""
+    slug = entry.get("slug", "")
+    tribute_folder = find_tribute_folder(slug, entry.get("folder", ""))
+    for field_key, src, output_filename, label in (
+        ("image_filename", image_path, f"{slug}.webp", "Image 1"),
+        ("image2_filename", image2_path, f"{slug}-2.webp", "Image 2"),
+    ):
+        src = (src or "").strip()
+        if not src:
+            continue
+        if not os.path.isfile(src):
+            raise TributeError("Validation", f"{label} upload not found:\n{src}")
+        if progress:
+            progress(f"Converting {label}…")
+        safe_mkdir(tribute_folder)
+        convert_tribute_image(
+            src, os.path.join(tribute_folder, output_filename), f"edit-{field_key}",
+            "Image conversion failed", f"Could not convert {label}",
+        )
+        entry[field_key] = output_filename
+
+
+# Fields `edit` may set directly; images and the message have their own options.
+EDITABLE_FIELDS = (
+    "pet_name", "pet_type", "breed", "years_pretty", "first_name", "state",
+    "email", "email_sent", "featured",
+)
+
+
+def update_tribute(
+    slug: str,
+    changes: dict,
+    tribute_message: str = "",
+    image_path: str = "",
+    image2_path: str = "",
+) -> dict:
+    """Apply field changes (and optionally a new message/images) to one tribute."""
+    tributes = load_data()
+    original_tributes = [dict(t) for t in tributes]
+    entry = next((t for t in tributes if t.get("slug") == slug), None)
+    if not entry:
+        raise TributeError("Not Found", f'Could not find tribute "{slug}" in data.json.')
+
+    for key, value in changes.items():
+        if key not in EDITABLE_FIELDS:
+            raise TributeError("Validation", f'Field "{key}" cannot be edited.')
+        if key in ("email_sent", "featured"):
+            entry[key] = parse_bool_field(value)
+        else:
+            entry[key] = str(value or "").strip()
+    if not (entry.get("pet_name") or "").strip():
+        raise TributeError("Validation", "Pet Name is required.")
+
+    tribute_message = (tribute_message or "").strip()
+    if tribute_message:
+        entry["excerpt"] = summarize_excerpt(strip_markdown_for_excerpt(tribute_message))
+
+    convert_replacement_images(entry, image_path, image2_path)
+    commit_tribute_edit(tributes, original_tributes, entry, tribute_message)
+    return entry
+
+
+def delete_tributes(slugs: list[str], rebuild: bool = True) -> list[str]:
+    """Remove tribute folders and data.json entries; returns the slugs that existed."""
+    previous_tributes = load_data()
+    by_slug = {t.get("slug"): t for t in previous_tributes}
+    for slug in slugs:
+        entry = by_slug.get(slug, {})
+        tribute_folder = find_tribute_folder(slug, entry.get("folder", ""))
+        if os.path.exists(tribute_folder):
+            remove_output_folder(tribute_folder)
+
+    tributes = [t for t in previous_tributes if t.get("slug") not in slugs]
+    save_data(tributes)
+    if rebuild:
+        rebuild_changed_archives(previous_tributes, tributes)
+    return [slug for slug in slugs if slug in by_slug]
+
+
+def sync_entries_with_disk(jobs: int = 1) -> list[str]:
+    """Drop data.json entries whose tribute folder is gone and rebuild archives if any were removed."""
+    entries = load_data()
+    synced_entries, removed_slugs = prune_entries_missing_folders(entries)
+    if removed_slugs:
+        save_data(synced_entries)
+        rebuild_all_archives(synced_entries, jobs=jobs)
+    return removed_slugs
+
+
+# ----------------------------
+# Batch import
+# ----------------------------
+
+# Looked up (in order) inside an import folder.
+IMPORT_MANIFEST_NAMES = ("manifest.json", "manifest.csv", "tributes.json", "tributes.csv")
+
+
+def find_import_manifest(path: str) -> str:
+    if os.path.isfile(path):
+        return path
+    for name in IMPORT_MANIFEST_NAMES:
+        candidate = os.path.join(path, name)
+        if os.path.isfile(candidate):
+            return candidate
+    raise TributeError("Import", f"No {' / '.join(IMPORT_MANIFEST_NAMES)} found in:\n{path}")
+
+
+def _convert_image_task(task: tuple[str, str, str]) -> tuple[bool, str]:
+    """Process-pool worker: ("upload"|"placeholder"|"variants", src, dest) -> (ok, info or error)."""
+    kind, src_path, dest_path = task
+    try:
+        if kind == "placeholder":
+            process_placeholder_image(src_path, dest_path)
+            info = "placeholder"
+        elif kind == "variants":
+            info = ensure_image_variants(src_path)
+        else:
+            info = convert_to_webp_normalized(src_path, dest_path, max_width=MAX_IMAGE_WIDTH, quality=WEBP_QUALITY)
+        if kind != "variants":
+            # Encode the srcset variants in the worker too; the parent then only relinks them.
+            ensure_image_variants(dest_path)
+        return True, str(info)
+    except Exception as e:
+        return False, str(e)
+
+
+@timed
+def import_tribute_batch(path: str, jobs: int = 1) -> list[dict]:
+    """
+    Publish every record of an import folder (manifest + images) in one go:
+    images are converted in a process pool, all tribute pages are written, then
+    data.json is saved and the archives/sitemap are rebuilt once.
+
+    Returns one report dict per record: {"row", "pet_name", "slug", "error"};
+    a failed record is skipped without aborting the batch.
+    """
+    manifest_path = find_import_manifest(path)
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    records = load_tribute_records(manifest_path)
+
+    existing_entries = load_data()
+    taken_slugs = get_tribute_store().slugs()
+    has_placeholder = os.path.exists(PLACEHOLDER_IMAGE_FILE)
+
+    report = []
+    pending = []
+    tasks = []
+    for row, record in enumerate(records, start=1):
+        item = {"row": row, "pet_name": (record.get("pet_name") or "").strip(), "slug": "", "error": ""}
+        report.append(item)
+        try:
+            clean = clean_tribute_fields(record)
+            image_path = resolve_record_path(record.get("image", ""), base_dir)
+            image2_path = resolve_record_path(record.get("image2", ""), base_dir)
+            for label, src in (("Image 1", image_path), ("Image 2", image2_path)):
+                if src and not os.path.isfile(src):
+                    raise TributeError("Validation", f"{label} not found: {src}")
+            if not image_path and not has_placeholder:
+                raise TributeError("Placeholder missing", f"Default image not found: {PLACEHOLDER_IMAGE_FILE}")
+        except TributeError as e:
+            item["error"] = str(e)
+            continue
+
+        folder_slug = unique_tribute_slug(clean["pet_name"], clean["pet_type"], clean["breed"], taken_slugs)
+        taken_slugs.add(folder_slug)
+        item["slug"] = folder_slug
+        tribute_folder = os.path.join(MEMORIALS_DIR, folder_slug)
+        safe_mkdir(tribute_folder)
+
+        task_ids = [len(tasks)]
+        if image_path:
+            tasks.append(("upload", image_path, os.path.join(tribute_folder, f"{folder_slug}.webp")))
+        else:
+            tasks.append(("placeholder", PLACEHOLDER_IMAGE_FILE, os.path.join(tribute_folder, f"{folder_slug}.webp")))
+        img2_filename = ""
+        if image2_path:
+            img2_filename = f"{folder_slug}-2.webp"
+            task_ids.append(len(tasks))
+            tasks.append(("upload", image2_path, os.path.join(tribute_folder, img2_filename)))
+        pending.append((item, clean, bool(image_path), img2_filename, task_ids))
+
+    results = list(render_in_pool(_convert_image_task, tasks, jobs))
+
+    new_entries = []
+    for item, clean, user_uploaded_image, img2_filename, task_ids in pending:
+        failures = [results[i][1] for i in task_ids if not results[i][0]]
+        tribute_folder = os.path.join(MEMORIALS_DIR, item["slug"])
+        if failures:
+            item["error"] = f"Image conversion failed: {'; '.join(failures)}"
+            remove_output_folder(tribute_folder)
+            continue
+        for i in task_ids:
+            record_output_file(tasks[i][2])
+        try:
+            new_entries.append(write_new_tribute_page(clean, item["slug"], user_uploaded_image, img2_filename))
+        except Exception as e:
+            item["error"] = str(e)
+            remove_output_folder(tribute_folder)
+
+    if new_entries:
+        entries = existing_entries + new_entries
+        save_data(entries)
+        rebuild_changed_archives(existing_entries, entries)
+    return report
+
+
+# ----------------------------
+# Publish notification emails
+# ----------------------------
+
+# Outbox state kept on the tribute entry itself, so the queue lives in the tribute store.
+EMAIL_QUEUE_FIELDS = ("email_queued", "email_attempts", "email_retry_iso", "email_error")
+
+
+def build_publish_email(entry: dict) -> EmailMessage:
+    first_name = (entry.get("first_name") or "").strip() or "there"
+    tribute_url = f"{SITE_DOMAIN}{get_entry_web_base(entry)}"
+
+    msg = EmailMessage()
+    msg["Subject"] = "Your tribute has been published"
+    msg["From"] = EMAIL_SENDER
+    msg["To"] = entry["email"].strip()
+
+    msg.set_content(f"""
+Hi {first_name},
+
+Your pet’s tribute has now been published.
+
+View the tribute here:
+{tribute_url}
+
+With respect,
+Melton Memorials
+Alma, Arkansas
+""")
+
+    msg.add_alternative(f"""
+<html>
+  <body>
+    <p>Hi {escape_html(first_name)},</p>
+    <p>Your pet’s tribute has now been published.</p>
+    <p><a href="{escape_html(tribute_url)}">Click here to view the tribute</a></p>
+    <p>With respect,<br>
+    Melton Memorials<br>
+    Alma, Arkansas</p>
+  </body>
+</html>
+""", subtype="html")
+    return msg
+
+
+def email_recipients(entry: dict) -> list[str]:
+    email = entry["email"].strip()
+    recipients = [email]
+    if EMAIL_BCC and EMAIL_BCC.lower() != email.lower():
+        recipients.append(EMAIL_BCC)
+    return recipients
+
+
+def smtp_password() -> str:
+    password = os.environ.get("MM_EMAIL_PASS", "")
+    if not password and SMTP_SECURITY != "none":
+        raise TributeError("Missing Password", "Environment variable MM_EMAIL_PASS not set.")
+    return password
+
+
+def open_smtp_connection(password: str) -> smtplib.SMTP:
+    """An authenticated connection to SMTP_HOST (login is skipped without a password)."""
+    if SMTP_SECURITY == "ssl":
+        server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, context=ssl.create_default_context(), timeout=SMTP_TIMEOUT)
+    else:
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        if SMTP_SECURITY == "starttls":
+            server.starttls(context=ssl.create_default_context())
+    try:
+        if password:
+            server.login(EMAIL_SENDER, password)
+    except BaseException:
+        server.close()
+        raise
+    return server
+
+
+def _close_smtp(server: smtplib.SMTP | None):
+    if server is None:
+        return
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+
+class SendRateLimiter:
+    """Spaces sends at least 60/per_minute seconds apart, shared by every connection."""
+
+    def __init__(self, per_minute: float | None = None):
+        per_minute = EMAIL_RATE_PER_MINUTE if per_minute is None else per_minute
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _smtp_error_text(error: smtplib.SMTPResponseException) -> str:
+    detail = error.smtp_error
+    if isinstance(detail, bytes):
+        detail = detail.decode("utf-8", "replace")
+    return f"{error.smtp_code} {detail}"
+
+
+def send_email_batch(batch: list[tuple[str, EmailMessage, list[str]]], password: str, limiter=None, progress=None) -> dict:
+    """
+    Send (slug, message, recipients) items over one reused connection,
+    reconnecting after EMAIL_MESSAGES_PER_CONNECTION messages or a dropped
+    connection. Returns {slug: "" when sent, else the error} for the items
+    attempted; stops early if progress() raises JobCancelled.
+    """
+    limiter = limiter or SendRateLimiter(0)
+    results = {}
+    server = None
+    sent_on_connection = 0
+    try:
+        for slug, msg, recipients in batch:
+            if progress:
+                try:
+                    progress(f"Emailing {msg['To']}…")
+                except JobCancelled:
+                    break
+            for attempt in range(EMAIL_SEND_RETRIES + 1):
+                try:
+                    if server is not None and sent_on_connection >= EMAIL_MESSAGES_PER_CONNECTION:
+                        _close_smtp(server)
+                        server = None
+                    if server is None:
+                        server = open_smtp_connection(password)
+                        sent_on_connection = 0
+                    limiter.wait()
+                    server.send_message(msg, to_addrs=recipients)
+                    sent_on_connection += 1
+                    results[slug] = ""
+                    break
+                except smtplib.SMTPAuthenticationError as e:
+                    if not results:
+                        raise TributeError("Email Failed", f"SMTP login failed: {_smtp_error_text(e)}") from e
+                    # Keep what was already sent; the rest stays queued.
+                    results[slug] = f"SMTP login failed: {_smtp_error_text(e)}"
+                    return results
+                except smtplib.SMTPRecipientsRefused as e:
+                    results[slug] = f"Recipient refused: {', '.join(e.recipients)}"
+                    break
+                except smtplib.SMTPResponseException as e:
+                    results[slug] = _smtp_error_text(e)
+                    # 4xx replies are temporary; 5xx are final for this message.
+                    if not 400 <= e.smtp_code < 500:
+                        break
+                except OSError as e:
+                    # Dropped connection, timeout or refused connect: retry on a fresh session.
+                    _close_smtp(server)
+                    server = None
+                    results[slug] = str(e) or type(e).__name__
+                if attempt < EMAIL_SEND_RETRIES:
+                    time.sleep(2 ** attempt)
+    finally:
+        _close_smtp(server)
+    return results
+
+
+def queue_publish_emails(slugs: list[str]) -> int:
+    """Add tributes to the outbox (one store write); returns how many were queued."""
+    store = get_tribute_store()
+    wanted = set(slugs)
+    entries = store.load()
+    queued = 0
+    for entry in entries:
+        if entry.get("slug") in wanted and (entry.get("email") or "").strip():
+            entry.update({"email_queued": True, "email_attempts": 0, "email_retry_iso": "", "email_error": ""})
+            queued += 1
+    if queued:
+        store.save(entries)
+    return queued
+
+
+def due_email_entries(entries: list[dict], now: datetime | None = None) -> list[dict]:
+    """Queued entries that still have an address and whose retry time has come."""
+    now_iso = (now or datetime.now()).isoformat(timespec="seconds")
+    return [
+        e for e in entries
+        if e.get("email_queued") is True
+        and (e.get("email") or "").strip()
+        and (e.get("email_retry_iso") or "") <= now_iso
+    ]
+
+
+def record_email_results(results: dict, now: datetime | None = None) -> dict:
+    """
+    Apply send results to the store in one write: sent entries get email_sent
+    and leave the queue, failures are rescheduled with exponential backoff
+    (or dropped from the queue after EMAIL_MAX_ATTEMPTS). Returns the report
+    {"sent": [...], "retrying": {slug: error}, "gave_up": {slug: error}}.
+    """
+    now = now or datetime.now()
+    report = {"sent": [], "retrying": {}, "gave_up": {}}
+    if not results:
+        return report
+    store = get_tribute_store()
+    entries = store.load()
+    for entry in entries:
+        slug = entry.get("slug")
+        if slug not in results:
+            continue
+        error = results[slug]
+        if not error:
+            for key in EMAIL_QUEUE_FIELDS:
+                entry.pop(key, None)
+            entry["email_sent"] = True
+            entry["email_sent_iso"] = now.isoformat(timespec="seconds")
+            report["sent"].append(slug)
+            continue
+        attempts = int(entry.get("email_attempts") or 0) + 1
+        entry["email_attempts"] = attempts
+        entry["email_error"] = error
+        if attempts >= EMAIL_MAX_ATTEMPTS:
+            entry["email_queued"] = False
+            report["gave_up"][slug] = error
+        else:
+            # Failed bulk sends join the outbox so later runs retry them.
+            entry["email_queued"] = True
+            retry_at = now + timedelta(seconds=EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+            entry["email_retry_iso"] = retry_at.isoformat(timespec="seconds")
+            report["retrying"][slug] = error
+    store.save(entries)
+    return report
+
+
+def deliver_publish_emails(entries: list[dict], workers: int = 1, progress=None) -> dict:
+    """
+    Send the publish email for each entry over at most `workers` concurrent
+    connections (sharing one rate limit) and record every outcome with a
+    single store write. See record_email_results for the report.
+    """
+    if not entries:
+        return {"sent": [], "retrying": {}, "gave_up": {}}
+    password = smtp_password()
+    batch = [(e["slug"], build_publish_email(e), email_recipients(e)) for e in entries]
+    workers = max(1, min(workers, len(batch)))
+    chunks = [batch[i::workers] for i in range(workers)]
+    limiter = SendRateLimiter()
+
+    counter = iter(range(1, len(batch) + 1))
+    counter_lock = threading.Lock()
+
+    def report(message: str):
+        with counter_lock:
+            position = next(counter, len(batch))
+        progress(f"{message} ({position} of {len(batch)})")
+
+    results = {}
+    failures = []
+    with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        futures = [pool.submit(send_email_batch, chunk, password, limiter, report if progress else None) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            try:
+                results.update(future.result())
+            except TributeError as e:
+                failures.append((chunk, e))
+    # A chunk that could not log in is recorded like any other failure, so its
+    # slugs get an attempt and a backoff before the next run.
+    for chunk, e in failures:
+        for slug, _msg, _recipients in chunk:
+            results[slug] = str(e)
+    outcome = record_email_results(results)
+    if failures and not outcome["sent"]:
+        errors = list(dict.fromkeys(str(e) for _chunk, e in failures))
+        raise TributeError("Email Failed", "\n".join(errors))
+    return outcome
+
+
+def deliver_email_queue(progress=None, limit: int | None = None, workers: int = 1) -> dict:
+    """Send every due outbox email (see deliver_publish_emails)."""
+    return deliver_publish_emails(due_email_entries(load_data())[:limit], workers, progress)
+
+
+def pending_notification_entries(entries: list[dict], now: datetime | None = None) -> list[dict]:
+    """
+    Tributes that have an email address but were never notified, leaving out
+    outbox entries still waiting on a retry or already given up on.
+    """
+    now_iso = (now or datetime.now()).isoformat(timespec="seconds")
+    return [
+        e for e in entries
+        if e.get("email_sent") is not True
+        and (e.get("email") or "").strip()
+        and (e.get("email_retry_iso") or "") <= now_iso
+        and int(e.get("email_attempts") or 0) < EMAIL_MAX_ATTEMPTS
+    ]
+
+
+def send_pending_notifications(workers: int = EMAIL_CONNECTIONS, progress=None, limit: int | None = None) -> dict:
+    """Email every pending tribute (see pending_notification_entries), then record them all in one write."""
+    return deliver_publish_emails(pending_notification_entries(load_data())[:limit], workers, progress)
+
+
+# ----------------------------
+# Background jobs
+# ----------------------------
+
+class BackgroundJob:
+    """One queued unit of work; `fn(job)` runs on the worker thread."""
 
-    tribute_web_path = get_entry_web_base(entry)
-    image_filename = (entry.get("image_filename") or "").strip()
-    is_placeholder_image = (
-        (not image_filename)
-        or image_filename == "blank_memorial_loving_memory.png"
-        or image_filename == f"{slug}.png"
-        or image_filename.endswith("-memorial-stone.png")
-        or image_filename.endswith("-memorial-stone.webp")
-    )
-    if image_filename and not is_placeholder_image:
-        og_image_abs = f"{SITE_DOMAIN}{tribute_web_path}{image_filename}"
-    else:
-        og_image_abs = f"{SITE_DOMAIN}/pet-tributes/assets/blank_memorial_loving_memory.png"
+    def __init__(self, name: str, fn, key=None, on_done=None, on_error=None, cancellable: bool = False):
+        self.name = name
+        self.fn = fn
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancellable = cancellable
+        self.events = None
+        self._cancel = threading.Event()
 
-    page_url = f"{SITE_DOMAIN}{tribute_web_path}"
-    tribute_html = build_tribute_html(
-        pet_name=entry.get("pet_name", ""),
-        first_name=entry.get("first_name", ""),
-        state=entry.get("state", ""),
-        breed=entry.get("breed", ""),
-        pet_type=entry.get("pet_type", ""),
-        years_pretty=entry.get("years_pretty", ""),
-        excerpt=entry.get("excerpt", ""),
-        page_url=page_url,
-        tribute_web_path=tribute_web_path,
-        og_image_abs=og_image_abs,
-        user_uploaded_image=not is_placeholder_image,
-        second_image_filename=entry.get("image2_filename", ""),
-        publish_date_iso=(entry.get("published_iso") or datetime.now().isoformat(timespec="seconds")),
-        tribute_message_html=tribute_message_html,
-    )
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
 
-    with open(index_path, "w", encoding="utf-8") as f:
-        f.write(tribute_html)
+    def cancel(self):
+        self._cancel.set()
 
+    def progress(self, message: str):
+        """Report a step to the UI; raises JobCancelled once cancel() was called."""
+        if self.cancellable and self.cancelled:
+            raise JobCancelled(f"{self.name} cancelled.")
+        if self.events is not None:
+            self.events.put(("progress", self, message))
 
-def tribute_message_html_to_text(message_html: str) -> str:
-    """Convert stored tribute message HTML back to plain editable text with paragraph spacing."""
-    source = message_html or ""
-    paragraph_matches = re.findall(r"<p[^>]*>(.*?)</p>", source, flags=re.S | re.I)
-    if paragraph_matches:
-        parts = []
-        for p in paragraph_matches:
-            plain = re.sub(r"<[^>]+>", "", p)
-            plain = html.unescape(plain).strip()
-            if plain:
-                parts.append(plain)
-        if parts:
-            return "\n\n".join(parts)
 
-    fallback = re.sub(r"<[^>]+>", " ", source)
-    fallback = html.unescape(fallback)
-    fallback = re.sub(r"\s+", " ", fallback).strip()
-    return fallback
+class BackgroundJobs:
+    """
+    A single worker thread that runs jobs in submission order, so data.json
+    and site writes never overlap. Results, errors and progress come back as
+    events that the Tk side drains with root.after; callbacks therefore run
+    on the main thread and may touch widgets.
 
+    Jobs submitted with the same `key` coalesce: while one is still queued,
+    further requests return that job instead of adding another run.
+    """
 
-def escape_html(s: str) -> str:
-    return (s or "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    POLL_MS = 100
 
+    def __init__(self, root, on_status=None, on_error=None):
+        self.root = root
+        self.on_status = on_status
+        self.on_error = on_error
+        self.current = None
+        self._queue = queue.Queue()
+        self._events = queue.Queue()
+        self._queued_by_key = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="tribute-jobs", daemon=True)
+        self._worker.start()
+        self.root.after(self.POLL_MS, self._poll)
+
+    def submit(self, name: str, fn, key=None, on_done=None, on_error=None, cancellable: bool = False) -> BackgroundJob:
+        with self._lock:
+            if key is not None and key in self._queued_by_key:
+                return self._queued_by_key[key]
+            job = BackgroundJob(name, fn, key, on_done, on_error, cancellable)
+            job.events = self._events
+            if key is not None:
+                self._queued_by_key[key] = job
+            self._pending += 1
+        self._queue.put(job)
+        return job
+
+    def busy(self) -> bool:
+        with self._lock:
+            return self._pending > 0
+
+    def cancel_current(self):
+        job = self.current
+        if job is not None and job.cancellable:
+            job.cancel()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                if self._queued_by_key.get(job.key) is job:
+                    # From here on, a new request with this key queues a fresh run.
+                    del self._queued_by_key[job.key]
+            self.current = job
+            self._events.put(("progress", job, f"{job.name}…"))
+            try:
+                if job.cancellable and job.cancelled:
+                    raise JobCancelled(f"{job.name} cancelled.")
+                self._events.put(("done", job, job.fn(job)))
+            except BaseException as e:
+                self._events.put(("error", job, e))
+            finally:
+                self.current = None
+
+    def _poll(self):
+        try:
+            while True:
+                kind, job, value = self._events.get_nowait()
+                if kind == "progress":
+                    if self.on_status:
+                        self.on_status(job, value)
+                    continue
+                with self._lock:
+                    self._pending -= 1
+                    idle = self._pending == 0
+                if idle and self.on_status:
+                    self.on_status(None, "Ready")
+                callback = job.on_done if kind == "done" else (job.on_error or self.on_error)
+                if callback:
+                    callback(value)
+        except queue.Empty:
+            pass
+        finally:
+            self.root.after(self.POLL_MS, self._poll)
 
-def escape_json(s: str) -> str:
-    return (s or "").replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
 
+# ----------------------------
+# Tribute table model
+# ----------------------------
 
-def escape_url(s: str) -> str:
-    # very small helper for pin description
-    from urllib.parse import quote
-    return quote(s or "")
+class TributeTableModel:
+    """
+    The Tribute Manager rows keyed by slug. reload() reports which rows
+    changed so the Treeview only touches those; filtering, sorting and paging
+    work on the in-memory rows without re-reading the tribute store.
+    """
 
+    COLUMNS = ("slug", "pet_name", "pet_type", "published")
 
-def relative_filename_from_url(url: str) -> str:
-    # If og_image_abs is inside the same folder, we want <filename>.webp
-    # If placeholder absolute url, keep it absolute.
-    if url.startswith(SITE_DOMAIN + "/pet-tributes/"):
-        # last segment
-        return url.split("/")[-1]
-    return url
+    def __init__(self, page_size: int = TRIBUTE_TABLE_PAGE_SIZE):
+        self.page_size = max(1, page_size)
+        self.rows = {}
+        self.order = []
+        self.filter_text = ""
+        self.pet_type = ""
+        self.sort_column = ""  # "" keeps data.json order
+        self.sort_descending = False
+        self.page = 0
+        self._search_keys = {}
+        self._view = None
+
+    @staticmethod
+    def row_for(entry: dict) -> tuple:
+        return (
+            entry.get("slug", ""),
+            entry.get("pet_name", ""),
+            (entry.get("pet_type") or "").strip(),
+            entry.get("published_iso", entry.get("published_date", "")),
+        )
+
+    def reload(self, entries: list[dict]) -> set[str]:
+        """Replace the rows; returns the slugs that were added, removed or changed."""
+        rows = {}
+        order = []
+        for entry in entries:
+            slug = entry.get("slug", "")
+            if slug and slug not in rows:
+                rows[slug] = self.row_for(entry)
+                order.append(slug)
+        changed = {slug for slug in rows.keys() | self.rows.keys() if rows.get(slug) != self.rows.get(slug)}
+        if changed or order != self.order:
+            self._view = None
+            self._search_keys = {slug: f"{slug} {row[1]}".lower() for slug, row in rows.items()}
+        self.rows, self.order = rows, order
+        self.page = min(self.page, self.page_count() - 1)
+        return changed
+
+    def pet_types(self) -> list[str]:
+        return sorted({row[2] for row in self.rows.values() if row[2]}, key=str.lower)
+
+    def set_filter(self, text: str = "", pet_type: str = ""):
+        text, pet_type = text.strip().lower(), pet_type.strip().lower()
+        if (text, pet_type) != (self.filter_text, self.pet_type):
+            self.filter_text, self.pet_type = text, pet_type
+            self._view = None
+            self.page = 0
+
+    def toggle_sort(self, column: str):
+        """Sort by column ascending, or flip the direction when it is already the sort column."""
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column, self.sort_descending = column, False
+        self._view = None
+
+    def view(self) -> list[str]:
+        """Slugs that match the filter, in display order."""
+        if self._view is None:
+            slugs = self.order
+            if self.pet_type:
+                slugs = [slug for slug in slugs if self.rows[slug][2].lower() == self.pet_type]
+            if self.filter_text:
+                slugs = [slug for slug in slugs if self.filter_text in self._search_keys[slug]]
+            if self.sort_column:
+                col = self.COLUMNS.index(self.sort_column)
+                slugs = sorted(slugs, key=lambda slug: self.rows[slug][col].lower(), reverse=self.sort_descending)
+            self._view = list(slugs)
+        return self._view
+
+    def page_count(self) -> int:
+        return max(1, math.ceil(len(self.view()) / self.page_size))
+
+    def set_page(self, page: int):
+        self.page = max(0, min(page, self.page_count() - 1))
+
+    def page_slugs(self) -> list[str]:
+        start = self.page * self.page_size
+        return self.view()[start:start + self.page_size]
 
 
 # ----------------------------
@@ -1303,21 +3986,35 @@ class TributePublisherApp:
             next_widget = ordered[(i + 1) % len(ordered)]
             self._bind_tab_navigation(widget, next_widget, prev_widget)
 
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: "tk.Tk"):
         self.root = root
         self.root.title("Melton Memorials — Tribute Publisher")
         self.root.geometry("1380x920")
         self.root.minsize(1220, 760)
         self.last_tribute_url = ""
+        self.last_slug = ""
         self.last_email = ""
         self.last_first_name = ""
 
         self.image_path = tk.StringVar(value="")
         self.image2_path = tk.StringVar(value="")
 
+        # Publishing, rebuilds and email run on a worker thread; this is what the archives were last built from.
+        self.archive_entries = load_data()
+        self.jobs = BackgroundJobs(root, on_status=self.show_job_status, on_error=self.show_job_error)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         style = ttk.Style()
         style.configure("TributeNotebook.TNotebook.Tab", padding=(24, 10))
 
+        # Packed before the notebook so it stays visible when the window shrinks.
+        status_row = ttk.Frame(root)
+        status_row.pack(side="bottom", fill="x", padx=10, pady=(0, 6))
+        self.job_status = tk.StringVar(value="Ready")
+        ttk.Label(status_row, textvariable=self.job_status, anchor="w").pack(side="left", fill="x", expand=True)
+        self.btn_cancel_job = ttk.Button(status_row, text="Cancel", command=self.jobs.cancel_current, state="disabled")
+        self.btn_cancel_job.pack(side="right")
+
         # notebook + tabs
         notebook = ttk.Notebook(root, style="TributeNotebook.TNotebook")
         notebook.pack(fill="both", expand=True)
@@ -1459,7 +4156,22 @@ class TributePublisherApp:
 
         # manager tab layout
         self.checked_slugs = set()
-        columns = ("selected", "slug", "pet_name", "published")
+        self.tribute_table = TributeTableModel()
+        self._filter_after_id = None
+
+        filter_row = ttk.Frame(manager_frame)
+        filter_row.pack(fill="x", padx=10, pady=(10, 0))
+        ttk.Label(filter_row, text="Search").pack(side="left")
+        self.table_filter = tk.StringVar(value="")
+        self.table_filter.trace_add("write", lambda *_: self.schedule_table_filter())
+        ttk.Entry(filter_row, textvariable=self.table_filter, width=36).pack(side="left", padx=(6, 16))
+        ttk.Label(filter_row, text="Pet Type").pack(side="left")
+        self.table_pet_type = tk.StringVar(value="All")
+        self.pet_type_filter = ttk.Combobox(filter_row, textvariable=self.table_pet_type, values=["All"], state="readonly", width=18)
+        self.pet_type_filter.pack(side="left", padx=(6, 0))
+        self.pet_type_filter.bind("<<ComboboxSelected>>", lambda _event: self.apply_table_filter())
+
+        columns = ("selected",) + TributeTableModel.COLUMNS
         self.tribute_tree = ttk.Treeview(
             manager_frame,
             columns=columns,
@@ -1467,24 +4179,35 @@ class TributePublisherApp:
             selectmode="browse",
         )
 
+        self.table_headings = {"slug": "Slug", "pet_name": "Pet Name", "pet_type": "Pet Type", "published": "Published"}
         self.tribute_tree.heading("selected", text="✓")
-        self.tribute_tree.heading("slug", text="Slug")
-        self.tribute_tree.heading("pet_name", text="Pet Name")
-        self.tribute_tree.heading("published", text="Published")
+        for column, text in self.table_headings.items():
+            self.tribute_tree.heading(column, text=text, command=lambda c=column: self.sort_tribute_table(c))
 
         self.tribute_tree.column("selected", width=44, anchor="center", stretch=False)
         self.tribute_tree.column("slug", width=300, anchor="w")
         self.tribute_tree.column("pet_name", width=220, anchor="w")
+        self.tribute_tree.column("pet_type", width=120, anchor="w")
         self.tribute_tree.column("published", width=120, anchor="w")
         self.tribute_tree.pack(fill="both", expand=True, padx=10, pady=10)
         self.tribute_tree.bind("<Button-1>", self.on_tree_click)
 
+        paging_row = ttk.Frame(manager_frame)
+        paging_row.pack(fill="x", padx=10, pady=(0, 6))
+        self.btn_prev_page = ttk.Button(paging_row, text="◀ Prev", command=lambda: self.show_table_page(-1))
+        self.btn_prev_page.pack(side="left")
+        self.btn_next_page = ttk.Button(paging_row, text="Next ▶", command=lambda: self.show_table_page(1))
+        self.btn_next_page.pack(side="left", padx=(8, 0))
+        self.table_position = tk.StringVar(value="")
+        ttk.Label(paging_row, textvariable=self.table_position).pack(side="left", padx=(12, 0))
+
         actions_row = ttk.Frame(manager_frame)
         actions_row.pack(fill="x", padx=10, pady=(0, 10))
 
         ttk.Button(actions_row, text="Select All", command=self.select_all_tributes).pack(side="left")
         ttk.Button(actions_row, text="Clear All", command=self.clear_checked_tributes).pack(side="left", padx=(8, 0))
         ttk.Button(actions_row, text="Edit Selected", command=self.edit_selected_tribute).pack(side="left", padx=(8, 0))
+        ttk.Button(actions_row, text="Send Pending Emails", command=self.send_pending_emails).pack(side="left", padx=(8, 0))
         ttk.Button(actions_row, text="Delete Selected Tribute(s)", command=self.delete_selected_tribute).pack(side="right")
 
         self.refresh_tribute_table()
@@ -1492,54 +4215,118 @@ class TributePublisherApp:
     def load_tributes(self) -> list[dict]:
         return load_data()
 
-    def on_tree_click(self, event):
-        col = self.tribute_tree.identify_column(event.x)
-        row = self.tribute_tree.identify_row(event.y)
-        if col != "#1" or not row:
+    def show_job_status(self, job, message: str):
+        self.job_status.set(message)
+        self.btn_cancel_job.config(state="normal" if job is not None and job.cancellable else "disabled")
+
+    def show_job_error(self, error: BaseException):
+        if isinstance(error, JobCancelled):
+            self.job_status.set(str(error))
+        elif isinstance(error, TributeError):
+            messagebox.showerror(error.title, str(error))
+        else:
+            messagebox.showerror("Error", str(error))
+
+    def request_archive_rebuild(self):
+        """Queue an incremental archive/sitemap rebuild; requests made before it starts share one run."""
+        self.jobs.submit("Rebuilding archives", self._rebuild_archives, key="archives")
+
+    def _rebuild_archives(self, job):
+        # Worker thread. Diffing against the last built state also covers every change coalesced into this run.
+        entries = load_data()
+        rebuild_changed_archives(self.archive_entries, entries)
+        self.archive_entries = entries
+
+    def on_close(self):
+        if self.jobs.busy() and not messagebox.askyesno(
+            "Work in Progress", "A publish or rebuild is still running. Quit anyway?"
+        ):
             return
+        self.root.destroy()
 
-        values = self.tribute_tree.item(row, "values")
-        if not values or not values[1]:
+    def on_tree_click(self, event):
+        col = self.tribute_tree.identify_column(event.x)
+        # Rows use the slug as their item id.
+        slug = self.tribute_tree.identify_row(event.y)
+        if col != "#1" or not slug:
             return
 
-        slug = values[1]
         if slug in self.checked_slugs:
             self.checked_slugs.remove(slug)
         else:
             self.checked_slugs.add(slug)
 
-        self.refresh_tribute_table()
+        self.tribute_tree.item(slug, values=self.tribute_row_values(slug))
         return "break"
 
-    def refresh_tribute_table(self):
-        for row in self.tribute_tree.get_children():
-            self.tribute_tree.delete(row)
+    def tribute_row_values(self, slug: str) -> tuple:
+        return ("☑" if slug in self.checked_slugs else "☐",) + self.tribute_table.rows[slug]
 
-        tributes = self.load_tributes()
-        valid_slugs = {t.get("slug", "") for t in tributes if t.get("slug")}
-        self.checked_slugs = {s for s in self.checked_slugs if s in valid_slugs}
-        for tribute in tributes:
-            slug = tribute.get("slug", "")
-            is_checked = slug in self.checked_slugs
-            self.tribute_tree.insert(
-                "",
-                "end",
-                values=(
-                    "☑" if is_checked else "☐",
-                    slug,
-                    tribute.get("pet_name", ""),
-                    tribute.get("published_iso", tribute.get("published_date", "")),
-                ),
-            )
+    def refresh_tribute_table(self):
+        """Re-read the tribute store and update only the rows that changed."""
+        changed = self.tribute_table.reload(self.load_tributes())
+        self.checked_slugs &= self.tribute_table.rows.keys()
+        self.pet_type_filter.config(values=["All"] + self.tribute_table.pet_types())
+        self.render_tribute_page(changed)
+
+    def render_tribute_page(self, changed_slugs=None):
+        """
+        Show the model's current page. When the same slugs are already on
+        screen only `changed_slugs` are updated (all visible rows if None).
+        """
+        tree = self.tribute_tree
+        slugs = self.tribute_table.page_slugs()
+        shown = tree.get_children()
+        if list(shown) == slugs:
+            for slug in (slugs if changed_slugs is None else changed_slugs):
+                if tree.exists(slug):
+                    tree.item(slug, values=self.tribute_row_values(slug))
+        else:
+            if shown:
+                tree.delete(*shown)
+            for slug in slugs:
+                tree.insert("", "end", iid=slug, values=self.tribute_row_values(slug))
+
+        table = self.tribute_table
+        total = len(table.view())
+        first = table.page * table.page_size
+        self.table_position.set(
+            f"{first + 1:,}–{first + len(slugs):,} of {total:,} tribute(s)" if total else "No matching tributes"
+        )
+        self.btn_prev_page.config(state="normal" if table.page > 0 else "disabled")
+        self.btn_next_page.config(state="normal" if table.page < table.page_count() - 1 else "disabled")
+        for column, text in self.table_headings.items():
+            arrow = (" ▼" if table.sort_descending else " ▲") if column == table.sort_column else ""
+            tree.heading(column, text=text + arrow)
+
+    def show_table_page(self, step: int):
+        self.tribute_table.set_page(self.tribute_table.page + step)
+        self.render_tribute_page()
+
+    def sort_tribute_table(self, column: str):
+        self.tribute_table.toggle_sort(column)
+        self.render_tribute_page()
+
+    def schedule_table_filter(self):
+        # Wait for a pause in typing instead of filtering on every keystroke.
+        if self._filter_after_id is not None:
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(200, self.apply_table_filter)
+
+    def apply_table_filter(self):
+        self._filter_after_id = None
+        pet_type = self.table_pet_type.get()
+        self.tribute_table.set_filter(self.table_filter.get(), "" if pet_type == "All" else pet_type)
+        self.render_tribute_page()
 
     def select_all_tributes(self):
-        tributes = self.load_tributes()
-        self.checked_slugs = {t.get("slug", "") for t in tributes if t.get("slug")}
-        self.refresh_tribute_table()
+        # Everything matching the current filter, on every page.
+        self.checked_slugs |= set(self.tribute_table.view())
+        self.render_tribute_page()
 
     def clear_checked_tributes(self):
         self.checked_slugs.clear()
-        self.refresh_tribute_table()
+        self.render_tribute_page()
 
     def edit_selected_tribute(self):
         slugs = sorted(self.checked_slugs)
@@ -1553,7 +4340,6 @@ class TributePublisherApp:
         if not entry:
             messagebox.showerror("Not Found", f'Could not find tribute "{slug}" in data.json.')
             return
-
         # Load full tribute body text (not just card excerpt) for editing.
         full_tribute_message = ""
         try:
@@ -1561,19 +4347,13 @@ class TributePublisherApp:
             index_path = os.path.join(tribute_folder, "index.html")
             if os.path.exists(index_path):
                 with open(index_path, "r", encoding="utf-8") as f:
-                    existing_html = f.read()
-                msg_match = re.search(
-                    r'<div class="mm-tribute-message(?:\s+mm-tribute-message-centered)?"(?:\s+style="[^"]*")?\s*>\s*(.*?)\s*</div>',
-                    existing_html,
-                    flags=re.S,
-                )
-                if msg_match:
-                    full_tribute_message = tribute_message_html_to_text((msg_match.group(1) or "").strip())
+                    full_tribute_message = tribute_message_html_to_text(extract_tribute_message_html(f.read()))
         except Exception:
             full_tribute_message = ""
         if not full_tribute_message:
             full_tribute_message = (entry.get("excerpt") or "").strip()
         self.last_tribute_url = f"{SITE_DOMAIN}{get_entry_web_base(entry)}"
+        self.last_slug = slug
         self.last_email = (entry.get("email") or "").strip()
         self.last_first_name = (entry.get("first_name") or "").strip()
         self.refresh_email_button_state()
@@ -1703,6 +4483,7 @@ class TributePublisherApp:
         row += 1
 
         def resolve_image_field(field_key: str, output_filename: str, label: str):
+            """(filename, upload to convert or "") for an image field, or None after a validation error."""
             value = image1_display.get().strip() if field_key == "image_filename" else image2_display.get().strip()
             chosen_upload = (selected_uploads.get(field_key) or "").strip()
 
@@ -1712,62 +4493,21 @@ class TributePublisherApp:
                 if not os.path.isfile(chosen_upload):
                     messagebox.showerror("Validation", f"{label} upload not found:\n{chosen_upload}")
                     return None
-                if not ensure_pillow():
-                    messagebox.showerror(
-                        "Pillow not installed",
-                        "Image conversion requires Pillow.\n\nRun:\n  py -m pip install pillow"
-                    )
-                    return None
-                tribute_folder = find_tribute_folder(slug, entry.get("folder", ""))
-                safe_mkdir(tribute_folder)
-                output_path = os.path.join(tribute_folder, output_filename)
-                try:
-                    info = convert_to_webp_normalized(
-                        chosen_upload,
-                        output_path,
-                        max_width=MAX_IMAGE_WIDTH,
-                        quality=WEBP_QUALITY,
-                    )
-                    print(f"[edit-{field_key}] {info}")
-                except Exception as e:
-                    messagebox.showerror("Image conversion failed", f"Could not convert {label}:\n{e}")
-                    return None
-                return output_filename
+                return output_filename, chosen_upload
 
             if not value:
-                return ""
+                return "", ""
 
             # If user selected a local file, convert it and store the normalized tribute filename.
             if os.path.isfile(value):
-                if not ensure_pillow():
-                    messagebox.showerror(
-                        "Pillow not installed",
-                        "Image conversion requires Pillow.\n\nRun:\n  py -m pip install pillow"
-                    )
-                    return None
-
-                tribute_folder = find_tribute_folder(slug, entry.get("folder", ""))
-                safe_mkdir(tribute_folder)
-                output_path = os.path.join(tribute_folder, output_filename)
-                try:
-                    info = convert_to_webp_normalized(
-                        value,
-                        output_path,
-                        max_width=MAX_IMAGE_WIDTH,
-                        quality=WEBP_QUALITY,
-                    )
-                    print(f"[edit-{field_key}] {info}")
-                except Exception as e:
-                    messagebox.showerror("Image conversion failed", f"Could not convert {label}:\n{e}")
-                    return None
-                return output_filename
+                return output_filename, value
 
             looks_like_path = ("/" in value) or ("\\" in value) or bool(re.match(r"^[A-Za-z]:", value))
             if looks_like_path:
                 messagebox.showerror("Validation", f"{label} path not found:\n{value}")
                 return None
 
-            return value
+            return value, ""
 
         def on_save():
             pet_name = widgets["pet_name"].get().strip()
@@ -1779,49 +4519,74 @@ class TributePublisherApp:
                 messagebox.showerror("Validation", "Tribute Message is required.")
                 return
 
-            entry["pet_name"] = pet_name
-            entry["pet_type"] = widgets["pet_type"].get().strip()
-            entry["breed"] = widgets["breed"].get().strip()
-            entry["years_pretty"] = widgets["years_pretty"].get().strip()
-            entry["first_name"] = widgets["first_name"].get().strip()
-            entry["state"] = widgets["state"].get().strip()
-            entry["email"] = widgets["email"].get().strip()
-            entry["email_sent"] = widgets["email_sent_var"].get() is True
-            entry["excerpt"] = summarize_excerpt(strip_markdown_for_excerpt(edited_tribute_message))
-
-            image1_filename = resolve_image_field("image_filename", f"{slug}.webp", "Image 1")
-            if image1_filename is None:
+            edits = {
+                "pet_name": pet_name,
+                "pet_type": widgets["pet_type"].get().strip(),
+                "breed": widgets["breed"].get().strip(),
+                "years_pretty": widgets["years_pretty"].get().strip(),
+                "first_name": widgets["first_name"].get().strip(),
+                "state": widgets["state"].get().strip(),
+                "email": widgets["email"].get().strip(),
+                "excerpt": summarize_excerpt(strip_markdown_for_excerpt(edited_tribute_message)),
+            }
+            # Only an explicit toggle overrides email_sent; an outbox send may have set it since the dialog opened.
+            email_sent = widgets["email_sent_var"].get() is True
+            if email_sent != (entry.get("email_sent") is True):
+                edits["email_sent"] = email_sent
+
+            image1 = resolve_image_field("image_filename", f"{slug}.webp", "Image 1")
+            if image1 is None:
                 return
-            if not image1_filename:
+            if not image1[0]:
                 messagebox.showerror("Validation", "Image Filename is required.")
                 return
 
-            image2_filename = resolve_image_field("image2_filename", f"{slug}-2.webp", "Image 2")
-            if image2_filename is None:
+            image2 = resolve_image_field("image2_filename", f"{slug}-2.webp", "Image 2")
+            if image2 is None:
                 return
 
-            entry["image_filename"] = image1_filename
-            entry["image2_filename"] = image2_filename
-            entry["years_pretty"] = normalize_dates_text(entry.get("years_pretty", ""))
-            self.last_tribute_url = f"{SITE_DOMAIN}{get_entry_web_base(entry)}"
-            self.last_email = entry.get("email", "").strip()
-            self.last_first_name = entry.get("first_name", "").strip()
+            edits["image_filename"] = image1[0]
+            edits["image2_filename"] = image2[0]
+            self.last_tribute_url = f"{SITE_DOMAIN}{get_entry_web_base({**entry, **edits})}"
+            self.last_slug = slug
+            self.last_email = edits["email"]
+            self.last_first_name = edits["first_name"]
             self.refresh_email_button_state()
 
-            save_data(tributes)
-            rebuild_single_tribute_page(entry, tribute_message_override=edited_tribute_message)
-            rebuild_archive_pages(tributes)
-            rebuild_pet_type_archives(tributes)
-            generate_sitemap(tributes)
-            self.refresh_tribute_table()
-            messagebox.showinfo("Saved", f'Updated tribute "{slug}".')
-            dialog.destroy()
+            def save(job):
+                # Other jobs may have changed data.json while the dialog was open: apply the
+                # edits to a fresh load so their publishes, deletes and sends are kept.
+                current = load_data()
+                original_tributes = [dict(t) for t in current]
+                target = next((t for t in current if t.get("slug") == slug), None)
+                if target is None:
+                    raise TributeError("Not Found", f'Tribute "{slug}" was removed while it was being edited.')
+                target.update(edits)
+                convert_replacement_images(target, image1[1], image2[1], progress=job.progress)
+                job.progress("Re-rendering tribute page…")
+                commit_tribute_edit(current, original_tributes, target, edited_tribute_message, rebuild=False)
+
+            def saved(_result):
+                self.refresh_tribute_table()
+                self.request_archive_rebuild()
+                messagebox.showinfo("Saved", f'Updated tribute "{slug}".')
+                if dialog.winfo_exists():
+                    dialog.destroy()
+
+            def failed(error):
+                if save_btn.winfo_exists():
+                    save_btn.config(state="normal")
+                self.show_job_error(error)
+
+            save_btn.config(state="disabled")
+            self.jobs.submit(f'Saving "{slug}"', save, on_done=saved, on_error=failed)
 
         btn_row = ttk.Frame(dialog)
         btn_row.grid(row=row, column=0, columnspan=3, sticky="e", padx=10, pady=(8, 10))
         ttk.Button(btn_row, text="Cancel", command=dialog.destroy).pack(side="right")
         ttk.Button(btn_row, text="Send Publish Email", command=self.send_publish_email).pack(side="right", padx=(0, 8))
-        ttk.Button(btn_row, text="Save Changes", command=on_save).pack(side="right", padx=(0, 8))
+        save_btn = ttk.Button(btn_row, text="Save Changes", command=on_save)
+        save_btn.pack(side="right", padx=(0, 8))
 
     def delete_selected_tribute(self):
         slugs = sorted(self.checked_slugs)
@@ -1836,22 +4601,17 @@ class TributePublisherApp:
         if confirm != "DELETE":
             return
 
-        for slug in slugs:
-            entry = next((t for t in self.load_tributes() if t.get("slug") == slug), {})
-            tribute_folder = find_tribute_folder(slug, entry.get("folder", ""))
-            if os.path.exists(tribute_folder):
-                shutil.rmtree(tribute_folder, ignore_errors=True)
-
-        tributes = self.load_tributes()
-        tributes = [t for t in tributes if t.get("slug") not in slugs]
-        save_data(tributes)
-        rebuild_archive_pages(tributes)
-        rebuild_pet_type_archives(tributes)
-        generate_sitemap(tributes)
-        self.checked_slugs.clear()
-        self.refresh_tribute_table()
+        def deleted(_result):
+            self.checked_slugs.clear()
+            self.refresh_tribute_table()
+            self.request_archive_rebuild()
+            messagebox.showinfo("Deleted", f"Permanently deleted {len(slugs)} tribute(s); the archive is rebuilding.")
 
-        messagebox.showinfo("Deleted", f"Permanently deleted {len(slugs)} tribute(s) and rebuilt archive.")
+        self.jobs.submit(
+            f"Deleting {len(slugs)} tribute(s)",
+            lambda job: delete_tributes(slugs, rebuild=False),
+            on_done=deleted,
+        )
 
     def choose_image(self):
         path = filedialog.askopenfilename(
@@ -1875,88 +4635,69 @@ class TributePublisherApp:
     def clear_image2(self):
         self.image2_path.set("")
 
-    def mark_email_sent_true(self):
-        tribute_url = (getattr(self, "last_tribute_url", "") or "").strip()
-        if not tribute_url:
-            return
-
-        entries = load_data()
-        updated = False
-        for entry in entries:
-            candidate_url = f"{SITE_DOMAIN}{get_entry_web_base(entry)}"
-            if candidate_url == tribute_url:
-                entry["email_sent"] = True
-                updated = True
-                break
-
-        if updated:
-            save_data(entries)
-            self.refresh_tribute_table()
-
     def send_publish_email(self):
         email = (getattr(self, "last_email", "") or "").strip()
-        first_name = (getattr(self, "last_first_name", "") or "there").strip()
-        tribute_url = (getattr(self, "last_tribute_url", "") or "").strip()
+        slug = (getattr(self, "last_slug", "") or "").strip()
 
-        if not email or not tribute_url:
+        if not email or not slug:
             messagebox.showwarning("Cannot send email", "Missing customer email or tribute URL.")
             return
-
-        smtp_server = "mail.privateemail.com"
-        smtp_port = 465
-        sender_email = "rodney@meltonmemorials.com"
-        bcc_email = sender_email  # Internal delivery confirmation copy.
-        password = os.environ.get("MM_EMAIL_PASS")
-
-        if not password:
-            messagebox.showerror("Missing Password", "Environment variable MM_EMAIL_PASS not set.")
+        try:
+            smtp_password()
+        except TributeError as e:
+            messagebox.showerror(e.title, str(e))
             return
 
-        msg = EmailMessage()
-        msg["Subject"] = "Your tribute has been published"
-        msg["From"] = sender_email
-        msg["To"] = email
-
-        msg.set_content(f"""
-Hi {first_name},
-
-Your pet’s tribute has now been published.
-
-View the tribute here:
-{tribute_url}
+        def send(job):
+            queue_publish_emails([slug])
+            return deliver_email_queue(progress=job.progress)
 
-With respect,
-Melton Memorials
-Alma, Arkansas
-""")
+        def sent(report):
+            self.refresh_tribute_table()
+            if slug in report["sent"]:
+                messagebox.showinfo("Success", "Publish email sent successfully.")
+            else:
+                error = report["retrying"].get(slug) or report["gave_up"].get(slug) or "Not sent."
+                messagebox.showerror("Email Failed", f"{error}\n\nThe email stays queued and will be retried.")
 
-        msg.add_alternative(f"""
-<html>
-  <body>
-    <p>Hi {first_name},</p>
-    <p>Your pet’s tribute has now been published.</p>
-    <p><a href="{tribute_url}">Click here to view the tribute</a></p>
-    <p>With respect,<br>
-    Melton Memorials<br>
-    Alma, Arkansas</p>
-  </body>
-</html>
-""", subtype="html")
+        self.jobs.submit(
+            "Sending publish email", send,
+            on_done=sent,
+            on_error=lambda e: messagebox.showerror(getattr(e, "title", "Email Failed"), str(e)),
+        )
 
+    def send_pending_emails(self):
+        pending = pending_notification_entries(self.load_tributes())
+        if not pending:
+            messagebox.showinfo("Nothing to Send", "Every tribute with an email address has already been notified.")
+            return
         try:
-            context = ssl.create_default_context()
-            with smtplib.SMTP_SSL(smtp_server, smtp_port, context=context) as server:
-                server.login(sender_email, password)
-                recipients = [email]
-                if bcc_email and bcc_email.lower() != email.lower():
-                    recipients.append(bcc_email)
-                server.send_message(msg, to_addrs=recipients)
-
-            messagebox.showinfo("Success", "Publish email sent successfully.")
-            self.mark_email_sent_true()
+            smtp_password()
+        except TributeError as e:
+            messagebox.showerror(e.title, str(e))
+            return
+        if not messagebox.askyesno(
+            "Send Pending Emails",
+            f"Send the publish email to {len(pending)} tribute(s) that have not been notified yet?",
+        ):
+            return
 
-        except Exception as e:
-            messagebox.showerror("Email Failed", str(e))
+        def sent(report):
+            self.refresh_tribute_table()
+            failed = {**report["retrying"], **report["gave_up"]}
+            summary = f"Sent {len(report['sent'])} publish email(s)."
+            if failed:
+                details = "\n".join(f"{slug}: {error}" for slug, error in list(failed.items())[:10])
+                summary += f"\n\n{len(failed)} failed and will be retried from the outbox:\n{details}"
+            messagebox.showinfo("Pending Emails", summary)
+
+        self.jobs.submit(
+            "Sending pending emails",
+            lambda job: send_pending_notifications(progress=job.progress),
+            on_done=sent,
+            on_error=lambda e: messagebox.showerror(getattr(e, "title", "Email Failed"), str(e)),
+            cancellable=True,
+        )
 
     def refresh_email_button_state(self):
         email = (getattr(self, "last_email", "") or "").strip()
@@ -1966,225 +4707,394 @@ Alma, Arkansas
             self.open_email_btn.config(state=state)
 
     def generate(self):
-        pet_name = self.pet_name.get().strip()
-        pet_type = self.pet_type.get().strip()
-        first_name = self.first_name.get().strip()
-        state = self.state.get().strip()
-        email = self.email.get().strip()
-        email_sent = self.email_sent_var.get() is True
-        breed = self.breed.get().strip()
-        years_raw = self.years.get().strip()
-        tribute_msg = self.message.get("1.0", "end").strip()
-
-        if not pet_name or not tribute_msg:
-            messagebox.showerror("Missing required fields", "Pet Name and Tribute Message are required.")
-            return
+        fields = {
+            "pet_name": self.pet_name.get().strip(),
+            "pet_type": self.pet_type.get().strip(),
+            "first_name": self.first_name.get().strip(),
+            "state": self.state.get().strip(),
+            "email": self.email.get().strip(),
+            "email_sent": self.email_sent_var.get() is True,
+            "breed": self.breed.get().strip(),
+            "years": self.years.get().strip(),
+            "message": self.message.get("1.0", "end").strip(),
+        }
 
-        years_pretty = normalize_dates_text(years_raw)
-
-        # Slug rules (new tributes only): pet-name + optional type + optional breed.
-        # If a slug already exists in data.json, append -2, -3, etc.
-        pet_slug = slugify(pet_name)
-        type_slug = slugify(pet_type)
-        breed_slug = slugify(breed)
-        slug_parts = [p for p in [pet_slug, type_slug] if p]
-        if breed_slug:
-            slug_parts.append(breed_slug)
-        base_slug = "-".join(slug_parts).strip("-")
-        if not base_slug:
-            base_slug = pet_slug
-
-        existing_entries = load_data()
-        existing_slugs = {item.get("slug", "") for item in existing_entries if item.get("slug")}
-        folder_slug = base_slug
-        counter = 2
-        while folder_slug in existing_slugs:
-            folder_slug = f"{base_slug}-{counter}"
-            counter += 1
+        image_path = self.image_path.get().strip()
+        image2_path = self.image2_path.get().strip()
 
-        tribute_folder = os.path.join(MEMORIALS_DIR, folder_slug)
-        safe_mkdir(tribute_folder)
-        tribute_web_path = f"/pet-tributes/memorials/{folder_slug}/"
+        def publish(job):
+            return publish_tribute(fields, image_path=image_path, image2_path=image2_path, rebuild=False, progress=job.progress)
 
-        # Decide image output name (inside folder)
-        img_abs_url = ""
-        img_filename = None
-        img2_filename = ""
+        def published(entry):
+            self.btn_generate.config(state="normal")
+            self.refresh_tribute_table()
+            self.request_archive_rebuild()
 
-        chosen_image = self.image_path.get().strip()
-        # Determine if user uploaded image 1
-        user_uploaded_image = bool(chosen_image)
-        if chosen_image:
-            if not ensure_pillow():
-                messagebox.showerror(
-                    "Pillow not installed",
-                    "Image conversion requires Pillow.\n\nRun:\n  py -m pip install pillow"
-                )
-                return
+            tribute_folder = os.path.join(MEMORIALS_DIR, entry["slug"])
+            self.last_tribute_url = f"{SITE_DOMAIN}{get_entry_web_base(entry)}"
+            self.last_slug = entry["slug"]
+            self.last_email = entry["email"]
+            self.last_first_name = entry["first_name"]
+            self.refresh_email_button_state()
+            messagebox.showinfo(
+                "Tribute Created Successfully",
+                f"Created locally at:\n\n"
+                f"{tribute_folder}\n\n"
+                f"To publish live:\n"
+                f"Upload the contents of:\n"
+                f"{TRIBUTES_DIR}\n"
+                f"to your server's /pet-tributes/ directory."
+            )
 
-            img_filename = f"{folder_slug}.webp"
-            img_dest = os.path.join(tribute_folder, img_filename)
+        def failed(error):
+            self.btn_generate.config(state="normal")
+            self.show_job_error(error)
 
-            try:
-                info = convert_to_webp_normalized(
-                    chosen_image,
-                    img_dest,
-                    max_width=MAX_IMAGE_WIDTH,
-                    quality=WEBP_QUALITY,
-                )
-                print(f"[image] {info}")
-            except Exception as e:
-                messagebox.showerror("Image conversion failed", f"Could not convert image to .webp:\n{e}")
-                return
+        # Disabled until this publish finishes so a double click cannot create the tribute twice.
+        self.btn_generate.config(state="disabled")
+        self.jobs.submit(
+            f'Publishing "{fields["pet_name"] or "tribute"}"', publish,
+            on_done=published, on_error=failed, cancellable=True,
+        )
 
-            img_abs_url = f"{SITE_DOMAIN}{tribute_web_path}{img_filename}"
-        else:
-            # No upload provided for image 1: copy placeholder into tribute folder and name by slug.
-            if not os.path.exists(PLACEHOLDER_IMAGE_FILE):
-                messagebox.showerror(
-                    "Placeholder missing",
-                    f"Default image not found:\n{PLACEHOLDER_IMAGE_FILE}"
-                )
-                return
-            img_filename = f"{folder_slug}.webp"
-            img_dest = os.path.join(tribute_folder, img_filename)
-            try:
-                process_placeholder_image(PLACEHOLDER_IMAGE_FILE, img_dest)
-            except Exception as e:
-                messagebox.showerror("Placeholder processing failed", f"Could not prepare fallback image:\n{e}")
-                return
-            img_abs_url = f"{SITE_DOMAIN}{tribute_web_path}{img_filename}"
 
-        chosen_image2 = self.image2_path.get().strip()
-        if chosen_image2:
-            if not ensure_pillow():
-                messagebox.showerror(
-                    "Pillow not installed",
-                    "Image conversion requires Pillow.\n\nRun:\n  py -m pip install pillow"
-                )
-                return
-            img2_filename = f"{folder_slug}-2.webp"
-            img2_dest = os.path.join(tribute_folder, img2_filename)
-            try:
-                info2 = convert_to_webp_normalized(
-                    chosen_image2,
-                    img2_dest,
-                    max_width=MAX_IMAGE_WIDTH,
-                    quality=WEBP_QUALITY,
-                )
-                print(f"[image2] {info2}")
-            except Exception as e:
-                messagebox.showerror("Image 2 conversion failed", f"Could not convert second image to .webp:\n{e}")
-                return
+# ----------------------------
+# Command line
+# ----------------------------
+
+def load_tribute_records(path: str) -> list[dict]:
+    """Read publish records from a .json (object or list of objects) or .csv file."""
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            return [dict(row) for row in csv.DictReader(f)]
+    with open(path, "r", encoding="utf-8-sig") as f:
+        raw = json.load(f)
+    return raw if isinstance(raw, list) else [raw]
+
+
+def resolve_record_path(value: str, base_dir: str) -> str:
+    value = (value or "").strip()
+    if not value:
+        return ""
+    return value if os.path.isabs(value) else os.path.join(base_dir, value)
 
-        # Build tribute page values
-        publish_date_iso = datetime.now().isoformat(timespec="seconds")
-        page_url = f"{SITE_DOMAIN}{tribute_web_path}"
-        excerpt = summarize_excerpt(strip_markdown_for_excerpt(tribute_msg))
-
-        # Convert limited markdown into safe HTML.
-        tribute_message_html = parse_safe_markdown(tribute_msg)
-
-        tribute_html = build_tribute_html(
-            pet_name=pet_name,
-            first_name=first_name,
-            state=state,
-            breed=breed,
-            pet_type=pet_type,
-            years_pretty=years_pretty,
-            excerpt=excerpt,
-            page_url=page_url,
-            tribute_web_path=tribute_web_path,
-            og_image_abs=img_abs_url,
-            user_uploaded_image=user_uploaded_image,
-            second_image_filename=img2_filename,
-            publish_date_iso=publish_date_iso,
-            tribute_message_html=tribute_message_html,
-        )
 
-        if tribute_html is None:
-            raise RuntimeError("build_tribute_html returned None")
+def parse_field_assignments(pairs: list[str]) -> dict:
+    changes = {}
+    for pair in pairs or []:
+        if "=" not in pair:
+            raise TributeError("Validation", f'Expected FIELD=VALUE, got "{pair}".')
+        key, value = pair.split("=", 1)
+        changes[key.strip()] = value
+    return changes
 
-        if not isinstance(tribute_html, str):
-            raise RuntimeError(f"build_tribute_html returned unexpected type: {type(tribute_html)}")
 
-        index_path = os.path.join(tribute_folder, "index.html")
+def cli_rebuild(args) -> int:
+    entries = load_data()
+    if args.archives_only:
+        rebuild_all_archives(entries, jobs=args.jobs)
+    else:
+        rebuild_full_site(entries, jobs=args.jobs)
+    print(f"Rebuilt {len(entries)} tribute(s) with {args.jobs} job(s).")
+    return 0
 
+
+def cli_publish(args) -> int:
+    base_dir = os.path.dirname(os.path.abspath(args.record))
+    records = load_tribute_records(args.record)
+    before = load_data()
+    failed = 0
+    for number, record in enumerate(records, start=1):
         try:
-            with open(index_path, "w", encoding="utf-8") as f:
-                f.write(tribute_html)
-        except Exception as e:
-            raise RuntimeError(f"Failed to write index.html: {e}")
+            entry = publish_tribute(
+                record,
+                image_path=args.image or resolve_record_path(record.get("image", ""), base_dir),
+                image2_path=args.image2 or resolve_record_path(record.get("image2", ""), base_dir),
+                rebuild=False,
+            )
+        except TributeError as e:
+            failed += 1
+            label = f'record {number} ({record.get("pet_name") or "?"})'
+            print(f"FAILED {label}: {e.title}: {e}", file=sys.stderr)
+            continue
+        print(f"Published {SITE_DOMAIN}{get_entry_web_base(entry)}")
+    # Records published before a failure are already in data.json; list them in the archives.
+    rebuild_changed_archives(before, load_data())
+    return 1 if failed else 0
+
+
+def cli_import(args) -> int:
+    report = import_tribute_batch(args.path, jobs=args.jobs)
+    failed = [item for item in report if item["error"]]
+    for item in report:
+        label = f'row {item["row"]} ({item["pet_name"] or "?"})'
+        if item["error"]:
+            print(f"FAILED {label}: {item['error']}", file=sys.stderr)
+        else:
+            print(f"OK     {label}: {SITE_DOMAIN}/pet-tributes/memorials/{item['slug']}/")
+    print(f"Imported {len(report) - len(failed)} of {len(report)} tribute(s).")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if failed else 0
 
-        if not os.path.exists(index_path):
-            raise RuntimeError("index.html was not created after write attempt")
 
-        # ---- JSON-backed archive update + rebuild ----
-        entries = existing_entries
+def cli_variants(args) -> int:
+    """Backfill srcset variants/dimensions for existing tributes and re-render the site."""
+    entries = load_data()
+    tasks = []
+    for entry in entries:
+        tribute_folder = find_tribute_folder(entry.get("slug", ""), entry.get("folder", ""))
+        for prefix in ("image", "image2"):
+            filename = (entry.get(f"{prefix}_filename") or "").strip()
+            full_path = os.path.join(tribute_folder, filename) if filename else ""
+            if full_path and filename.endswith(".webp") and os.path.isfile(full_path):
+                tasks.append(("variants", full_path, full_path))
+    failed = 0
+    for (_, full_path, _), (ok, info) in zip(tasks, render_in_pool(_convert_image_task, tasks, args.jobs)):
+        if not ok:
+            failed += 1
+            print(f"FAILED {full_path}: {info}", file=sys.stderr)
+    for entry in entries:
+        refresh_entry_image_meta(entry)
+    save_data(entries)
+    rebuild_full_site(entries, jobs=args.jobs)
+    print(f"Updated image variants for {len(entries)} tribute(s).")
+    return 1 if failed else 0
+
+
+def cli_edit(args) -> int:
+    message = args.message or ""
+    if args.message_file:
+        with open(args.message_file, "r", encoding="utf-8-sig") as f:
+            message = f.read()
+    entry = update_tribute(
+        args.slug,
+        parse_field_assignments(args.set),
+        tribute_message=message,
+        image_path=args.image or "",
+        image2_path=args.image2 or "",
+    )
+    print(f'Updated tribute "{entry["slug"]}".')
+    return 0
 
-        published_iso = datetime.now().isoformat(timespec="seconds")
 
-        # if user didn't pick an image, we still create a card, but image_filename must exist for cards
-        # (recommend: require image for now, OR set to placeholder filename)
-        image_filename = img_filename if img_filename else ""
+def cli_delete(args) -> int:
+    deleted = delete_tributes(args.slugs)
+    missing = sorted(set(args.slugs) - set(deleted))
+    print(f"Permanently deleted {len(deleted)} tribute(s) and rebuilt archive.")
+    if missing:
+        print(f"Not found in data.json: {', '.join(missing)}", file=sys.stderr)
+    return 0
 
-        entry = {
-            "slug": folder_slug,
-            "pet_name": pet_name,
-            "breed": breed,
-            "pet_type": pet_type,
-            "folder": "memorials",
-            "years_pretty": years_pretty,
-            "excerpt": excerpt,
-            "first_name": first_name,
-            "state": state,
-            "email": email,
-            "published_iso": published_iso,
-            "image_filename": image_filename,
-            "image2_filename": img2_filename,
-            "featured": False,
-            "email_sent": email_sent,
-        }
 
-        # prevent duplicates by slug
-        entries = [e for e in entries if e.get("slug") != folder_slug]
-        entries.append(entry)
+def cli_sitemap(args) -> int:
+    generate_sitemap(load_data())
+    flush_build_manifest()
+    print(f"Wrote {os.path.join(TRIBUTES_DIR, 'sitemap.xml')}")
+    return 0
 
-        save_data(entries)
-        rebuild_archive_pages(entries)
-        rebuild_pet_type_archives(entries)
-        generate_sitemap(entries)
-        self.refresh_tribute_table()
 
-        self.last_tribute_url = page_url
-        self.last_email = email
-        self.last_first_name = first_name
-        self.refresh_email_button_state()
-        messagebox.showinfo(
-            "Tribute Created Successfully",
-            f"Created locally at:\n\n"
-            f"{tribute_folder}\n\n"
-            f"To publish live:\n"
-            f"Upload the contents of:\n"
-            f"{TRIBUTES_DIR}\n"
-            f"to your server's /pet-tributes/ directory."
-        )
+def cli_prune(args) -> int:
+    removed_slugs = sync_entries_with_disk(jobs=args.jobs)
+    print(f"Removed {len(removed_slugs)} missing tribute(s){': ' + ', '.join(removed_slugs) if removed_slugs else '.'}")
+    return 0
 
 
-def main():
-    safe_mkdir(TRIBUTES_DIR)
-    entries = load_data()
-    synced_entries, removed_slugs = prune_entries_missing_folders(entries)
+def cli_changes(args) -> int:
+    manifest = get_build_manifest()
+    for rel in manifest.changed_since_deploy():
+        print(rel)
+    for rel in manifest.removed_since_deploy():
+        print(f"deleted: {rel}")
+    if args.mark_deployed:
+        manifest.mark_deployed()
+    return 0
+
+
+def cli_store(args) -> int:
+    if args.action == "export":
+        count = export_tribute_data(args.path or ARCHIVE_DATA)
+        print(f"Exported {count} tribute(s) from the {TRIBUTE_STORE} store to {args.path or ARCHIVE_DATA}.")
+    else:
+        count = import_tribute_data(args.path or ARCHIVE_DATA)
+        print(f"Imported {count} tribute(s) from {args.path or ARCHIVE_DATA} into the {TRIBUTE_STORE} store.")
+    return 0
+
+
+def cli_list(args) -> int:
+    entries = get_tribute_store().query(
+        pet_type=args.pet_type or "",
+        featured=True if args.featured else None,
+        since=args.since or "",
+        limit=args.limit,
+    )
+    for entry in entries:
+        print(f'{(entry.get("published_iso") or "")[:10]}\t{entry.get("slug", "")}\t{entry.get("pet_name", "")}')
+    return 0
+
+
+def cli_notify(args) -> int:
+    workers = max(1, args.connections)
+    if args.all_pending:
+        report = send_pending_notifications(workers=workers, limit=args.limit)
+    else:
+        if args.slugs:
+            queued = queue_publish_emails(args.slugs)
+            print(f"Queued {queued} publish email(s).")
+        report = deliver_email_queue(limit=args.limit, workers=workers)
+    for slug in report["sent"]:
+        print(f"Sent    {slug}")
+    for slug, error in report["retrying"].items():
+        print(f"RETRY   {slug}: {error}", file=sys.stderr)
+    for slug, error in report["gave_up"].items():
+        print(f"FAILED  {slug}: {error}", file=sys.stderr)
+    print(f"Sent {len(report['sent'])} publish email(s) via {SMTP_HOST}:{SMTP_PORT}.")
+    return 1 if report["retrying"] or report["gave_up"] else 0
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Melton Memorials tribute publisher. Run without a command to open the GUI.",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="worker processes used to render pages (default: 1)",
+    )
+    parser.add_argument(
+        "--avif", action="store_true",
+        help="also write AVIF copies of tribute images and serve them via <picture> (same as MM_AVIF=1)",
+    )
+    parser.add_argument(
+        "--store", choices=sorted(TRIBUTE_STORE_TYPES), default=None,
+        help=f"where tribute entries are kept (default: {TRIBUTE_STORE}; same as MM_TRIBUTE_STORE)",
+    )
+    parser.add_argument(
+        "--timings", metavar="PATH",
+        help="write a JSON run report (time per build step, files written/skipped, bytes written)",
+    )
+    parser.add_argument("--profile", metavar="PATH", help="write cProfile stats for the run (open with pstats)")
+    # Subcommands accept --jobs too; SUPPRESS keeps a top-level value when they don't repeat it.
+    jobs_parent = argparse.ArgumentParser(add_help=False)
+    jobs_parent.add_argument("--jobs", type=int, default=argparse.SUPPRESS, help="worker processes used to render pages")
+
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    p = sub.add_parser("rebuild", parents=[jobs_parent], help="regenerate tribute pages, archives and sitemap")
+    p.add_argument("--archives-only", action="store_true", help="skip re-rendering individual tribute pages")
+    p.set_defaults(func=cli_rebuild)
+
+    p = sub.add_parser("publish", help="publish tribute(s) from a JSON or CSV record file")
+    p.add_argument("record", help="JSON object/list or CSV with pet_name, message, pet_type, breed, years, ...")
+    p.add_argument("--image", help="photo 1 (overrides the record's image column)")
+    p.add_argument("--image2", help="photo 2 (overrides the record's image2 column)")
+    p.set_defaults(func=cli_publish)
+
+    p = sub.add_parser("import", parents=[jobs_parent], help="bulk-publish a folder of submissions (manifest + images)")
+    p.add_argument("path", help=f"folder containing {' / '.join(IMPORT_MANIFEST_NAMES)}, or the manifest itself")
+    p.add_argument("--report", help="also write the per-record result as JSON to this file")
+    p.set_defaults(func=cli_import)
+
+    p = sub.add_parser("variants", parents=[jobs_parent], help="generate srcset image variants for existing tributes")
+    p.set_defaults(func=cli_variants)
+
+    p = sub.add_parser("edit", help="edit one tribute")
+    p.add_argument("slug")
+    p.add_argument("--set", action="append", metavar="FIELD=VALUE", help=f"one of: {', '.join(EDITABLE_FIELDS)}")
+    p.add_argument("--message", help="replace the tribute message (markdown)")
+    p.add_argument("--message-file", help="read the replacement tribute message from a file")
+    p.add_argument("--image", help="replace photo 1")
+    p.add_argument("--image2", help="replace photo 2")
+    p.set_defaults(func=cli_edit)
+
+    p = sub.add_parser("delete", help="permanently delete tribute(s)")
+    p.add_argument("slugs", nargs="+")
+    p.set_defaults(func=cli_delete)
+
+    p = sub.add_parser("sitemap", help="regenerate sitemap.xml")
+    p.set_defaults(func=cli_sitemap)
+
+    p = sub.add_parser("prune", parents=[jobs_parent], help="drop data.json entries whose folders are missing")
+    p.set_defaults(func=cli_prune)
+
+    p = sub.add_parser("changes", help="list generated files changed since the last deploy")
+    p.add_argument("--mark-deployed", action="store_true", help="record the current build as deployed")
+    p.set_defaults(func=cli_changes)
+
+    p = sub.add_parser("list", help="list tributes, newest first, optionally filtered")
+    p.add_argument("--pet-type", help="only this pet type (case-insensitive)")
+    p.add_argument("--featured", action="store_true", help="only tributes flagged as featured")
+    p.add_argument("--since", metavar="DATE", help="only tributes published on or after this ISO date")
+    p.add_argument("--limit", type=int, help="show at most this many (the most recent)")
+    p.set_defaults(func=cli_list)
+
+    p = sub.add_parser("notify", help="queue publish emails and send every due one from the outbox")
+    p.add_argument("slugs", nargs="*", help="tributes to add to the outbox first")
+    p.add_argument("--limit", type=int, help="send at most this many emails in this run")
+    p.add_argument(
+        "--all-pending", action="store_true",
+        help="email every tribute that has an address but email_sent is false (ignores SLUGS)",
+    )
+    p.add_argument(
+        "--connections", type=int, default=EMAIL_CONNECTIONS,
+        help=f"concurrent SMTP connections (default: {EMAIL_CONNECTIONS})",
+    )
+    p.set_defaults(func=cli_notify)
+
+    p = sub.add_parser("store", help="copy entries between the tribute store and data.json-layout files")
+    p.add_argument("action", choices=("export", "import"))
+    p.add_argument("path", nargs="?", help="JSON file (default: pet-tributes/data.json)")
+    p.set_defaults(func=cli_store)
+
+    return parser
+
+
+def run_gui(jobs: int = 1):
+    print("RUNNING UPDATED SCRIPT")
+    removed_slugs = sync_entries_with_disk(jobs=jobs)
     if removed_slugs:
-        save_data(synced_entries)
-        rebuild_archive_pages(synced_entries)
-        rebuild_pet_type_archives(synced_entries)
-        generate_sitemap(synced_entries)
         print(f"Startup sync removed {len(removed_slugs)} missing tribute(s): {', '.join(removed_slugs)}")
+    load_tk()
     root = tk.Tk()
     app = TributePublisherApp(root)
     root.mainloop()
 
 
+def main(argv: list[str] | None = None) -> int:
+    global ENABLE_AVIF, TRIBUTE_STORE
+    args = build_arg_parser().parse_args(argv)
+    args.jobs = max(1, args.jobs)
+    if args.store:
+        TRIBUTE_STORE = args.store
+    if args.avif:
+        ENABLE_AVIF = True
+        # Pool workers re-read the environment when they are spawned rather than forked.
+        os.environ["MM_AVIF"] = "1"
+    safe_mkdir(TRIBUTES_DIR)
+
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    started = time.perf_counter()
+    try:
+        if not args.command:
+            run_gui(jobs=args.jobs)
+            return 0
+        return args.func(args)
+    except TributeError as e:
+        print(f"{e.title}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if args.timings:
+            report = build_report(args.command or "gui", time.perf_counter() - started)
+            atomic_write_text(args.timings, json.dumps(report, indent=2))
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())